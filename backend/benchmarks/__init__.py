@@ -0,0 +1 @@
+# Benchmarks package - run each module from the backend directory with `python -m benchmarks.<name>`
@@ -0,0 +1,73 @@
+"""
+Benchmark the per-request cost of getting a Drive client.
+
+Compares `googleapiclient.discovery.build` (what every request used to do) against
+checking a client out of GoogleClientService. No network access is needed, the
+credentials are fake and no API call is executed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_google_clients [iterations]
+"""
+
+import statistics
+import sys
+import time
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from services.google_client_service import GoogleClientService
+
+
+def fake_credentials() -> Credentials:
+    return Credentials(
+        token="benchmark-access-token",
+        refresh_token="benchmark-refresh-token",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="benchmark-client-id",
+        client_secret="benchmark-client-secret",
+    )
+
+
+def time_calls(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<28} mean {statistics.mean(timings):8.3f} ms   p50 {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main(iterations: int) -> None:
+    credentials = fake_credentials()
+
+    def discovery_build():
+        build("drive", "v3", credentials=credentials).files()
+
+    def factory_unpooled():
+        with GoogleClientService.drive(credentials) as service:
+            service.files()
+
+    def factory_pooled():
+        with GoogleClientService.drive(credentials, "benchmark-user") as service:
+            service.files()
+
+    # First call pays the one-off document parse, report it separately
+    start = time.perf_counter()
+    GoogleClientService.preload()
+    print(f"discovery documents parsed once in {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    print(f"{iterations} iterations")
+    report("build() per request", time_calls(discovery_build, iterations))
+    report("factory, no pool", time_calls(factory_unpooled, iterations))
+    report("factory, pooled per user", time_calls(factory_pooled, iterations))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,104 @@
+"""
+Benchmark the size of Inngest event payloads and memoized step state for one job.
+
+Builds the payloads start-job used to produce (the full Drive file list as the
+get-files output, a credentials row and file id in every score-resume event)
+and the ones it produces now (a file count, chunks of resume ids with a cursor,
+ids only in events), for folders of different sizes. Sizes are the JSON bytes
+Inngest stores; nothing is sent anywhere.
+
+Usage (from backend/):
+    python -m benchmarks.bench_inngest_payloads [files ...]
+"""
+
+import json
+import sys
+import time
+
+from routes.queue import RESUME_CHUNK_SIZE
+
+TRACE = {"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"}
+CREDENTIALS_DICT = {
+    "user_id": 42,
+    "access_token": "ya29." + "a" * 200,
+    "refresh_token": "1//" + "r" * 100,
+    "token_uri": "https://oauth2.googleapis.com/token",
+    "client_id": "1234567890-abcdefghijklmnopqrstuvwxyz012345.apps.googleusercontent.com",
+    "client_secret": "GOCSPX-" + "s" * 28,
+    "scopes": [
+        "openid",
+        "https://www.googleapis.com/auth/userinfo.email",
+        "https://www.googleapis.com/auth/userinfo.profile",
+        "https://www.googleapis.com/auth/drive.readonly",
+    ],
+    "expiry": "2026-10-19T12:00:00",
+}
+
+
+def size(payload) -> int:
+    return len(json.dumps(payload))
+
+
+def drive_files(count: int) -> list[dict]:
+    # files.list with default fields: kind, mimeType, id and name per file
+    return [
+        {
+            "kind": "drive#file",
+            "mimeType": "application/pdf",
+            "id": f"1{index:032d}",
+            "name": f"Candidate {index} - Resume 2026.pdf",
+        }
+        for index in range(count)
+    ]
+
+
+def before(count: int) -> tuple[int, int, int]:
+    files = drive_files(count)
+    state = size(files)
+    events = 0
+    for index, file in enumerate(files):
+        state += size({"id": 1000 + index, "google_id": file["id"], "job_id": 7, "status": "pending", "file_name": file["name"]})
+        events += size({
+            "file_id": file["id"],
+            "resume_job_id": 1000 + index,
+            "job_id": 7,
+            "credentials_dict": CREDENTIALS_DICT,
+            "trace": TRACE,
+            "enqueued_at": time.time(),
+        })
+    largest_step = size(files)
+    return state, events, largest_step
+
+
+def after(count: int) -> tuple[int, int, int]:
+    ids = list(range(1000, 1000 + count))
+    state = size({"num_files": count})
+    largest_step = state
+    for start in range(0, max(count, 1), RESUME_CHUNK_SIZE):
+        chunk = ids[start:start + RESUME_CHUNK_SIZE]
+        output = size({"ids": chunk, "next_cursor": chunk[-1] if len(chunk) == RESUME_CHUNK_SIZE else None})
+        state += output
+        largest_step = max(largest_step, output)
+    events = sum(
+        size({
+            "resume_job_id": resume_id,
+            "job_id": 7,
+            "user_id": 42,
+            "score_duplicates": False,
+            "trace": TRACE,
+            "enqueued_at": time.time(),
+        })
+        for resume_id in ids
+    )
+    return state, events, largest_step
+
+
+def main(counts: list[int]) -> None:
+    print(f"{'files':>7} {'':>6} {'start-job state':>16} {'largest step':>13} {'score events':>13} {'per event':>10}")
+    for count in counts:
+        for label, (state, events, largest) in (("before", before(count)), ("after", after(count))):
+            print(f"{count:>7} {label:>6} {state / 1024:>13.1f} KB {largest / 1024:>10.1f} KB {events / 1024:>10.1f} KB {events / count:>8.0f} B")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000])
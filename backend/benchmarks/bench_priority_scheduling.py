@@ -0,0 +1,93 @@
+"""
+Benchmark time-to-top-50: how long until the best candidates of a job are scored.
+
+Simulates a folder of resumes scored by a pool of workers, in Drive listing order
+(the default) and priority-ordered (extract and pre-score everything, then score
+by descending pre-score). LLM scores are drawn at random and pre-scores are
+correlated with them at a given Pearson r; run scripts/train_provisional_scorer.py
+to get the r of the deployed model on real data. Extraction and scoring times
+are drawn from the ranges below. Nothing is sent anywhere.
+
+Reported per mode, in simulated seconds:
+- top-50 all   when every one of the LLM's top 50 has its score
+- top-50 90%   when 45 of them have
+- job          when the last resume is scored
+
+Usage (from backend/):
+    python -m benchmarks.bench_priority_scheduling [--resumes 2000] [--workers 16] [--top 50]
+"""
+
+import argparse
+import heapq
+
+import numpy as np
+
+from routes.queue import EXTRACT_CONCURRENCY
+
+# Seconds per resume: Drive download plus PDF extraction, LLM scoring, and
+# fetching already extracted text back from the bucket
+EXTRACT_SECONDS = (1.0, 4.0)
+SCORE_SECONDS = (4.0, 12.0)
+REFETCH_SECONDS = (0.1, 0.4)
+
+
+def run_pool(durations: np.ndarray, workers: int, start: float = 0.0) -> np.ndarray:
+    """
+    Finish times of tasks started in order on the first free worker
+    """
+    free = [start] * workers
+    finished = np.empty(len(durations))
+    for index, duration in enumerate(durations):
+        ready = heapq.heappop(free)
+        finished[index] = ready + duration
+        heapq.heappush(free, finished[index])
+    return finished
+
+
+def simulate(rng, resumes: int, workers: int, extract_workers: int, correlation: float) -> dict:
+    llm = rng.normal(size=resumes)
+    pre = correlation * llm + np.sqrt(1 - correlation ** 2) * rng.normal(size=resumes)
+    extract = rng.uniform(*EXTRACT_SECONDS, size=resumes)
+    score = rng.uniform(*SCORE_SECONDS, size=resumes)
+    refetch = rng.uniform(*REFETCH_SECONDS, size=resumes)
+
+    # Listing order: each resume is extracted and scored back to back
+    listing = run_pool(extract + score, workers)
+
+    # Priority: extract everything, then score by descending pre-score
+    extracted = run_pool(extract, extract_workers)
+    order = np.argsort(-pre, kind="stable")
+    priority = np.empty(resumes)
+    priority[order] = run_pool((refetch + score)[order], workers, start=extracted.max())
+    return {"llm": llm, "listing": listing, "priority": priority}
+
+
+def top_times(llm: np.ndarray, finished: np.ndarray, top: int) -> tuple[float, float, float]:
+    best = np.argsort(-llm)[:top]
+    times = np.sort(finished[best])
+    return times[-1], times[int(np.ceil(top * 0.9)) - 1], finished.max()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16, help="concurrent scoring calls")
+    parser.add_argument("--extract-workers", type=int, default=EXTRACT_CONCURRENCY)
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--correlations", default="0.3,0.6,0.8,0.95", help="pre-score vs LLM score Pearson r values")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{args.resumes} resumes, {args.workers} scoring workers, {args.extract_workers} extract workers, median of {args.runs} runs")
+    print(f"{'pre-score r':>11} {'mode':<9} {'top-' + str(args.top) + ' all':>12} {'top-' + str(args.top) + ' 90%':>12} {'job':>8}")
+    for correlation in (float(value) for value in args.correlations.split(",")):
+        runs = [simulate(rng, args.resumes, args.workers, args.extract_workers, correlation) for _ in range(args.runs)]
+        for mode in ("listing", "priority"):
+            times = np.median([top_times(run["llm"], run[mode], args.top) for run in runs], axis=0)
+            print(f"{correlation:>11} {mode:<9} {times[0]:>11.0f}s {times[1]:>11.0f}s {times[2]:>7.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Load-test the dashboard read APIs of one backend replica.
+
+Starts a PostgREST stand-in (benchmarks/postgrest_standin.py) in its own process,
+seeded with synthetic jobs of the given sizes, and the FastAPI app under uvicorn
+pointed at it. Then drives each scenario on its own at increasing concurrency
+with closed-loop clients carrying a signed JWT cookie, and reports throughput,
+latency percentiles and response size on the wire per scenario and concurrency level:
+
+- me                  /api/oauth/me
+- get-jobs            /api/query/get-jobs
+- get-resume          /api/query/get-resume, a random resume
+- get-resumes[N]      /api/query/get-resumes on the job with N resumes, cycling
+                      through filter combinations
+- columnar[N]         the same with format=columnar and compression
+
+Results can be written as JSON (--out) to compare releases. The load generator
+runs in this process; at high concurrency on small responses it can become the
+bottleneck, so watch its CPU before trusting numbers above a few thousand rps.
+
+Usage (from backend/):
+    python -m benchmarks.bench_read_load [--jobs 10,1000,10000,50000] [--concurrency 1,8,32,64]
+                                         [--seconds 5] [--workers 1] [--out results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+
+from benchmarks.postgrest_standin import PostgrestStandIn
+
+USER_ID = 1
+JWT_SECRET = "load-test-secret-" + "0" * 32
+SCHOOL_YEARS = ("Freshman", "Sophomore", "Junior", "Senior", None)
+FILTER_COMBOS = (
+    "",
+    "passed=true",
+    "failed=true",
+    "senior=true",
+    "junior=true&senior=true",
+    "passed=true&freshman=true&sophomore=true",
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def synthetic_tables(job_sizes: list[int], seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    created = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    jobs, resumes = [], []
+    resume_id = 1
+    for job_id, size in enumerate(job_sizes, start=1):
+        jobs.append({
+            "id": job_id,
+            "user_id": USER_ID,
+            "name": f"Load test job {size}",
+            "google_id": f"folder-{job_id}",
+            "folder_name": f"Folder {job_id}",
+            "status": "completed",
+            "created_at": (created + timedelta(days=job_id)).isoformat(),
+        })
+        for _ in range(size):
+            scored = rng.random() < 0.95
+            score = rng.randint(20, 100) if scored else None
+            google_id = f"{resume_id:033d}"
+            resumes.append({
+                "id": resume_id,
+                "created_at": (created + timedelta(seconds=resume_id)).isoformat(),
+                "job_id": job_id,
+                "google_id": google_id,
+                "file_name": f"Candidate {resume_id} - Resume.pdf",
+                "candidate_name": f"Candidate {resume_id}",
+                "status": "scored" if scored else rng.choice(("pending", "failed")),
+                "view_url": f"https://drive.google.com/file/d/{google_id}/view",
+                "preview_url": f"https://drive.google.com/file/d/{google_id}/preview",
+                "text_url": f"https://storage.googleapis.com/prorank-extracted-text/extracted_text/{google_id}.txt",
+                "score": score,
+                "gpa": round(rng.uniform(2.0, 4.0), 2) if scored else None,
+                "school_year": rng.choice(SCHOOL_YEARS) if scored else None,
+                "num_internships": rng.randint(0, 4) if scored else None,
+                "gpa_contribution": round(score * 0.3, 2) if scored else None,
+                "experience_contribution": round(score * 0.4, 2) if scored else None,
+                "impact_quality_contribution": round(score * 0.3, 2) if scored else None,
+                "llm_model": "gpt-4o-mini" if scored else None,
+                "llm_total_tokens": rng.randint(1500, 4000) if scored else None,
+                "duplicate_of": None,
+                "skip_reason": None,
+            })
+            resume_id += 1
+    users = [{"id": USER_ID, "email": "load-test@example.com", "picture": None, "credentials_id": None}]
+    return {"User": users, "jobs": jobs, "resumes": resumes}
+
+
+def serve_standin(port: int, job_sizes: list[int]) -> None:
+    PostgrestStandIn(synthetic_tables(job_sizes), port=port).serve_forever()
+
+
+def start_app(port: int, supabase_url: str, workers: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SUPABASE_URL": supabase_url,
+        "SUPABASE_SERVICE_ROLE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.load-test",
+        "JWT_SECRET_KEY": JWT_SECRET,
+        "JWT_ALGORITHM": "HS256",
+        "INNGEST_DEV": "1",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+
+
+def wait_until_ready(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            # Unauthenticated, so 401 means the app is up
+            if httpx.get(f"{url}/api/oauth/me", timeout=2).status_code in (200, 401):
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"App at {url} did not become ready within {timeout}s")
+
+
+def scenarios(job_sizes: list[int]) -> dict:
+    total_resumes = sum(job_sizes)
+    paths = {
+        "me": lambda rng: "/api/oauth/me",
+        "get-jobs": lambda rng: "/api/query/get-jobs",
+        "get-resume": lambda rng: f"/api/query/get-resume?resume_id={rng.randint(1, total_resumes)}",
+    }
+    for job_id, size in enumerate(job_sizes, start=1):
+        paths[f"get-resumes[{size}]"] = (
+            lambda rng, job_id=job_id: f"/api/query/get-resumes?job_id={job_id}&{rng.choice(FILTER_COMBOS)}".rstrip("&")
+        )
+    for job_id, size in enumerate(job_sizes, start=1):
+        paths[f"columnar[{size}]"] = (
+            lambda rng, job_id=job_id: f"/api/query/get-resumes?job_id={job_id}&format=columnar&{rng.choice(FILTER_COMBOS)}".rstrip("&")
+        )
+    return paths
+
+
+async def client_loop(client: httpx.AsyncClient, path_for, deadline: float, rng: random.Random, results: dict) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path_for(rng))
+            ok = response.status_code == 200
+            results["bytes"] += response.num_bytes_downloaded
+        except httpx.HTTPError:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        if ok:
+            results["latencies"].append(elapsed)
+        else:
+            results["errors"] += 1
+
+
+def percentile(values: list[float], p: float) -> float:
+    return values[min(int(len(values) * p / 100), len(values) - 1)] if values else float("nan")
+
+
+async def run_level(base_url: str, cookies: dict, path_for, concurrency: int, seconds: float, seed: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, cookies=cookies, limits=limits, timeout=120) as client:
+        # Warm up connections and the app's caches before measuring
+        await asyncio.gather(*(
+            client_loop(client, path_for, time.perf_counter() + min(1.0, seconds), random.Random(seed + i), {"latencies": [], "errors": 0, "bytes": 0})
+            for i in range(concurrency)
+        ))
+        results = {"latencies": [], "errors": 0, "bytes": 0}
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            client_loop(client, path_for, started + seconds, random.Random(seed + i), results)
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(results["latencies"])
+    completed = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": completed,
+        "errors": results["errors"],
+        "rps": round(completed / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else None,
+        "mean_kb": round(results["bytes"] / max(completed + results["errors"], 1) / 1024, 1),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", default="10,1000,10000,50000", help="comma-separated resume counts, one synthetic job each")
+    parser.add_argument("--concurrency", default="1,8,32,64", help="comma-separated numbers of concurrent clients")
+    parser.add_argument("--seconds", type=float, default=5, help="measured duration of each scenario and level")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--scenarios", help="comma-separated subset of scenarios to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    job_sizes = [int(size) for size in args.jobs.split(",")]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    paths = scenarios(job_sizes)
+    if args.scenarios:
+        paths = {name: paths[name] for name in args.scenarios.split(",")}
+
+    standin_port, app_port = free_port(), free_port()
+    standin = multiprocessing.Process(target=serve_standin, args=(standin_port, job_sizes), daemon=True)
+    standin.start()
+    app = start_app(app_port, f"http://127.0.0.1:{standin_port}", args.workers)
+    base_url = f"http://127.0.0.1:{app_port}"
+
+    try:
+        wait_until_ready(base_url)
+        token = jwt.encode({"user_id": USER_ID, "exp": datetime.now(timezone.utc) + timedelta(hours=1)}, JWT_SECRET, algorithm="HS256")
+        cookies = {"access_token": token}
+
+        results = []
+        print(f"{'scenario':<22} {'clients':>7} {'requests':>9} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'KB/resp':>8}")
+        for name, path_for in paths.items():
+            for level in levels:
+                result = asyncio.run(run_level(base_url, cookies, path_for, level, args.seconds, args.seed))
+                results.append({"scenario": name, **result})
+                print(
+                    f"{name:<22} {level:>7} {result['requests']:>9} {result['errors']:>6} {result['rps']:>8} "
+                    f"{result['p50_ms']:>9} {result['p90_ms']:>9} {result['p99_ms']:>9} {result['max_ms']:>9} {result['mean_kb']:>8}"
+                )
+
+        if args.out:
+            with open(args.out, "w") as out:
+                json.dump({
+                    "revision": git_revision(),
+                    "run_at": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "cpus": os.cpu_count(),
+                    "workers": args.workers,
+                    "job_sizes": job_sizes,
+                    "seconds": args.seconds,
+                    "results": results,
+                }, out, indent=2)
+            print(f"Wrote {args.out}")
+    finally:
+        app.terminate()
+        app.wait(timeout=30)
+        standin.terminate()
+
+
+if __name__ == "__main__":
+    main()
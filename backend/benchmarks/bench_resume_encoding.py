@@ -0,0 +1,59 @@
+"""
+Benchmark encoding a job's resumes as rows versus the compact columnar format.
+
+"rows" is what FastAPI does for the default response: jsonable_encoder, then
+json.dumps into a JSONResponse. "columnar" is ResponseEncodingService with no
+compression, gzip and brotli. Rows are synthetic, shaped like the resumes table.
+Times are the best of a few runs; sizes are the bytes sent.
+
+Usage (from backend/):
+    python -m benchmarks.bench_resume_encoding [resumes ...]
+"""
+
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.bench_read_load import synthetic_tables
+from services.response_encoding_service import ResponseEncodingService, brotli
+
+REPEAT = 5
+
+
+def best_of(fn) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+
+def main(counts: list[int]) -> None:
+    print(f"{'resumes':>8} {'format':<18} {'encode ms':>10} {'size KB':>10} {'vs rows':>8}")
+    for count in counts:
+        resumes = synthetic_tables([count])["resumes"]
+        payload = {
+            "resumes": resumes,
+            "stats": {"num_resumes": count, "average_score": 60, "high_score": 100, "lowest_score": 20},
+            "job_name": "Benchmark job",
+            "job_date": "2026-10-19T00:00:00+00:00",
+        }
+
+        variants = {"rows": lambda: JSONResponse(jsonable_encoder(payload)).body}
+        for label, accept in (("columnar", ""), ("columnar+gzip", "gzip"), ("columnar+br", "br")):
+            if label == "columnar+br" and brotli is None:
+                continue
+            variants[label] = lambda accept=accept: ResponseEncodingService.columnar_response(payload, "resumes", accept).body
+
+        baseline_ms, baseline = best_of(variants.pop("rows"))
+        print(f"{count:>8} {'rows':<18} {baseline_ms:>10.1f} {len(baseline) / 1024:>10.1f} {'':>8}")
+        for label, fn in variants.items():
+            elapsed, body = best_of(fn)
+            print(f"{count:>8} {label:<18} {elapsed:>10.1f} {len(body) / 1024:>10.1f} {len(baseline) / len(body):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
@@ -0,0 +1,77 @@
+"""
+Benchmark keyword search latency over a synthetic resume index.
+
+Builds a throwaway FTS5 index with N resumes spread across users and times
+ranked, paginated queries scoped to one user.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search_index [num_resumes] [num_users]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+SKILLS = [
+    "python", "java", "rust", "go", "kubernetes", "docker", "react", "typescript",
+    "postgres", "spark", "pytorch", "tensorflow", "aws", "gcp", "terraform", "kafka",
+    "c++", "swift", "kotlin", "graphql", "redis", "linux", "figma", "tableau",
+]
+FILLER = (
+    "led team built shipped designed improved reduced latency revenue customers "
+    "intern university research project scalable pipeline dashboard analytics"
+).split()
+
+
+def synthetic_resume(rng: random.Random) -> str:
+    words = rng.choices(FILLER, k=300) + rng.sample(SKILLS, k=6)
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def main(num_resumes: int, num_users: int) -> None:
+    directory = tempfile.mkdtemp()
+    os.environ["SEARCH_INDEX_PATH"] = os.path.join(directory, "bench_index.db")
+    from services.search_index_service import SearchIndexService
+
+    rng = random.Random(7)
+    start = time.perf_counter()
+    connection = SearchIndexService.get_connection()
+    with connection:
+        for resume_id in range(1, num_resumes + 1):
+            user_id = resume_id % num_users
+            connection.execute(
+                "INSERT INTO resume_text (rowid, text, owner) VALUES (?, ?, ?)",
+                (resume_id, synthetic_resume(rng), SearchIndexService.owner_token(user_id)),
+            )
+            connection.execute(
+                "INSERT INTO resume_docs (resume_id, job_id, user_id, file_name) VALUES (?, ?, ?, ?)",
+                (resume_id, resume_id % 500, str(user_id), f"resume-{resume_id}.pdf"),
+            )
+    print(f"indexed {num_resumes} resumes for {num_users} users in {time.perf_counter() - start:.1f} s")
+
+    # Incremental update through the public API
+    start = time.perf_counter()
+    for resume_id in range(1, 101):
+        SearchIndexService.index_resume(resume_id, 1, resume_id % num_users, synthetic_resume(rng))
+    print(f"index_resume: {(time.perf_counter() - start) * 10:.3f} ms per resume")
+
+    for query in ["kubernetes", "rust", "kubernetes rust", "python aws terraform"]:
+        timings = []
+        for _ in range(50):
+            user_id = rng.randrange(num_users)
+            start = time.perf_counter()
+            SearchIndexService.search(user_id, query, page=1, page_size=20)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"{query!r:<26} p50 {statistics.median(timings):7.2f} ms   p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
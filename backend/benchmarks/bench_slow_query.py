@@ -0,0 +1,119 @@
+"""
+Benchmark how one slow Supabase query affects the latency of every other request.
+
+Runs the real FastAPI app in-process against a local PostgREST stand-in. Clients
+hammer /api/oauth/me while, in the second phase, other clients keep requesting
+/api/query/get-resume, whose table is slowed down by SLOW seconds per query.
+With --inline, Supabase calls run directly on the event loop as they used to, so
+the slow query stalls every concurrent request; with the thread pool, /me p99
+should stay flat. tests/test_slow_query.py runs a short version of this and fails
+if it doesn't.
+
+Usage (from backend/):
+    python -m benchmarks.bench_slow_query [--inline] [--clients 20] [--slow 0.5] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.postgrest_standin import PostgrestStandIn
+
+USER = {"id": 1, "email": "benchmark@example.com", "picture": None, "credentials_id": None}
+RESUME = {"id": 1, "job_id": 1, "file_name": "resume.pdf", "score": 80, "status": "scored"}
+
+
+async def hammer(client, path: str, seconds: float, timings: list) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+
+
+def p99(timings: list[float]) -> float:
+    timings = sorted(timings)
+    return timings[max(int(len(timings) * 0.99) - 1, 0)]
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    print(f"{name:<34} {len(timings):>7} requests   p50 {statistics.median(timings):8.2f} ms   p99 {p99(timings):8.2f} ms   max {timings[-1]:8.2f} ms")
+
+
+def configure(standin_url: str) -> None:
+    """
+    Point the app at the stand-in; call before importing main
+    """
+    os.environ["SUPABASE_URL"] = standin_url
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.benchmark")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-" + "0" * 32)
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.setdefault("INNGEST_DEV", "1")
+
+
+async def measure(clients: int, slow_clients: int, seconds: float) -> dict:
+    """
+    Time /me with the app idle, then next to slowed get-resume requests
+    """
+    import httpx
+    import main
+    from services.jwt_service import JwtService
+
+    cookies = {"access_token": JwtService.generate_token({"user_id": USER["id"]})}
+    transport = httpx.ASGITransport(app=main.app)
+    timings = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", cookies=cookies, timeout=60) as client:
+        # Warm up connections and the client before measuring
+        await asyncio.gather(*(hammer(client, "/api/oauth/me", 0.5, []) for _ in range(clients)))
+        for phase, phase_slow_clients in (("idle", 0), ("with slow queries", slow_clients)):
+            fast, slow = [], []
+            await asyncio.gather(
+                *(hammer(client, "/api/oauth/me", seconds, fast) for _ in range(clients)),
+                *(hammer(client, "/api/query/get-resume?resume_id=1", seconds, slow) for _ in range(phase_slow_clients)),
+            )
+            timings[phase] = fast
+            if slow:
+                timings["slowed"] = slow
+    return timings
+
+
+def run_inline() -> None:
+    """
+    Run Supabase calls directly on the event loop, as before the thread pool
+    """
+    from services.supabase_service import SupabaseService
+
+    async def run(self, fn, *fn_args, **kwargs):
+        return fn(*fn_args, **kwargs)
+    SupabaseService.run = run
+
+
+async def run(args) -> None:
+    if args.inline:
+        run_inline()
+    timings = await measure(args.clients, args.slow_clients, args.seconds)
+    report("/me, idle", timings["idle"])
+    report("/me, with slow queries", timings["with slow queries"])
+    report("/get-resume (slowed)", timings["slowed"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--inline", action="store_true", help="run Supabase calls on the event loop, as before")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--slow-clients", type=int, default=4)
+    parser.add_argument("--slow", type=float, default=0.5, help="seconds added to every resumes query")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with PostgrestStandIn({"User": [USER], "resumes": [RESUME]}, delays={"resumes": args.slow}) as standin:
+        configure(standin.url)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark backend cold start: import time of main.py and time to first request.
+
+Each run uses a fresh interpreter. Time to first request spawns uvicorn and polls
+GET / until it answers, so it includes interpreter start, imports and the lifespan
+hook. Placeholder credentials are used and no external service is contacted.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup [runs]
+"""
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENV = {
+    **os.environ,
+    "SUPABASE_URL": os.getenv("SUPABASE_URL", "http://127.0.0.1:54321"),
+    "SUPABASE_SERVICE_ROLE_KEY": os.getenv("SUPABASE_SERVICE_ROLE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.benchmark"),
+    "INNGEST_DEV": os.getenv("INNGEST_DEV", "1"),
+    "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY", "benchmark-secret"),
+    "JWT_ALGORITHM": os.getenv("JWT_ALGORITHM", "HS256"),
+}
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_time() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR, env=ENV, capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def time_to_first_request(timeout: float = 30.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=ENV, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise TimeoutError("Backend did not answer in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def slowest_imports(limit: int = 10) -> list[tuple[int, str]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=ENV, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(f"{name:<24} median {statistics.median(timings):8.1f} ms   min {min(timings):8.1f} ms   max {max(timings):8.1f} ms")
+
+
+def main(runs: int) -> None:
+    print(f"{runs} runs, python {sys.version.split()[0]}")
+    report("import main", [import_time() for _ in range(runs)])
+    report("time to first request", [time_to_first_request() for _ in range(runs)])
+    print("slowest top-level imports (cumulative):")
+    for microseconds, name in slowest_imports():
+        print(f"  {microseconds / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
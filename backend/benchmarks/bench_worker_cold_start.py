@@ -0,0 +1,67 @@
+"""
+Benchmark cold vs warm latency of the Modal worker endpoints.
+
+Sends `warmup` pings, which return right after the container is ready without
+touching Drive, GCS or Gemini. A concurrent burst larger than the warm pool forces
+new containers; the sequential pings after it hit warm ones. Each response says
+whether it was the container's first request, so latencies are grouped by that.
+
+Run it after the app has scaled down (or with a burst above the warm pool size).
+
+Usage (from backend/):
+    python -m benchmarks.bench_worker_cold_start [burst] [warm_requests]
+"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+
+def endpoints() -> dict:
+    # Same defaults as routes/queue.py
+    return {
+        "download_resume": os.getenv("MODAL_DOWNLOAD_RESUME_URL", "https://richierish05--prorank-download-resume.modal.run"),
+        "score_resume": os.getenv("MODAL_SCORE_RESUME_URL", "https://richierish05--prorank-score-resume.modal.run"),
+    }
+
+
+def ping(url: str) -> tuple[float, bool]:
+    start = time.perf_counter()
+    response = requests.post(url, json={"warmup": True}, timeout=300)
+    elapsed = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    return elapsed, response.json().get("cold_start", False)
+
+
+def summarize(label: str, timings: list[float]) -> str:
+    if not timings:
+        return f"{label:<6} n=0"
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    return f"{label:<6} n={len(timings):<4} p50 {statistics.median(timings):9.1f} ms   p95 {p95:9.1f} ms   max {timings[-1]:9.1f} ms"
+
+
+def main(burst: int, warm_requests: int) -> None:
+    load_dotenv()
+    for name, url in endpoints().items():
+        with ThreadPoolExecutor(max_workers=burst) as executor:
+            results = list(executor.map(lambda _: ping(url), range(burst)))
+        results += [ping(url) for _ in range(warm_requests)]
+
+        cold = [elapsed for elapsed, is_cold in results if is_cold]
+        warm = [elapsed for elapsed, is_cold in results if not is_cold]
+        print(name)
+        print("  " + summarize("cold", cold))
+        print("  " + summarize("warm", warm))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
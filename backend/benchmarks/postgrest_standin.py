@@ -0,0 +1,204 @@
+"""
+A local stand-in for the Supabase PostgREST API, for benchmarks that drive the real app.
+
+Serves rows from in-memory tables on a background thread. It understands the
+parts of the PostgREST query syntax the app uses for reads: eq/neq/gt/gte/lt/lte,
+in, is (and not.) filters, or=(...), select of plain columns, order, limit and
+offset, plus the get_resume_score_stats RPC. Tables are indexed by id, job_id
+and user_id for equality lookups, and responses are cached by request since the
+data never changes, so the stand-in stays cheap next to the app it is serving.
+Requests to a table can be slowed down to simulate a slow query.
+
+Usage:
+    with PostgrestStandIn({"User": [{"id": 1}]}, delays={"resumes": 0.5}) as standin:
+        os.environ["SUPABASE_URL"] = standin.url
+"""
+
+import json
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+INDEXED_COLUMNS = ("id", "job_id", "user_id")
+RESERVED_PARAMS = ("select", "order", "limit", "offset", "or", "and", "on_conflict", "columns")
+
+
+def _split_top_level(expression: str) -> list[str]:
+    parts, depth, current = [], 0, ""
+    for char in expression:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    return parts + [current] if current else parts
+
+
+def _coerce(value: str, like):
+    if isinstance(like, bool):
+        return value == "true"
+    if isinstance(like, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _matches(row: dict, column: str, condition: str) -> bool:
+    negate = condition.startswith("not.")
+    if negate:
+        condition = condition[4:]
+    operator, _, value = condition.partition(".")
+    actual = row.get(column)
+
+    if operator == "is":
+        result = actual is None if value == "null" else actual is (value == "true")
+    elif operator == "in":
+        result = str(actual) in [item.strip('"') for item in _split_top_level(value.strip("()"))]
+    elif actual is None:
+        result = False
+    else:
+        expected = _coerce(value, actual)
+        result = {
+            "eq": lambda: actual == expected,
+            "neq": lambda: actual != expected,
+            "gt": lambda: actual > expected,
+            "gte": lambda: actual >= expected,
+            "lt": lambda: actual < expected,
+            "lte": lambda: actual <= expected,
+        }[operator]()
+    return result != negate
+
+
+def _matches_or(row: dict, expression: str) -> bool:
+    for term in _split_top_level(expression.strip("()")):
+        column, _, condition = term.partition(".")
+        if _matches(row, column, condition):
+            return True
+    return False
+
+
+class PostgrestStandIn:
+
+    def __init__(self, tables: dict, delays: dict = None, port: int = 0):
+        self.tables = tables
+        self.delays = delays or {}
+        self.indexes = {
+            table: {column: self._index(rows, column) for column in INDEXED_COLUMNS}
+            for table, rows in tables.items()
+        }
+        self._cache: dict = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    @staticmethod
+    def _index(rows: list[dict], column: str) -> dict:
+        index = {}
+        for row in rows:
+            if column in row:
+                index.setdefault(str(row[column]), []).append(row)
+        return index
+
+    def select(self, table: str, params: list[tuple[str, str]]) -> tuple[list[dict], int]:
+        """
+        Apply a PostgREST query string to a table; returns the page and the number of matching rows
+        """
+        rows = self.tables.get(table, [])
+        filters = [(column, condition) for column, condition in params if column not in RESERVED_PARAMS]
+        for column, condition in filters:
+            if column in INDEXED_COLUMNS and condition.startswith("eq."):
+                rows = self.indexes[table][column].get(condition[3:], [])
+                break
+        for column, condition in filters:
+            rows = [row for row in rows if _matches(row, column, condition)]
+
+        options = dict(params)
+        if "or" in options:
+            rows = [row for row in rows if _matches_or(row, options["or"])]
+        if "order" in options:
+            for term in reversed(options["order"].split(",")):
+                column, _, direction = term.partition(".")
+                rows = sorted(rows, key=lambda row: (row.get(column) is None, row.get(column)), reverse=direction.startswith("desc"))
+        total = len(rows)
+        offset = int(options.get("offset", 0))
+        rows = rows[offset:offset + int(options["limit"])] if "limit" in options else rows[offset:]
+
+        columns = [column.strip() for column in options.get("select", "*").split(",")]
+        if "*" not in columns:
+            rows = [{column: row.get(column) for column in columns if re.fullmatch(r"\w+", column)} for row in rows]
+        return rows, total
+
+    def resume_score_stats(self, arguments: dict) -> dict:
+        scores = [
+            row["score"]
+            for row in self.indexes.get("resumes", {}).get("job_id", {}).get(str(arguments["p_job_id"]), [])
+            if row.get("score") is not None
+            and (not arguments.get("p_school_years") or row.get("school_year") in arguments["p_school_years"])
+            and (arguments.get("p_score_filter") != "passed" or row["score"] >= 80)
+            and (arguments.get("p_score_filter") != "failed" or row["score"] < 80)
+        ]
+        if not scores:
+            return {"count": 0, "avg": None, "max": None, "min": None}
+        return {"count": len(scores), "avg": sum(scores) / len(scores), "max": max(scores), "min": min(scores)}
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes, don't let Nagle hold the body back
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                table = parts.path.rsplit("/", 1)[-1]
+                time.sleep(standin.delays.get(table, 0))
+                body = standin._cache.get(self.path)
+                if body is None:
+                    rows, total = standin.select(table, parse_qsl(parts.query, keep_blank_values=True))
+                    body = standin._cache.setdefault(self.path, (json.dumps(rows).encode(), total))
+                self.respond(*body)
+
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                arguments = json.loads(self.rfile.read(length) or b"{}")
+                if parts.path.endswith("/rpc/get_resume_score_stats"):
+                    self.respond(json.dumps(standin.resume_score_stats(arguments)).encode(), 1)
+                else:
+                    self.send_error(404)
+
+            def respond(self, data: bytes, count: int):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if "count=" in self.headers.get("Prefer", ""):
+                    self.send_header("Content-Range", f"0-{max(count - 1, 0)}/{count}")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        self.server.serve_forever()
+
+    def __enter__(self) -> "PostgrestStandIn":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
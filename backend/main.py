@@ -1,25 +1,52 @@
-from fastapi import FastAPI
+from dotenv import load_dotenv
+
+# Load the environment once, before any module reads it at import time
+load_dotenv()
+
+from fastapi import FastAPI, Request, Response
 from routes import (
     oauth_router,
     job_router,
     inngest_client,
     start_job,
     score_resume,
+    retry_job,
     query_router,
     google_router,
 )
 import uvicorn
-from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import inngest
 import inngest.fast_api
 import logging
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from services.metrics_service import MetricsService
+from services.tracing_service import TracingService
+from services.supabase_service import SupabaseService
+from services.google_client_service import GoogleClientService
+from services.profiling_service import ProfilingService
+from fastapi.responses import JSONResponse
 
 
-load_dotenv()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared clients once per process before serving requests
+    """
+    TracingService.configure("prorank-api")
+    SupabaseService.connect()
+
+    # Drive/OAuth2 discovery documents are only needed by the Drive routes,
+    # warm them in the background instead of delaying readiness
+    warm_google = asyncio.get_running_loop().run_in_executor(None, GoogleClientService.preload)
+    yield
+    await warm_google
 
-app = FastAPI(title="ProRank API", version="1.5.0")
+
+app = FastAPI(title="ProRank API", version="1.5.0", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -31,7 +58,7 @@ app.add_middleware(
 )
 
 # Serve the inngest functions
-inngest.fast_api.serve(app, inngest_client, [start_job, score_resume])
+inngest.fast_api.serve(app, inngest_client, [start_job, score_resume, retry_job])
 
 
 # Include routers
@@ -40,6 +67,54 @@ app.include_router(job_router, prefix="/api/job", tags=["job"])
 app.include_router(query_router, prefix="/api/query", tags=["query"])
 app.include_router(google_router, prefix="/api/google", tags=["google"])
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template so ids in the path don't explode the label set
+    route = request.scope.get("route")
+    MetricsService.observe_request(
+        request.method,
+        route.path if route else "unmatched",
+        response.status_code,
+        time.perf_counter() - start,
+    )
+    return response
+
+
+async def profile_request(request: Request, call_next):
+    mode = ProfilingService.select(request.headers)
+    if mode is None:
+        return await call_next(request)
+
+    profile, profiler, token = ProfilingService.start()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        route = request.scope.get("route")
+        result = ProfilingService.stop(
+            profile, profiler, token, request.method, route.path if route else "unmatched", status
+        )
+
+    server_timing = ProfilingService.server_timing(result)
+    if mode == "inline":
+        return JSONResponse(result, headers={"Server-Timing": server_timing})
+    response.headers["Server-Timing"] = server_timing
+    return response
+
+# Only installed when profiling is configured, so it costs nothing otherwise
+if ProfilingService.enabled:
+    app.middleware("http")(profile_request)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = MetricsService.render()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to ProRank API"}
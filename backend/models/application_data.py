@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Optional
 
 class User(BaseModel):
     user_id: str = Field(..., description="The ID of the user")
@@ -42,4 +43,9 @@ class ResumeData(BaseModel):
 class StartJobRequest(BaseModel):
     folder_id: str = Field(..., description="The Google Drive folder ID")
     folder_name: str = Field(..., description="The name of the folder")
-    name: str = Field(..., description="The name of the job")
\ No newline at end of file
+    name: str = Field(..., description="The name of the job")
+    score_duplicates: bool = Field(False, description="Score near-duplicate resumes with the LLM instead of reusing the earlier score")
+    priority: bool = Field(False, description="Extract and pre-score every file first, then score the most promising resumes first")
+
+class RescoreRequest(BaseModel):
+    job_id: Optional[int] = Field(None, description="The job to re-score, or every job of the user when omitted")
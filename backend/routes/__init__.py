@@ -1,7 +1,7 @@
 # Routes package
 from .oauth import router as oauth_router
 from .queue import router as job_router
-from .queue import inngest_client, start_job, score_resume
+from .queue import inngest_client, start_job, score_resume, retry_job
 from .query import router as query_router
 from .google import router as google_router
 
@@ -11,6 +11,7 @@ __all__ = [
     "inngest_client",
     "start_job",
     "score_resume",
+    "retry_job",
     "query_router",
     "google_router",
 ]
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
-from services.oauth_credentials_service import OAuthCredentialsService
+from services.token_broker_service import TokenBrokerService
 from fastapi import HTTPException, Request
-from googleapiclient.discovery import build
+from services.drive_folder_service import DriveFolderService
 from services.jwt_service import JwtService
 from typing import Optional
 
@@ -14,20 +14,52 @@ async def get_drive_folders(request: Request, next_page_token: Optional[str] = N
         raise HTTPException(status_code=401, detail="Unauthorized invalid token")
 
     user_id = payload.get("user_id")
-    credentials = await OAuthCredentialsService.get_credentials(user_id)
-
-    service = build('drive', 'v3', credentials=credentials)
-    
-    # Build query parameters
-    query_params = {
-        "q": "mimeType = 'application/vnd.google-apps.folder'",
-        "pageSize": page_size,
-    }
-    
-    # Only add pageToken if it's provided and not empty/null
-    if next_page_token and next_page_token != "null":
-        query_params["pageToken"] = next_page_token
-    
-    folders = service.files().list(**query_params).execute()
-    return folders
+    credentials = await TokenBrokerService.get_credentials(user_id)
 
+    # Only pass the page token if it's provided and not empty/null
+    if not next_page_token or next_page_token == "null":
+        next_page_token = None
+
+    return await DriveFolderService.list_folders(
+        user_id,
+        credentials,
+        page_token=next_page_token,
+        page_size=page_size,
+        # This route never serves child folders, don't spend Drive calls warming them
+        prefetch=False,
+    )
+
+
+@router.get("/folders")
+async def browse_folders(
+    request: Request,
+    parent_id: Optional[str] = None,
+    next_page_token: Optional[str] = None,
+    page_size: int = 100,
+    prefetch: bool = True,
+    refresh: bool = False,
+):
+    """
+    Browse Drive folders page by page, optionally under a parent folder ("root" for the top of My Drive)
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized invalid token")
+
+    user_id = payload.get("user_id")
+    credentials = await TokenBrokerService.get_credentials(user_id)
+
+    if refresh:
+        DriveFolderService.invalidate_user(user_id)
+
+    if not next_page_token or next_page_token == "null":
+        next_page_token = None
+
+    return await DriveFolderService.list_folders(
+        user_id,
+        credentials,
+        parent_id=parent_id,
+        page_token=next_page_token,
+        page_size=page_size,
+        prefetch=prefetch,
+    )
@@ -2,19 +2,17 @@ from fastapi import APIRouter
 from services.oauth_credentials_service import OAuthCredentialsService
 from fastapi.responses import RedirectResponse
 from fastapi import Response, Cookie, HTTPException, Request
-from dotenv import load_dotenv
-from googleapiclient.discovery import build
+from services.google_client_service import GoogleClientService
 import os
-from google.oauth2.credentials import Credentials
 from services.jwt_service import JwtService
-from supabase import create_client, Client
-
-load_dotenv()
+from services.supabase_service import SupabaseService
+from services.token_broker_service import TokenBrokerService
 
 router = APIRouter()
 
 BASE_URL = os.getenv("FRONTEND_URL")
 OAuthCredentialsService = OAuthCredentialsService()
+supabase_service = SupabaseService()
 IS_PRODUCTION = os.getenv("ENVIRONMENT") == "production"
 
 @router.get("/authorize")
@@ -96,8 +94,8 @@ async def oauth_callback(
 
 
     # Get user information using Google API client
-    service = build('oauth2', 'v2', credentials=flow.credentials)
-    userinfo = service.userinfo().get().execute()
+    with GoogleClientService.oauth2(flow.credentials) as service:
+        userinfo = service.userinfo().get().execute()
 
     # Store credentials in database
     try:
@@ -107,6 +105,9 @@ async def oauth_callback(
         raise HTTPException(status_code=500, detail="Failed to store credentials")
 
     
+    # Drop any token cached from a previous grant
+    TokenBrokerService.invalidate(oauth_credentials['user_id'])
+
     payload = {
         "user_id": oauth_credentials['user_id'],
     }
@@ -135,8 +136,7 @@ async def get_me(request: Request):
     if not payload:
         raise HTTPException(status_code=401, detail="Unauthorized invalid token")
 
-    supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
-    user = supabase.table("User").select("*").eq("id", payload.get("user_id")).execute().data
+    user = await supabase_service.run(supabase_service.get_user, payload.get("user_id"))
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized could not find user")
     user = user[0]
@@ -1,16 +1,19 @@
 from fastapi import APIRouter,Response, Cookie, HTTPException, Request, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 
 from services.oauth_credentials_service import OAuthCredentialsService
 from services.supabase_service import SupabaseService
 from services.jwt_service import JwtService
+from services.search_index_service import SearchIndexService
+from services.export_service import ExportService, EXPORT_COLUMNS, EXPORT_FORMATS
+from services.dedup_service import DedupService
+from services.score_stats_service import ScoreStatsService
+from services.response_encoding_service import ResponseEncodingService
 
-from dotenv import load_dotenv
 import os
+import asyncio
 from typing import Optional, Dict
 
-load_dotenv()
-
 router = APIRouter()
 supabase_service = SupabaseService()
 
@@ -24,7 +27,7 @@ async def get_jobs(request: Request):
     if not payload:
         raise HTTPException(status_code=401, detail="Unauthorized")
     user_id = payload["user_id"]
-    return supabase_service.get_jobs_under_user(user_id)
+    return await supabase_service.run(supabase_service.get_jobs_under_user, user_id)
 
 @router.get("/get-resumes")
 async def get_job(
@@ -36,9 +39,10 @@ async def get_job(
     senior: bool = False,
     passed: bool = False,
     failed: bool = False,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
 ):  
     """
-    Get all resumes for a job with optional filters
+    Get all resumes for a job with optional filters, as rows or in the compact columnar format
     """
     payload = JwtService.verify_token(request.cookies.get("access_token"))
     if not payload:
@@ -53,7 +57,12 @@ async def get_job(
         "Passed": passed,
         "Failed": failed,
     }
-    return supabase_service.get_resumes_under_job(job_id, filters)
+    result = await supabase_service.run(supabase_service.get_resumes_under_job, job_id, filters)
+    if format == "columnar":
+        return await asyncio.to_thread(
+            ResponseEncodingService.columnar_response, result, "resumes", request.headers.get("accept-encoding", "")
+        )
+    return result
 
 @router.get("/get-resume")
 async def get_resume(resume_id: int, request: Request):
@@ -64,4 +73,113 @@ async def get_resume(resume_id: int, request: Request):
     if not payload:
         raise HTTPException(status_code=401, detail="Unauthorized")
     user_id = payload["user_id"]
-    return supabase_service.get_resume(resume_id)[0]
\ No newline at end of file
+    return (await supabase_service.run(supabase_service.get_resume, resume_id))[0]
+
+@router.get("/duplicates")
+async def get_duplicates(job_id: int, request: Request):
+    """
+    Get the clusters of near-duplicate resumes in a job
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    user_id = payload["user_id"]
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    resumes = await supabase_service.list_resumes_under_job(job_id, columns="id, file_name, score, duplicate_of, duplicate_similarity")
+    clusters = DedupService.clusters(resumes)
+    return {"job_id": job_id, "clusters": clusters}
+
+@router.get("/score-distribution")
+async def get_score_distribution(
+    job_id: int,
+    request: Request,
+    bins: int = Query(10, ge=1, le=100),
+    include_ranks: bool = False,
+    resume_id: Optional[int] = None,
+):
+    """
+    Get the score histogram, percentiles and school year breakdown of a job, and optionally percentile ranks
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    user_id = payload["user_id"]
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return await supabase_service.run(ScoreStatsService.distribution, job_id, bins, include_ranks, resume_id)
+
+@router.get("/search")
+async def search_resumes(
+    q: str,
+    request: Request,
+    job_id: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+):
+    """
+    Keyword search over the extracted text of all resumes in the user's jobs
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    user_id = payload["user_id"]
+    # SQLite FTS query under the index lock, keep it off the event loop
+    return await asyncio.to_thread(SearchIndexService.search, user_id, q, page, page_size, job_id)
+
+@router.get("/export")
+async def export_resumes(
+    job_id: int,
+    request: Request,
+    format: str = "csv",
+    gzip: bool = False,
+    freshman: bool = False,
+    sophomore: bool = False,
+    junior: bool = False,
+    senior: bool = False,
+    passed: bool = False,
+    failed: bool = False,
+):
+    """
+    Stream all resumes of a job as CSV or NDJSON, optionally gzipped
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    user_id = payload["user_id"]
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    filters = {
+        "Freshman": freshman,
+        "Sophomore": sophomore,
+        "Junior": junior,
+        "Senior": senior,
+        "Passed": passed,
+        "Failed": failed,
+    }
+    rows = supabase_service.iter_resumes_under_job(job_id, filters, columns=",".join(EXPORT_COLUMNS))
+
+    filename = f"job-{job_id}-results.{format}"
+    media_type = EXPORT_FORMATS[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    # The generator is synchronous, so Starlette iterates it in a worker thread
+    return StreamingResponse(
+        ExportService.encode(rows, format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,22 +1,78 @@
 from fastapi import APIRouter
-from services.oauth_credentials_service import OAuthCredentialsService
 from fastapi.responses import RedirectResponse
 from fastapi import Response, Cookie, HTTPException, Request
 from services.jwt_service import JwtService
-from models.application_data import StartJobRequest
+from models.application_data import StartJobRequest, RescoreRequest
 import os
-from dotenv import load_dotenv
 import inngest
-from supabase import create_client, Client
 import logging
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from supabase import create_client, Client
+from services.google_client_service import GoogleClientService
+from services.drive_folder_service import DriveFolderService
 import requests
 from services.supabase_service import SupabaseService
+from services.job_events_service import JobEventsService
+from services.search_index_service import SearchIndexService
+from fastapi.responses import StreamingResponse
+from services.metrics_service import MetricsService, WRITE_BATCH_SIZE
+from services.tracing_service import TracingService
+from services.usage_service import UsageService, USAGE_COLUMNS
+from services.concurrency_service import AdaptiveConcurrencyLimiter, Overloaded
+from services.token_broker_service import TokenBrokerService
+from services.rescore_service import RescoreService
+from services.dedup_service import DedupService
+from services.resume_write_service import ResumeWriteBuffer
+from services.retry_service import RetryService
+from services.score_stats_service import ScoreStatsService
+from services.provisional_score_service import ProvisionalScoreService
+from services.cancellation_service import CancellationService
+import time
+import asyncio
+from datetime import timedelta
 
 supabase_service = SupabaseService()
-load_dotenv()
+
+MODAL_DOWNLOAD_RESUME_URL = os.getenv("MODAL_DOWNLOAD_RESUME_URL", "https://richierish05--prorank-download-resume.modal.run")
+MODAL_SCORE_RESUME_URL = os.getenv("MODAL_SCORE_RESUME_URL", "https://richierish05--prorank-score-resume.modal.run")
+MODAL_RESCORE_URL = os.getenv("MODAL_RESCORE_URL", "https://richierish05--prorank-rescore-resumes.modal.run")
+
+# Adaptive limit on concurrent Gemini scoring calls from this replica
+DEFAULT_RETRY_AFTER_SECONDS = 10
+
+# Drive listing page size and resume ids per manifest chunk step
+DRIVE_PAGE_SIZE = 1000
+RESUME_CHUNK_SIZE = 100
+
+# Concurrent downloads while extracting a priority-ordered job, spread over
+# parallel steps of EXTRACT_STEP_SIZE resumes so a crash reruns only a few
+EXTRACT_CONCURRENCY = int(os.getenv("EXTRACT_CONCURRENCY", "32"))
+EXTRACT_STEP_SIZE = int(os.getenv("EXTRACT_STEP_SIZE", "8"))
+
+# Attempts of score-resume after the first, Inngest's default made explicit so the
+# last attempt can be recognised
+SCORE_RESUME_RETRIES = 3
+
+# What the extract phase leaves on the resume row for score-resume to pick up
+EXTRACTED_KEYS = ("text_url", "duplicate_of", "duplicate_similarity")
+
+# Statuses a job can no longer be cancelled from
+FINISHED_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+# Cancelling a job drops every queued or sleeping run that belongs to it
+CANCEL_ON_JOB = [inngest.Cancel(event="app/cancel-job", if_exp="event.data.job_id == async.data.job_id")]
+
+# Fields the download step hands back to be written with the score
+RESUME_UPDATE_KEYS = ("text_url", "duplicate_of", "duplicate_similarity", "status", "skip_reason")
+scoring_limiter = AdaptiveConcurrencyLimiter(
+    "gemini",
+    initial_limit=int(os.getenv("GEMINI_INITIAL_CONCURRENCY", "4")),
+    max_limit=int(os.getenv("GEMINI_MAX_CONCURRENCY", "64")),
+)
+
+# Status, text link and score updates are coalesced into batched writes
+resume_writes = ResumeWriteBuffer(
+    max_batch=int(os.getenv("RESUME_WRITE_BATCH_SIZE", "100")),
+    max_delay=float(os.getenv("RESUME_WRITE_MAX_DELAY", "0.25")),
+)
 
 router = APIRouter()
 
@@ -38,62 +94,296 @@ async def start_job(request: Request, body: StartJobRequest):
         raise HTTPException(status_code=401, detail="Unauthorized")
     
     user_id = payload["user_id"]
-    credentials_dict = await OAuthCredentialsService.get_credentials_dict(user_id)
 
+    # Fail early if the user has no usable Google credentials
     try:
+        await TokenBrokerService.get_access_token(user_id)
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=f"Google credentials unavailable: {e}")
 
-        # Upload the job to postgres
-        supabase = supabase_service.get_supabase()
-        job = supabase.table("jobs").insert({
-            "user_id": user_id,
-            "google_id": body.folder_id,
-            "status": "pending",
-            "folder_name": body.folder_name,
-            "name": body.name,
-        }).execute().data[0]
-        
-        await inngest_client.send(
-            inngest.Event(
-                name="app/start-job",
-                data={
+    try:
+        with MetricsService.stage("start-job-request", user_id=user_id, folder_id=body.folder_id) as span:
+            # Upload the job to postgres
+            supabase = supabase_service.get_supabase()
+            with MetricsService.external_call("supabase", "insert_job"):
+                job = (await supabase_service.execute(supabase.table("jobs").insert({
                     "user_id": user_id,
-                    "credentials_dict": credentials_dict,
-                    "folder_id": body.folder_id,
-                    "job_id": job["id"]
-                },
-            )
-        )
+                    "google_id": body.folder_id,
+                    "status": "pending",
+                    "folder_name": body.folder_name,
+                    "name": body.name,
+                    "score_duplicates": body.score_duplicates,
+                })))[0]
+            span.set_attribute("job_id", job["id"])
+
+            with MetricsService.external_call("inngest", "send_start_job"):
+                await inngest_client.send(
+                    inngest.Event(
+                        name="app/start-job",
+                        data=MetricsService.observe_payload("event", "start-job", {
+                            "user_id": user_id,
+                            "folder_id": body.folder_id,
+                            "job_id": job["id"],
+                            "score_duplicates": body.score_duplicates,
+                            "priority": body.priority,
+                            "trace": TracingService.inject(),
+                            "enqueued_at": time.time(),
+                        }),
+                    )
+                )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting job: {e}")
     
     return {"message": "Job started"}
 
 
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: int, request: Request):
+    """
+    Stream live resume updates and progress for a job as server-sent events
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != payload["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return StreamingResponse(
+        JobEventsService.stream(job_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{job_id}/usage")
+async def get_job_usage(job_id: int, request: Request):
+    """
+    Get LLM token, latency and cost rollups for a job
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != payload["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    usage = UsageService.summarize(await supabase_service.list_resumes_under_job(job_id, columns=USAGE_COLUMNS))
+    return {"job_id": job_id, **usage}
+
+
+async def get_rescore_job_ids(user_id, job_id: int = None) -> list[int]:
+    """
+    Get the jobs a re-score covers: one job of the user, or all of them
+    """
+    if job_id is None:
+        jobs = await supabase_service.run(supabase_service.get_jobs_under_user, user_id)
+        return [job["id"] for job in jobs if job["status"] != "cancelled"]
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job[0]["status"] == "cancelled":
+        raise HTTPException(status_code=409, detail="Job was cancelled")
+    return [job_id]
+
+
+@router.post("/rescore")
+async def rescore_jobs(request: Request, body: RescoreRequest):
+    """
+    Re-score a job, or every job of the user, from already extracted text
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job_ids = await get_rescore_job_ids(payload["user_id"], body.job_id)
+    resume_ids, skipped = await supabase_service.run(RescoreService.collect, job_ids)
+    if not resume_ids:
+        return {"job_ids": job_ids, "score_version": None, "queued": 0, "skipped": skipped}
+
+    with MetricsService.stage("rescore-request", job_ids=len(job_ids), resumes=len(resume_ids)):
+        with MetricsService.external_call("modal", "rescore_resumes"):
+            res = await asyncio.to_thread(
+                requests.post,
+                MODAL_RESCORE_URL,
+                json={"resume_ids": resume_ids},
+                headers=TracingService.inject(),
+            )
+        if res.status_code != 200:
+            raise HTTPException(status_code=500, detail=f"Error starting re-score: {res.text}")
+
+    result = res.json()
+    return {
+        "job_ids": job_ids,
+        "score_version": result["score_version"],
+        "queued": result["queued"],
+        "batches": result["batches"],
+        "skipped": skipped,
+    }
+
+
+@router.get("/rescore")
+async def get_rescore_progress(request: Request, job_id: int = None, score_version: str = None):
+    """
+    Get the progress of a re-score run, the latest one when no version is given
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job_ids = await get_rescore_job_ids(payload["user_id"], job_id)
+    if not job_ids:
+        return {"job_ids": [], "score_version": score_version, "total": 0, "scored": 0, "failed": 0, "pending": 0, "done": True}
+    progress = await supabase_service.run(RescoreService.progress, job_ids, score_version)
+    return {"job_ids": job_ids, **progress}
+
+
+@router.post("/{job_id}/retry")
+async def retry_job_resumes(job_id: int, request: Request, stuck_minutes: int = 30):
+    """
+    Retry only the failed and stuck pending resumes of a job
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != payload["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job[0]["status"] == "cancelled":
+        raise HTTPException(status_code=409, detail="Job was cancelled")
+
+    resumes = await supabase_service.run(RetryService.find_retryable, job[0], timedelta(minutes=stuck_minutes))
+    if not resumes:
+        return {"retry_id": None, "job_id": job_id, "retried": 0}
+
+    backoff_seconds = await supabase_service.run(RetryService.backoff_seconds, job_id)
+    retry = await supabase_service.run(RetryService.create, job_id, resumes, backoff_seconds)
+    with MetricsService.external_call("inngest", "send_retry_job"):
+        await inngest_client.send(
+            inngest.Event(
+                name="app/retry-job",
+                data=MetricsService.observe_payload("event", "retry-job", {
+                    "user_id": payload["user_id"],
+                    "job_id": job_id,
+                    "retry_id": retry["id"],
+                    "score_duplicates": job[0].get("score_duplicates", False),
+                    "trace": TracingService.inject(),
+                    "enqueued_at": time.time(),
+                }),
+            )
+        )
+
+    return {
+        "retry_id": retry["id"],
+        "job_id": job_id,
+        "retried": len(resumes),
+        "failed": sum(1 for resume in resumes if resume["status"] == "failed"),
+        "stuck": sum(1 for resume in resumes if resume["status"] == "pending"),
+        "backoff_seconds": backoff_seconds,
+    }
+
+
+@router.get("/{job_id}/retry/{retry_id}")
+async def get_retry_diff(job_id: int, retry_id: int, request: Request):
+    """
+    Get what a retry changed: recovered, still failed and in progress resumes
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != payload["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    retry = await supabase_service.run(RetryService.get, job_id, retry_id)
+    if not retry:
+        raise HTTPException(status_code=404, detail="Retry not found")
+    return await supabase_service.run(RetryService.diff, retry)
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: int, request: Request):
+    """
+    Cancel a job: stop its queued and in-flight scoring and report what it saved
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != payload["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job[0]["status"] not in FINISHED_JOB_STATUSES:
+        await CancellationService.cancel(job_id)
+        with MetricsService.external_call("inngest", "send_cancel_job"):
+            await inngest_client.send(inngest.Event(name="app/cancel-job", data={"job_id": job_id}))
+        JobEventsService.publish_job(job_id, "cancelled")
+
+    return await cancellation_report(job_id)
+
+
+@router.get("/{job_id}/cancel")
+async def get_cancellation(job_id: int, request: Request):
+    """
+    Get the resources a cancelled job saved
+    """
+    payload = JwtService.verify_token(request.cookies.get("access_token"))
+    if not payload:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    if not job or job[0]["user_id"] != payload["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await cancellation_report(job_id)
+
+
+async def cancellation_report(job_id: int) -> dict:
+    """
+    Build the cancellation report from the job row and its resumes
+    """
+    job = await supabase_service.run(supabase_service.get_job, job_id)
+    resumes = await supabase_service.list_resumes_under_job(job_id, columns=USAGE_COLUMNS)
+    return CancellationService.report(job[0], resumes)
+
+
 async def kill_job(ctx: inngest.Context) -> None:
     """
     Kill a job
     """
     job_id = ctx.event.data["event"]["data"]["job_id"]
     supabase = supabase_service.get_supabase()
-    supabase.table("jobs").update({
+    updated = await supabase_service.execute(supabase.table("jobs").update({
         "status": "failed"
-    }).eq("id", job_id).execute()
+    }).eq("id", job_id).neq("status", "cancelled"))
+    if updated:
+        JobEventsService.publish_job(job_id, "failed")
 
 async def kill_resume_job(ctx: inngest.Context) -> None:
     """
     Kill a resume job
     """
     resume_job_id = ctx.event.data["event"]["data"]["resume_job_id"]
+    # Not through the write buffer: bulk_update_resumes can't skip resumes already cancelled
     supabase = supabase_service.get_supabase()
-    supabase.table("resumes").update({
+    rows = await supabase_service.execute(supabase.table("resumes").update({
         "status": "failed"
-    }).eq("id", resume_job_id).execute()
+    }).eq("id", resume_job_id).neq("status", "cancelled"))
+    resume = rows[0] if rows else None
+    if resume:
+        ScoreStatsService.update(resume["job_id"], resume)
+        JobEventsService.publish_resume(resume["job_id"], resume)
 
 @inngest_client.create_function(
     fn_id="start-job",
     trigger=inngest.TriggerEvent(event="app/start-job"),
     retries=0,
-    on_failure= kill_job
+    on_failure= kill_job,
+    cancel=CANCEL_ON_JOB,
 )
 
 async def start_job(ctx: inngest.Context) -> None:
@@ -103,189 +393,602 @@ async def start_job(ctx: inngest.Context) -> None:
     # Obtain user information and get credentials to allow gdrive access
     folder_id = ctx.event.data["folder_id"]
     user_id = ctx.event.data["user_id"]
-    credentials_dict = ctx.event.data["credentials_dict"]
     job_id = ctx.event.data["job_id"]
+    trace = ctx.event.data.get("trace")
 
-
-    # Get all pdf files within the chosen folder
-    files = await ctx.step.run(
-        "get-files",
-        get_files,
+    # List the folder into the job's resume rows, which are the job manifest;
+    # only the file count goes into step state
+    listed = await ctx.step.run(
+        "list-files",
+        list_files,
         folder_id,
         user_id,
-        credentials_dict,
+        job_id,
+        trace,
+        ctx.event.data.get("enqueued_at"),
+    )
+    logging.info(f"Job {job_id}: {listed['num_files']} files listed")
+
+    if ctx.event.data.get("priority"):
+        # Extract and pre-score every file first, so the LLM sees the likely top candidates first
+        cursor = 0
+        while cursor is not None:
+            chunk = await ctx.step.run(
+                f"load-resume-chunk-{cursor}",
+                load_resume_chunk,
+                job_id,
+                cursor,
+            )
+            await extract_chunk(ctx, chunk["ids"], cursor, job_id, user_id, trace)
+            cursor = chunk["next_cursor"]
+
+        # Then walk the manifest by descending pre-score
+        offset = 0
+        while offset is not None:
+            chunk = await ctx.step.run(
+                f"load-priority-chunk-{offset}",
+                load_priority_chunk,
+                job_id,
+                offset,
+            )
+            await invoke_scoring(ctx, chunk["ids"], job_id, user_id, trace)
+            offset = chunk["next_offset"]
+    else:
+        # Walk the manifest in chunks; each step output is a cursor and a page of resume ids
+        cursor = 0
+        while cursor is not None:
+            chunk = await ctx.step.run(
+                f"load-resume-chunk-{cursor}",
+                load_resume_chunk,
+                job_id,
+                cursor,
+            )
+            await invoke_scoring(ctx, chunk["ids"], job_id, user_id, trace)
+            cursor = chunk["next_cursor"]
+
+    await ctx.step.run(
+        "update-job-status",
+        update_job_status,
+        job_id,
+        trace,
     )
 
-    # Invoke score-resume function for each file
-    for file in files:
-        try:
-            # Upload the resume id to postgres
-            resume_job = await ctx.step.run(
-                "upload-resume-id",
-                upload_resume_id,
-                file["id"],
+async def extract_chunk(ctx: inngest.Context, resume_ids: list[int], cursor: int, job_id: int, user_id, trace: dict = None) -> None:
+    """
+    Extract a chunk of resumes in small parallel steps, at most EXTRACT_CONCURRENCY downloads at a time
+    """
+    slices = [resume_ids[start:start + EXTRACT_STEP_SIZE] for start in range(0, len(resume_ids), EXTRACT_STEP_SIZE)]
+    steps_per_wave = max(EXTRACT_CONCURRENCY // EXTRACT_STEP_SIZE, 1)
+    for wave in range(0, len(slices), steps_per_wave):
+        await ctx.group.parallel(tuple(
+            lambda index=index: ctx.step.run(
+                f"extract-{cursor}-{index}",
+                extract_resumes,
+                user_id,
                 job_id,
-                file["name"],
+                slices[index],
+                trace,
             )
+            for index in range(wave, min(wave + steps_per_wave, len(slices)))
+        ))
+
+async def invoke_scoring(ctx: inngest.Context, resume_ids: list[int], job_id: int, user_id, trace: dict = None) -> None:
+    """
+    Run score-resume for each resume, in the given order
+    """
+    for resume_job_id in resume_ids:
+        try:
             # Queue the score-resume function
             await ctx.step.invoke(
                 "score-resume",
                 function=score_resume,
-                data={
-                    "file_id": file["id"],
-                    "resume_job_id": resume_job["id"],
+                data=MetricsService.observe_payload("event", "score-resume", {
+                    "resume_job_id": resume_job_id,
                     "job_id": job_id,
-                    "credentials_dict": credentials_dict
-                }
+                    "user_id": user_id,
+                    "score_duplicates": ctx.event.data.get("score_duplicates", False),
+                    "extracted": bool(ctx.event.data.get("priority")),
+                    "trace": trace,
+                    "enqueued_at": time.time(),
+                }),
             )
         except Exception as e:
             # Log error but continue processing other files
-            logging.error(f"Failed to invoke score-resume for file {file.get('id', 'unknown')}: {e}")
+            logging.error(f"Failed to invoke score-resume for resume {resume_job_id}: {e}")
+
+async def kill_retry(ctx: inngest.Context) -> None:
+    """
+    Kill a retry
+    """
+    data = ctx.event.data["event"]["data"]
+    await supabase_service.run(RetryService.set_status, data["retry_id"], "failed")
+    supabase = supabase_service.get_supabase()
+    updated = await supabase_service.execute(supabase.table("jobs").update({
+        "status": "failed"
+    }).eq("id", data["job_id"]).neq("status", "cancelled"))
+    if updated:
+        JobEventsService.publish_job(data["job_id"], "failed")
+
+@inngest_client.create_function(
+    fn_id="retry-job",
+    trigger=inngest.TriggerEvent(event="app/retry-job"),
+    retries=0,
+    on_failure=kill_retry,
+    cancel=CANCEL_ON_JOB,
+)
+async def retry_job(ctx: inngest.Context) -> None:
+    """
+    Re-run the failed and stuck resumes recorded in a retry
+    """
+    user_id = ctx.event.data["user_id"]
+    job_id = ctx.event.data["job_id"]
+    retry_id = ctx.event.data["retry_id"]
+    trace = ctx.event.data.get("trace")
+
+    retry = await ctx.step.run("load-retry", load_retry, job_id, retry_id)
+
+    # Back off when the same job keeps being retried
+    if retry["backoff_seconds"]:
+        await ctx.step.sleep("backoff", timedelta(seconds=retry["backoff_seconds"]))
+
+    await ctx.step.run("reset-resumes", reset_resumes, job_id, retry["resume_ids"], trace)
+
+    for resume_job_id in retry["resume_ids"]:
+        try:
+            await ctx.step.invoke(
+                "score-resume",
+                function=score_resume,
+                data=MetricsService.observe_payload("event", "score-resume", {
+                    "resume_job_id": resume_job_id,
+                    "job_id": job_id,
+                    "user_id": user_id,
+                    "score_duplicates": ctx.event.data.get("score_duplicates", False),
+                    "trace": trace,
+                    "enqueued_at": time.time(),
+                }),
+            )
+        except Exception as e:
+            # A resume that fails again is marked failed by kill_resume_job, keep going
+            logging.error(f"Retry of resume {resume_job_id} failed: {e}")
+
+    await ctx.step.run("update-job-status", update_job_status, job_id, trace)
+    await ctx.step.run("finish-retry", finish_retry, retry_id)
+
+
+async def load_retry(job_id: int, retry_id: int) -> dict:
+    """
+    Load the resume ids a retry covers; the snapshot stays in job_retries
+    """
+    retry = await supabase_service.run(RetryService.get, job_id, retry_id)
+    return MetricsService.observe_payload("step", "load-retry", {
+        "backoff_seconds": retry["backoff_seconds"],
+        "resume_ids": retry["resume_ids"],
+    })
 
-    await ctx.step.run(
-        "update-job-status",
-        update_job_status,
-        job_id
-    )
 
-async def update_job_status(job_id: int) -> None:
+async def finish_retry(retry_id: int) -> None:
+    """
+    Mark a retry as completed
+    """
+    await supabase_service.run(RetryService.set_status, retry_id, "completed")
+
+
+async def reset_resumes(job_id: int, resume_ids: list[int], trace: dict = None) -> None:
+    """
+    Put the retried resumes and their job back to pending
+    """
+    supabase = supabase_service.get_supabase()
+    with MetricsService.stage("reset-resumes", trace, job_id=job_id, resumes=len(resume_ids)):
+        with MetricsService.external_call("supabase", "reset_resumes"):
+            await supabase_service.execute(supabase.table("resumes").update({
+                "status": "pending"
+            }).in_("id", resume_ids))
+        with MetricsService.external_call("supabase", "update_job"):
+            await supabase_service.execute(supabase.table("jobs").update({
+                "status": "pending"
+            }).eq("id", job_id).neq("status", "cancelled"))
+    JobEventsService.publish_job(job_id, "pending")
+
+
+async def update_job_status(job_id: int, trace: dict = None) -> None:
     """
     Update the job status
     """
     supabase = supabase_service.get_supabase()
-    supabase.table("jobs").update({
-        "status": "completed"
-    }).eq("id", job_id).execute()
+    with MetricsService.stage("update-job-status", trace, job_id=job_id), MetricsService.external_call("supabase", "update_job"):
+        updated = await supabase_service.execute(supabase.table("jobs").update({
+            "status": "completed"
+        }).eq("id", job_id).neq("status", "cancelled"))
+    if updated:
+        JobEventsService.publish_job(job_id, "completed")
 
 
-async def get_files(folder_id: str, user_id: str, credentials_dict: dict) -> list[dict]:
+async def list_files(folder_id: str, user_id: str, job_id: int = None, trace: dict = None, enqueued_at: float = None) -> dict:
     """
-    Get all pdf files within the chosen folder
+    List all pdf files within the chosen folder into the job's resume rows, page by page
     """
-    credentials = OAuthCredentialsService.from_authorized_user_info(credentials_dict)
-     
-    service = build('drive', 'v3', credentials=credentials)
-    query = f"'{folder_id}' in parents and mimeType = 'application/pdf' and trashed = false"
+    MetricsService.observe_queue_delay("start-job", enqueued_at)
+    credentials = await TokenBrokerService.get_credentials(user_id)
+    query = f"'{DriveFolderService.escape(folder_id)}' in parents and mimeType = 'application/pdf' and trashed = false"
+
+    num_files = 0
+    with MetricsService.stage("get-files", trace, job_id=job_id, folder_id=folder_id) as span:
+        with GoogleClientService.drive(credentials, user_id) as service:
+            next_page_token = None
+            while True:
+                with MetricsService.external_call("drive", "files.list"):
+                    results = await asyncio.to_thread(service.files().list(
+                        q=query,
+                        spaces='drive',
+                        pageSize=DRIVE_PAGE_SIZE,
+                        fields="nextPageToken, files(id, name)",
+                        pageToken=next_page_token
+                    ).execute)
+                files = results.get('files', [])
+                await insert_resumes(files, job_id)
+                num_files += len(files)
+                next_page_token = results.get('nextPageToken')
+                if not next_page_token:
+                    break
+        span.set_attribute("num_files", num_files)
+
+    return MetricsService.observe_payload("step", "list-files", {"num_files": num_files})
+
+
+async def load_resume_chunk(job_id: int, cursor: int) -> dict:
+    """
+    Get the next page of resume ids of a job after a cursor
+    """
+    supabase = supabase_service.get_supabase()
+    with MetricsService.external_call("supabase", "select_resume_chunk"):
+        rows = await supabase_service.execute(
+            supabase.table("resumes")
+            .select("id")
+            .eq("job_id", job_id)
+            .gt("id", cursor)
+            .order("id")
+            .limit(RESUME_CHUNK_SIZE)
+        )
+    ids = [row["id"] for row in rows]
+    next_cursor = ids[-1] if len(ids) == RESUME_CHUNK_SIZE else None
+    return MetricsService.observe_payload("step", "load-resume-chunk", {"ids": ids, "next_cursor": next_cursor})
 
 
-    results = service.files().list(
-        q=query,
-        spaces='drive'
-    ).execute()
+async def load_priority_chunk(job_id: int, offset: int) -> dict:
+    """
+    Get the next page of resume ids of a job by descending pre-score; resumes without one come last
+    """
+    supabase = supabase_service.get_supabase()
+    with MetricsService.external_call("supabase", "select_priority_chunk"):
+        rows = await supabase_service.execute(
+            supabase.table("resumes")
+            .select("id")
+            .eq("job_id", job_id)
+            .order("provisional_score", desc=True, nullsfirst=False)
+            .order("id")
+            .range(offset, offset + RESUME_CHUNK_SIZE - 1)
+        )
+    ids = [row["id"] for row in rows]
+    next_offset = offset + RESUME_CHUNK_SIZE if len(ids) == RESUME_CHUNK_SIZE else None
+    return MetricsService.observe_payload("step", "load-priority-chunk", {"ids": ids, "next_offset": next_offset})
 
-    files = results.get('files', [])
-    next_page_token = results.get('nextPageToken')
-    while next_page_token:
-        results = service.files().list(
-            q=query,
-            spaces='drive',
-            pageToken=next_page_token
-        ).execute()
-        files.extend(results.get('files', []))
-        next_page_token = results.get('nextPageToken', None)
 
-    return files
+async def extract_resumes(user_id: str, job_id: int, resume_ids: list[int], trace: dict = None) -> dict:
+    """
+    Extract and pre-score a few resumes at once, keeping the text link and duplicate link for scoring
+    """
+    async def extract(resume_job_id: int) -> bool:
+        if await CancellationService.is_cancelled(job_id):
+            return False
+        try:
+            result = await download_resume(user_id, resume_job_id, job_id, trace, pre_score=True)
+            fields = {key: result[key] for key in EXTRACTED_KEYS if result.get(key) is not None}
+            if fields.get("text_url"):
+                await resume_writes.write(resume_job_id, fields)
+            return True
+        except Exception as e:
+            # score-resume downloads it again and handles the failure
+            logging.error(f"Failed to extract resume {resume_job_id}: {e}")
+            return False
 
+    with MetricsService.stage("extract-chunk", trace, job_id=job_id, resumes=len(resume_ids)):
+        extracted = await asyncio.gather(*(extract(resume_job_id) for resume_job_id in resume_ids))
+    return MetricsService.observe_payload("step", "extract-chunk", {
+        "extracted": sum(extracted),
+        "failed": len(extracted) - sum(extracted),
+    })
 
 
 @inngest_client.create_function(
     fn_id="score-resume",
     trigger=inngest.TriggerEvent(event="app/score-resume"),
-    on_failure=kill_resume_job
+    retries=SCORE_RESUME_RETRIES,
+    on_failure=kill_resume_job,
+    cancel=CANCEL_ON_JOB,
 )
 async def score_resume(ctx: inngest.Context) -> None:
     """
     Score a resume
     """
-    file_id = ctx.event.data["file_id"]
     resume_job_id = ctx.event.data["resume_job_id"]
     job_id = ctx.event.data["job_id"]
-    credentials_dict = ctx.event.data["credentials_dict"]
+    # Events queued before the token broker carried the whole credentials row
+    user_id = ctx.event.data.get("user_id") or ctx.event.data["credentials_dict"]["user_id"]
+    trace = ctx.event.data.get("trace")
     
-    # Download the resume to GCS bucket
-    await ctx.step.run(
-        "download-resume",
-        download_resume,
-        file_id,
-        credentials_dict,
-        resume_job_id
-    )
+    # A priority-ordered job already extracted the resume, reuse its text link and duplicate check
+    downloaded = None
+    if ctx.event.data.get("extracted"):
+        downloaded = await ctx.step.run(
+            "load-extracted",
+            load_extracted,
+            resume_job_id,
+            job_id,
+            ctx.event.data.get("enqueued_at"),
+        )
 
-    # Generate the score
-    await ctx.step.run(
-        "generate-score",
-        generate_score,
-        resume_job_id
-    )
+    # Otherwise download the resume to GCS bucket
+    if not downloaded:
+        downloaded = await ctx.step.run(
+            "download-resume",
+            download_resume,
+            user_id,
+            resume_job_id,
+            job_id,
+            trace,
+            ctx.event.data.get("enqueued_at"),
+        )
+
+    # The job was cancelled before the resume was downloaded, its row is already cancelled
+    if (downloaded or {}).get("cancelled"):
+        return
+
+    # Everything learned about the resume is committed in one write at the end
+    update = {key: value for key, value in (downloaded or {}).items() if key in RESUME_UPDATE_KEYS}
+
+    try:
+        # Near-duplicates of an already scored resume reuse its score instead of calling the LLM
+        scores = None
+        duplicate_of = update.get("duplicate_of")
+        if duplicate_of and not ctx.event.data.get("score_duplicates"):
+            scores = await ctx.step.run(
+                "reuse-score",
+                reuse_score,
+                resume_job_id,
+                duplicate_of,
+                trace,
+            )
 
-    # Update the resume status
+        # Generate the score, unless the file was too large to extract
+        if not scores and not (downloaded or {}).get("skipped"):
+            scores = await ctx.step.run(
+                "generate-score",
+                generate_score,
+                resume_job_id,
+                trace,
+                ctx.attempt,
+                update.get("text_url"),
+                job_id,
+            )
+    except inngest.StepError:
+        # Scoring ran out of retries; still keep the text and duplicate links the download found
+        await ctx.step.run("fail-resume", update_resume_status, resume_job_id, trace, {**update, "status": "failed"})
+        raise
+    except inngest.RetryAfterError:
+        # Rate limited on the last attempt fails the whole run, not just the step, so no
+        # further step can run; write what the download found before giving up
+        if ctx.attempt >= SCORE_RESUME_RETRIES:
+            await update_resume_status(resume_job_id, trace, {**update, "status": "failed"})
+        raise
+
+    if scores and scores.get("status") == "cancelled":
+        # Keep what the download learned, but don't mark the resume scored
+        await ctx.step.run("cancel-resume", update_resume_status, resume_job_id, trace, {**update, **scores})
+        return
+
+    # Commit the score and the status together
     await ctx.step.run(
         "update-resume-status",
         update_resume_status,
-        resume_job_id
+        resume_job_id,
+        trace,
+        {**update, **(scores or {})},
     )
 
 
-async def update_resume_status(resume_job_id: int) -> None:
+async def load_extracted(resume_job_id: int, job_id: int = None, enqueued_at: float = None) -> dict | None:
     """
-    Update the resume status
+    Get what the extract phase stored for a resume; None when it has no text yet
     """
+    MetricsService.observe_queue_delay("score-resume", enqueued_at)
+    if await CancellationService.is_cancelled(job_id):
+        return {"cancelled": True}
     supabase = supabase_service.get_supabase()
-    supabase.table("resumes").update({
-        "status": "scored"
-    }).eq("id", resume_job_id).execute()
+    with MetricsService.external_call("supabase", "select_extracted"):
+        rows = await supabase_service.execute(
+            supabase.table("resumes").select(",".join(EXTRACTED_KEYS)).eq("id", resume_job_id)
+        )
+    if not rows or not rows[0]["text_url"]:
+        return None
+    return MetricsService.observe_payload("step", "load-extracted", rows[0])
+
+
+async def update_resume_status(resume_job_id: int, trace: dict = None, fields: dict = None) -> None:
+    """
+    Update the resume status, together with any fields gathered while scoring it
+    """
+    with MetricsService.stage("update-resume-status", trace, resume_job_id=resume_job_id):
+        resume = await resume_writes.write(resume_job_id, {"status": "scored", **(fields or {})})
+    if resume:
+        ScoreStatsService.update(resume["job_id"], resume)
+        JobEventsService.publish_resume(resume["job_id"], resume)
 
     return {"success": True, "message": "Resume status updated"}
 
 
 
-async def download_resume(file_id: str, credentials_dict: dict, resume_job_id: int) -> str:
+async def download_resume(user_id: str, resume_job_id: int, job_id: int = None, trace: dict = None, enqueued_at: float = None, pre_score: bool = False) -> str:
     """
-    Download the resume to GCS bucket
+    Download the resume to GCS bucket and add its text to the search index
     """
+    MetricsService.observe_queue_delay("score-resume", enqueued_at)
+    if await CancellationService.is_cancelled(job_id):
+        return {"cancelled": True}
+
+    # The worker only gets a short-lived access token, never the refresh token
+    token = await TokenBrokerService.get_worker_token(user_id)
+
+    with MetricsService.stage("download-resume", trace, job_id=job_id, resume_job_id=resume_job_id):
+        with MetricsService.external_call("modal", "download_resume"):
+            res = await asyncio.to_thread(
+                requests.post,
+                MODAL_DOWNLOAD_RESUME_URL,
+                json={
+                    "token": token,
+                    "resume_job_id": resume_job_id,
+                    "include_text": True,
+                    "defer_write": True,
+                },
+                headers=TracingService.inject(),
+            )
 
-    res = requests.post(
-        "https://richierish05--prorank-download-resume.modal.run",
-        json={
-            "file_id": file_id,
-            "credentials_dict": credentials_dict,
-            "resume_job_id": resume_job_id
-        }
-    )       
+        if res.status_code == 401:
+            # The token was revoked or expired early, get a new one on retry
+            TokenBrokerService.invalidate(user_id)
+        if res.status_code != 200:
+            raise HTTPException(status_code=500, detail=f"Error downloading resume: {res.text}")
+
+    # Keep the text out of the step output, Inngest stores it as step state
+    result = res.json()
+    MetricsService.observe_worker_memory("download-resume", result.pop("peak_rss_bytes", None))
+    text = result.pop("text", None)
+    if text and job_id is not None:
+        try:
+            await asyncio.to_thread(
+                SearchIndexService.index_resume,
+                resume_job_id,
+                job_id,
+                user_id,
+                text,
+                result.pop("file_name", None),
+            )
+        except Exception as e:
+            logging.error(f"Failed to index resume {resume_job_id}: {e}")
+        try:
+            with MetricsService.stage("detect-duplicate", trace, resume_job_id=resume_job_id) as span:
+                duplicate = await supabase_service.run(DedupService.register, resume_job_id, user_id, text)
+                span.set_attribute("duplicate", duplicate is not None)
+            if duplicate:
+                result.update(duplicate)
+        except Exception as e:
+            # Dedup only saves LLM calls, the resume is scored normally without it
+            logging.error(f"Failed to check resume {resume_job_id} for duplicates: {e}")
+        try:
+            await write_provisional_score(resume_job_id, text, trace, heuristic_fallback=pre_score)
+        except Exception as e:
+            logging.error(f"Failed to write provisional score of resume {resume_job_id}: {e}")
+    return MetricsService.observe_payload("step", "download-resume", result)
 
-    if res.status_code != 200:
-        raise HTTPException(status_code=500, detail=f"Error downloading resume: {res.text}")
-    return res.json()
 
-async def generate_score(resume_job_id: int) -> str:
+async def write_provisional_score(resume_job_id: int, text: str, trace: dict = None, heuristic_fallback: bool = False) -> None:
     """
-    Generate the score
+    Write the local model's score so the resume ranks before its LLM score arrives
     """
-    res = requests.post(
-        "https://richierish05--prorank-score-resume.modal.run",
-        json={
-            "resume_job_id": resume_job_id
-        }
-    )
-    if res.status_code != 200:
-        raise HTTPException(status_code=500, detail=f"Error generating score: {res.text}")
-    return res.json()
+    with MetricsService.stage("provisional-score", trace, resume_job_id=resume_job_id):
+        provisional = await asyncio.to_thread(ProvisionalScoreService.score, text, heuristic_fallback)
+        if provisional is None:
+            return
+        resume = await resume_writes.write(resume_job_id, provisional)
+    if resume:
+        JobEventsService.publish_resume(resume["job_id"], resume)
 
 
-async def upload_resume_id(file_id: str, job_id: str, file_name: str) -> dict:
+async def reuse_score(resume_job_id: int, original_id: int, trace: dict = None) -> dict | None:
     """
-    Upload the resume id to postgres
+    Get the score of the original resume to copy onto its near-duplicate
     """
-    supabase = supabase_service.get_supabase()
-    resume = supabase.table("resumes").insert({
-        "google_id": file_id,
-        "job_id": job_id,
-        "status": "pending",
-        "view_url": f"https://drive.google.com/file/d/{file_id}/view",
-        "preview_url": f"https://drive.google.com/file/d/{file_id}/preview",
-        "file_name": file_name,
-    }).execute().data
+    with MetricsService.stage("reuse-score", trace, resume_job_id=resume_job_id, original_id=original_id):
+        with MetricsService.external_call("supabase", "select_original_score"):
+            return await supabase_service.run(DedupService.reuse_score, original_id)
+
+async def generate_score(resume_job_id: int, trace: dict = None, attempt: int = 0, text_url: str = None, job_id: int = None) -> dict:
+    """
+    Generate the score, returning the columns to write rather than writing them
+    """
+    if await CancellationService.is_cancelled(job_id):
+        return {"status": "cancelled"}
 
-    return resume[0]
+    with MetricsService.stage("generate-score", trace, resume_job_id=resume_job_id):
+        try:
+            async with scoring_limiter.slot() as slot:
+                # The slot may have taken a while, don't spend a Gemini call on a cancelled job
+                if await CancellationService.is_cancelled(job_id):
+                    slot.skipped()
+                    return {"status": "cancelled"}
+                with MetricsService.external_call("modal", "score_resume"):
+                    res = await asyncio.to_thread(
+                        requests.post,
+                        MODAL_SCORE_RESUME_URL,
+                        json={
+                            "resume_job_id": resume_job_id,
+                            "attempt": attempt,
+                            "text_url": text_url,
+                            "job_id": job_id,
+                            "defer_write": True,
+                        },
+                        headers=TracingService.inject(),
+                    )
+                if res.status_code in (429, 503):
+                    retry_after = parse_retry_after(res.headers.get("Retry-After"))
+                    slot.overloaded(retry_after)
+                    raise Overloaded(f"Scoring is rate limited: {res.text}", retry_after or DEFAULT_RETRY_AFTER_SECONDS)
+                if res.status_code != 200:
+                    raise HTTPException(status_code=500, detail=f"Error generating score: {res.text}")
+                result = res.json()
+                if result.get("cancelled"):
+                    # The worker stopped before calling Gemini, its latency says nothing about the quota
+                    slot.skipped()
+                    return {"status": "cancelled"}
+        except Overloaded as e:
+            # Let Inngest retry once the quota should have recovered instead of failing the step
+            raise inngest.RetryAfterError(str(e), int(e.retry_after * 1000))
+    return MetricsService.observe_payload("step", "generate-score", result.get("update") or {})
+
+
+def parse_retry_after(value: str) -> float | None:
+    """
+    Parse a Retry-After header given in seconds
+    """
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def insert_resumes(files: list[dict], job_id: int, chunk_size: int = 500) -> None:
+    """
+    Add Drive files to a job's resumes; files already in the job are left alone, so a retried listing is safe
+    """
+    supabase = supabase_service.get_supabase()
+    for start in range(0, len(files), chunk_size):
+        with MetricsService.external_call("supabase", "insert_resumes"):
+            resumes = await supabase_service.execute(supabase.table("resumes").upsert(
+                [
+                    {
+                        "google_id": file["id"],
+                        "job_id": job_id,
+                        "status": "pending",
+                        "view_url": f"https://drive.google.com/file/d/{file['id']}/view",
+                        "preview_url": f"https://drive.google.com/file/d/{file['id']}/preview",
+                        "file_name": file["name"],
+                    }
+                    for file in files[start:start + chunk_size]
+                ],
+                on_conflict="job_id,google_id",
+                ignore_duplicates=True,
+            ))
+        WRITE_BATCH_SIZE.labels("resumes_insert").observe(len(resumes))
+        for resume in resumes:
+            JobEventsService.publish_resume(job_id, resume)
 
 
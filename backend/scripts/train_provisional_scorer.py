@@ -0,0 +1,122 @@
+"""
+Train the provisional scorer on resumes that already have an LLM score.
+
+Texts come from the local search index (SEARCH_INDEX_PATH), labels from the score
+columns in Supabase. Duplicates that reused another resume's score are left out so
+the same text isn't counted twice. A holdout split is kept aside to evaluate the
+model against the LLM scores: Pearson and Spearman correlation, MAE against a
+predict-the-mean baseline, and how many of the LLM's top-k the model also puts in
+its top-k.
+
+Writes <out>/<version>.npz and <out>/<version>.json (the evaluation report), and
+copies the model to <out>/latest.npz, the default PROVISIONAL_MODEL_PATH.
+
+Usage (from backend/):
+    python -m scripts.train_provisional_scorer [--out artifacts/provisional_scorer] [--holdout 0.2] [--epochs 8]
+"""
+
+from dotenv import load_dotenv
+
+# Like main.py: SEARCH_INDEX_PATH and the Supabase settings are read at import time
+load_dotenv()
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+
+from services.provisional_score_service import ProvisionalScoreService, TARGET_COLUMNS, featurize
+from services.search_index_service import SearchIndexService
+from services.supabase_service import SupabaseService
+
+MIN_SAMPLES = 50
+TOP_K = (10, 50)
+PAGE_SIZE = 1000
+
+
+def load_labelled() -> tuple[list[str], np.ndarray]:
+    supabase = SupabaseService().get_supabase()
+    rows, last_id = [], 0
+    while True:
+        page = (
+            supabase.table("resumes")
+            .select("id, " + ", ".join(TARGET_COLUMNS))
+            .eq("status", "scored")
+            .not_.is_("score", "null")
+            .is_("duplicate_of", "null")
+            .gt("id", last_id)
+            .order("id")
+            .limit(PAGE_SIZE)
+            .execute().data
+        )
+        rows += page
+        if len(page) < PAGE_SIZE:
+            break
+        last_id = page[-1]["id"]
+
+    texts = SearchIndexService.get_texts([row["id"] for row in rows])
+    rows = [row for row in rows if texts.get(row["id"]) and all(row[column] is not None for column in TARGET_COLUMNS)]
+    print(f"{len(rows)} scored resumes with indexed text")
+    return (
+        [texts[row["id"]] for row in rows],
+        np.array([[row[column] for column in TARGET_COLUMNS] for row in rows], dtype=np.float32),
+    )
+
+
+def top_k_overlap(model, texts: list[str], targets: np.ndarray) -> dict:
+    predicted = np.array([model.predict_features(*featurize(text, model.feature_bits))[0] for text in texts])
+    overlap = {}
+    for k in TOP_K:
+        if len(texts) >= k:
+            ours = set(np.argsort(-predicted)[:k].tolist())
+            theirs = set(np.argsort(-targets[:, 0])[:k].tolist())
+            overlap[f"top_{k}"] = round(len(ours & theirs) / k, 3)
+    return overlap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default="artifacts/provisional_scorer")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts, targets = load_labelled()
+    if len(texts) < MIN_SAMPLES:
+        raise SystemExit(f"Need at least {MIN_SAMPLES} scored resumes with indexed text, found {len(texts)}")
+
+    order = np.random.default_rng(args.seed).permutation(len(texts))
+    split = int(len(texts) * (1 - args.holdout))
+    train, holdout = order[:split], order[split:]
+
+    model = ProvisionalScoreService.train(
+        [texts[i] for i in train], targets[train], epochs=args.epochs, seed=args.seed,
+    )
+    holdout_texts = [texts[i] for i in holdout]
+    report = ProvisionalScoreService.evaluate(model, holdout_texts, targets[holdout])
+    report["score"].update(top_k_overlap(model, holdout_texts, targets[holdout]))
+    model.metadata["evaluation"] = report
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{model.version}.npz")
+    model.save(path)
+    shutil.copyfile(path, os.path.join(args.out, "latest.npz"))
+    with open(os.path.join(args.out, f"{model.version}.json"), "w") as report_file:
+        json.dump(model.metadata, report_file, indent=2)
+
+    print(f"Model {model.version}: trained on {len(train)}, evaluated on {len(holdout)}")
+    print(f"{'column':<30} {'pearson':>8} {'spearman':>9} {'mae':>7} {'baseline':>9}")
+    for column in TARGET_COLUMNS:
+        metrics = report[column]
+        print(f"{column:<30} {metrics['pearson']:>8} {metrics['spearman']:>9} {metrics['mae']:>7} {metrics['baseline_mae']:>9}")
+    for key in (f"top_{k}" for k in TOP_K):
+        if key in report["score"]:
+            print(f"{key} overlap with LLM ranking: {report['score'][key]:.0%}")
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cancellation Service - Cooperative cancellation of a job and a report of what it saved.
+
+Key points:
+- Cancelling marks the job cancelled and every still pending resume cancelled in two
+  queries; the app/cancel-job event then makes Inngest drop the job's queued and
+  sleeping runs
+- Runs already past that point check is_cancelled before each Modal call, and the
+  Modal worker checks the job between extracting a resume and calling Gemini, so
+  in-flight work stops at the next boundary instead of running to the end
+- is_cancelled caches the answer, either way, for CHECK_TTL_SECONDS so a job with
+  thousands of runs doesn't query the job row for each one; cancelling on this
+  replica is seen immediately
+- Cancelled jobs can't be retried or re-scored, the routes answer 409
+- The report estimates the Gemini tokens, cost and call time avoided from the
+  average usage of the job's resumes that were scored (DEFAULT_* when none were)
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from services.supabase_service import SupabaseService
+from services.usage_service import UsageService
+
+CHECK_TTL_SECONDS = 2.0
+# Typical usage of one scoring call, for jobs cancelled before anything was scored
+DEFAULT_TOKENS_PER_RESUME = {"prompt": 2500, "completion": 150}
+DEFAULT_LATENCY_MS = 4000
+
+supabase_service = SupabaseService()
+
+
+class CancellationService:
+
+    _checked: dict = {}
+
+    @classmethod
+    async def is_cancelled(cls, job_id: Optional[int]) -> bool:
+        """
+        Check whether a job was cancelled, at most once per CHECK_TTL_SECONDS
+        """
+        if job_id is None:
+            return False
+        checked = cls._checked.get(job_id)
+        if checked is not None and time.monotonic() - checked[0] < CHECK_TTL_SECONDS:
+            return checked[1]
+
+        rows = await supabase_service.execute(
+            supabase_service.get_supabase().table("jobs").select("status").eq("id", job_id)
+        )
+        cancelled = bool(rows) and rows[0]["status"] == "cancelled"
+        cls._remember(job_id, cancelled)
+        return cancelled
+
+    @classmethod
+    def _remember(cls, job_id: int, cancelled: bool) -> None:
+        now = time.monotonic()
+        # Drop expired answers so the cache only holds jobs checked in the last TTL
+        for stale in [key for key, (checked_at, _) in cls._checked.items() if now - checked_at >= CHECK_TTL_SECONDS]:
+            cls._checked.pop(stale, None)
+        cls._checked[job_id] = (now, cancelled)
+
+    @classmethod
+    async def cancel(cls, job_id: int) -> int:
+        """
+        Mark a job and its pending resumes cancelled; returns how many resumes were cancelled
+        """
+        supabase = supabase_service.get_supabase()
+        await supabase_service.execute(
+            supabase.table("jobs").update({
+                "status": "cancelled",
+                "cancelled_at": datetime.now(timezone.utc).isoformat(),
+            }).eq("id", job_id)
+        )
+        cls._remember(job_id, True)
+        query = (
+            supabase.table("resumes").update({"status": "cancelled"}, count="exact", returning="minimal")
+            .eq("job_id", job_id)
+            .eq("status", "pending")
+        )
+        return (await supabase_service.run(query.execute)).count or 0
+
+    @staticmethod
+    def report(job: dict, resumes: list[dict]) -> dict:
+        """
+        Summarize a cancelled job: where its resumes ended up and the LLM work that was avoided
+        """
+        statuses = {}
+        for resume in resumes:
+            statuses[resume["status"]] = statuses.get(resume["status"], 0) + 1
+        avoided = statuses.get("cancelled", 0)
+
+        usage = UsageService.summarize(resumes)
+        scored = usage["num_scored"]
+        if scored:
+            prompt_tokens = usage["prompt_tokens"] / scored
+            completion_tokens = usage["completion_tokens"] / scored
+            cost = usage["estimated_cost_usd"] / scored
+            latency_ms = usage["latency_ms"]["p50"] or DEFAULT_LATENCY_MS
+        else:
+            prompt_tokens = DEFAULT_TOKENS_PER_RESUME["prompt"]
+            completion_tokens = DEFAULT_TOKENS_PER_RESUME["completion"]
+            cost = UsageService.estimate_cost(None, prompt_tokens, completion_tokens)
+            latency_ms = DEFAULT_LATENCY_MS
+
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "cancelled_at": job.get("cancelled_at"),
+            "num_resumes": len(resumes),
+            "statuses": statuses,
+            "avoided": {
+                "llm_calls": avoided,
+                "tokens": round(avoided * (prompt_tokens + completion_tokens)),
+                "estimated_cost_usd": round(avoided * cost, 6),
+                "llm_seconds": round(avoided * latency_ms / 1000, 1),
+            },
+            "spent": {
+                "llm_calls": scored,
+                "tokens": usage["total_tokens"],
+                "estimated_cost_usd": usage["estimated_cost_usd"],
+            },
+        }
+
@@ -0,0 +1,173 @@
+"""
+Concurrency Service - AIMD adaptive concurrency limit for calls to rate-limited APIs.
+
+Key points:
+- The limit grows additively (about +1 per limit's worth of healthy completions)
+  while latency stays near its baseline
+- On a 429/503 or a latency spike the limit is cut multiplicatively, at most once
+  per cooldown so one burst of failures doesn't collapse it to the floor
+- A Retry-After from the upstream blocks new calls until that time
+- Callers that can't get a slot within `acquire_timeout` are told to come back
+  later instead of piling up, which is the backpressure Inngest retries lacked
+- The current limit and in-flight count are exported as Prometheus gauges
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from services.metrics_service import ADAPTIVE_IN_FLIGHT, ADAPTIVE_LIMIT, ADAPTIVE_THROTTLED
+
+
+class Overloaded(Exception):
+    """
+    Raised when no slot frees up in time or the upstream asked us to back off
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Slot:
+    """
+    Handed to the caller for one call; report how the call went before leaving the block
+    """
+
+    def __init__(self):
+        self.outcome = "success"
+        self.retry_after = None
+
+    def overloaded(self, retry_after: Optional[float] = None) -> None:
+        self.outcome = "overload"
+        self.retry_after = retry_after
+
+    def failed(self) -> None:
+        self.outcome = "error"
+
+    def skipped(self) -> None:
+        """
+        The call was abandoned or didn't do the work, keep it out of the latency baseline
+        """
+        self.outcome = "skipped"
+
+
+class AdaptiveConcurrencyLimiter:
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 5.0,
+        acquire_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.acquire_timeout = acquire_timeout
+
+        self.in_flight = 0
+        self.baseline_latency = None
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self._condition = None
+        ADAPTIVE_LIMIT.labels(name).set(self.limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _decrease(self, now: float, reason: str) -> None:
+        ADAPTIVE_THROTTLED.labels(self.name, reason).inc()
+        if now - self.last_decrease < self.cooldown:
+            return
+        self.last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def _increase(self) -> None:
+        # Additive increase: roughly +1 once a full window of calls has succeeded
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def record(self, latency: float, outcome: str, retry_after: Optional[float] = None) -> None:
+        """
+        Adjust the limit from the result of one call
+        """
+        now = time.monotonic()
+        if outcome == "overload":
+            self._decrease(now, "overload")
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+        elif outcome == "success":
+            if self.baseline_latency is None:
+                self.baseline_latency = latency
+            if latency > self.baseline_latency * self.latency_tolerance:
+                self._decrease(now, "latency")
+            else:
+                self._increase()
+            # Slow moving average so the baseline follows real drift but not spikes
+            self.baseline_latency = 0.95 * self.baseline_latency + 0.05 * latency
+        ADAPTIVE_LIMIT.labels(self.name).set(self.limit)
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit) and time.monotonic() >= self.blocked_until
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot, or raise Overloaded once acquire_timeout has passed
+        """
+        condition = self._get_condition()
+        deadline = time.monotonic() + self.acquire_timeout
+        async with condition:
+            while not self._has_capacity():
+                now = time.monotonic()
+                if now >= deadline:
+                    ADAPTIVE_THROTTLED.labels(self.name, "queue_timeout").inc()
+                    raise Overloaded(
+                        f"{self.name}: no capacity (limit {int(self.limit)}, in flight {self.in_flight})",
+                        max(self.blocked_until - now, 1.0),
+                    )
+                # Wake up on release, when the Retry-After window ends, or at the deadline
+                wait = deadline - now
+                if self.blocked_until > now:
+                    wait = min(wait, self.blocked_until - now)
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+            ADAPTIVE_IN_FLIGHT.labels(self.name).set(self.in_flight)
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            ADAPTIVE_IN_FLIGHT.labels(self.name).set(self.in_flight)
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one slot for the duration of a call and feed its outcome back into the limit
+        """
+        await self.acquire()
+        slot = Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception:
+            if slot.outcome == "success":
+                slot.failed()
+            raise
+        finally:
+            self.record(time.monotonic() - start, slot.outcome, slot.retry_after)
+            await self.release()
@@ -0,0 +1,188 @@
+"""
+Dedup Service - Near-duplicate resume detection with MinHash signatures and LSH bands.
+
+Key points:
+- Signatures are NUM_PERMUTATIONS MinHash values over word SHINGLE_SIZE-grams of the
+  extracted text, stored in resume_minhash
+- Signatures are split into LSH_BANDS bands of LSH_ROWS values; each band hash goes into
+  resume_lsh_bands so candidates are found with one indexed lookup per user
+- Candidates are confirmed by estimated Jaccard similarity >= DUPLICATE_THRESHOLD before
+  a resume is marked as duplicate_of an earlier one (written with the resume's score)
+- Matching is scoped to one user's jobs, so the same resume dropped into several job
+  folders, or re-uploaded with small edits, is scored by the LLM only once
+"""
+
+import hashlib
+import os
+import re
+from typing import Optional
+
+from services.supabase_service import SupabaseService
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.9"))
+
+# Score columns copied from the original when a duplicate reuses its score
+SCORE_COLUMNS = (
+    "gpa",
+    "school_year",
+    "num_internships",
+    "score",
+    "gpa_contribution",
+    "experience_contribution",
+    "impact_quality_contribution",
+)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"\w+")
+
+
+def _permutations() -> list[tuple[int, int]]:
+    # Fixed seeds so signatures stay comparable across processes and deploys
+    permutations = []
+    for i in range(NUM_PERMUTATIONS):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % _MERSENNE_PRIME or 1
+        b = int.from_bytes(digest[8:], "little") % _MERSENNE_PRIME
+        permutations.append((a, b))
+    return permutations
+
+
+PERMUTATIONS = _permutations()
+supabase_service = SupabaseService()
+
+
+class DedupService:
+
+    @staticmethod
+    def shingles(text: str) -> set[int]:
+        """
+        Hash the word n-grams of a text to 32-bit integers
+        """
+        words = _WORD.findall(text.lower())
+        if len(words) < SHINGLE_SIZE:
+            words = words + [""] * (SHINGLE_SIZE - len(words))
+        return {
+            int.from_bytes(hashlib.blake2b(" ".join(words[i:i + SHINGLE_SIZE]).encode(), digest_size=4).digest(), "little")
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        }
+
+    @staticmethod
+    def signature(text: str) -> list[int]:
+        """
+        Compute the MinHash signature of a text
+        """
+        shingles = DedupService.shingles(text)
+        return [
+            min(((a * shingle + b) % _MERSENNE_PRIME) & _MAX_HASH for shingle in shingles)
+            for a, b in PERMUTATIONS
+        ]
+
+    @staticmethod
+    def bands(signature: list[int]) -> list[str]:
+        """
+        Split a signature into LSH band keys
+        """
+        keys = []
+        for band in range(LSH_BANDS):
+            rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+            digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    @staticmethod
+    def similarity(first: list[int], second: list[int]) -> float:
+        """
+        Estimate the Jaccard similarity of two texts from their signatures
+        """
+        if not first or not second or len(first) != len(second):
+            return 0.0
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+    @classmethod
+    def register(cls, resume_id: int, user_id, text: str) -> Optional[dict]:
+        """
+        Store a resume's signature and find the earlier resume it near-duplicates, if any
+        """
+        supabase = supabase_service.get_supabase()
+        signature = cls.signature(text)
+        bands = cls.bands(signature)
+
+        candidate_ids = {
+            row["resume_id"]
+            for row in supabase.table("resume_lsh_bands")
+            .select("resume_id")
+            .eq("user_id", user_id)
+            .in_("band", bands)
+            .execute().data
+            if row["resume_id"] != resume_id
+        }
+
+        match = None
+        if candidate_ids:
+            candidates = (
+                supabase.table("resume_minhash")
+                .select("resume_id, signature, resumes(duplicate_of)")
+                .in_("resume_id", list(candidate_ids))
+                .execute().data
+            )
+            for candidate in candidates:
+                similarity = cls.similarity(signature, candidate["signature"])
+                original_id = (candidate.get("resumes") or {}).get("duplicate_of") or candidate["resume_id"]
+                if original_id == resume_id:
+                    # A later duplicate of this resume, seen when the download step is retried
+                    continue
+                # Most similar wins, ties go to the earliest resume so a cluster keeps one original
+                if similarity >= DUPLICATE_THRESHOLD and (
+                    match is None or (similarity, -original_id) > (match["similarity"], -match["duplicate_of"])
+                ):
+                    match = {"duplicate_of": original_id, "similarity": round(similarity, 4)}
+
+        supabase.table("resume_minhash").upsert(
+            {"resume_id": resume_id, "user_id": user_id, "signature": signature},
+            on_conflict="resume_id",
+        ).execute()
+        supabase.table("resume_lsh_bands").upsert(
+            [{"resume_id": resume_id, "user_id": user_id, "band": band} for band in bands],
+            on_conflict="resume_id,band",
+        ).execute()
+        if match is None:
+            return None
+        return {"duplicate_of": match["duplicate_of"], "duplicate_similarity": match["similarity"]}
+
+    @staticmethod
+    def reuse_score(original_id: int) -> Optional[dict]:
+        """
+        Get the score columns of the original resume to copy onto a duplicate, if it is scored
+        """
+        original = supabase_service.get_resume(original_id)
+        if not original or original[0].get("score") is None:
+            return None
+        return {column: original[0].get(column) for column in SCORE_COLUMNS}
+
+    @staticmethod
+    def clusters(resumes: list[dict]) -> list[dict]:
+        """
+        Group resumes by the original they duplicate; singletons are left out
+        """
+        groups = {}
+        for resume in resumes:
+            root = resume.get("duplicate_of") or resume["id"]
+            groups.setdefault(root, []).append(resume)
+
+        clusters = []
+        for root, members in groups.items():
+            duplicates = [member for member in members if member["id"] != root]
+            if not duplicates:
+                continue
+            clusters.append({
+                "original_id": root,
+                "resumes": sorted(members, key=lambda member: member["id"]),
+                "size": len(members),
+                "min_similarity": min(member.get("duplicate_similarity") or 1.0 for member in duplicates),
+            })
+        return sorted(clusters, key=lambda cluster: -cluster["size"])
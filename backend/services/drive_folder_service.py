@@ -0,0 +1,185 @@
+"""
+Drive Folder Service - Lists a user's Google Drive folders for the folder picker.
+
+Key points:
+- Drive calls are blocking, so they run in a worker thread instead of on the event loop
+- Only id/name/parents are requested from Drive
+- Each page is cached per user for a short TTL, and concurrent requests for the same
+  page share one Drive call
+- After a page is served, the next page and the first page of its child folders can be
+  prefetched in the background so browsing deeper is instant
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from google.oauth2.credentials import Credentials
+
+from services.google_client_service import GoogleClientService
+from services.profiling_service import ProfilingService
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+FOLDER_FIELDS = "nextPageToken, files(id, name, parents)"
+
+CACHE_TTL_SECONDS = 60
+MAX_CACHED_PAGES = 2048
+MAX_PREFETCH_CHILDREN = 10
+MAX_CONCURRENT_PREFETCHES = 8
+
+
+class DriveFolderService:
+
+    _cache: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+    _in_flight: dict = {}
+    _background_tasks: set = set()
+    _prefetch_semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def escape(value: str) -> str:
+        """
+        Escape a value for a single-quoted string in a Drive query
+        """
+        return value.replace("\\", "\\\\").replace("'", "\\'")
+
+    @staticmethod
+    def build_query(parent_id: Optional[str]) -> str:
+        """
+        Build the Drive query for folders, optionally restricted to one parent
+        """
+        query = f"mimeType = '{FOLDER_MIME_TYPE}' and trashed = false"
+        if parent_id:
+            query += f" and '{DriveFolderService.escape(parent_id)}' in parents"
+        return query
+
+    @staticmethod
+    def _list_page(credentials: Credentials, user_id: str, parent_id: Optional[str], page_token: Optional[str], page_size: int) -> dict:
+        """
+        Fetch one page of folders from Drive (blocking)
+        """
+        query_params = {
+            "q": DriveFolderService.build_query(parent_id),
+            "pageSize": page_size,
+            "fields": FOLDER_FIELDS,
+        }
+        if page_token:
+            query_params["pageToken"] = page_token
+
+        with GoogleClientService.drive(credentials, user_id) as service, ProfilingService.track("google"):
+            results = service.files().list(**query_params).execute()
+
+        return {
+            "files": results.get("files", []),
+            "nextPageToken": results.get("nextPageToken"),
+        }
+
+    @classmethod
+    def _get_cached(cls, key: tuple) -> Optional[dict]:
+        entry = cls._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, page = entry
+        if expires_at < time.monotonic():
+            cls._cache.pop(key, None)
+            return None
+        cls._cache.move_to_end(key)
+        return page
+
+    @classmethod
+    def _set_cached(cls, key: tuple, page: dict) -> None:
+        cls._cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, page)
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > MAX_CACHED_PAGES:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    async def _load(cls, key: tuple, credentials: Credentials, user_id: str, parent_id: Optional[str], page_token: Optional[str], page_size: int) -> dict:
+        page = await asyncio.to_thread(cls._list_page, credentials, user_id, parent_id, page_token, page_size)
+        cls._set_cached(key, page)
+        return page
+
+    @classmethod
+    async def _fetch(cls, credentials: Credentials, user_id: str, parent_id: Optional[str], page_token: Optional[str], page_size: int) -> dict:
+        """
+        Get a page from the cache, or from Drive while sharing the call with concurrent requests
+        """
+        key = (str(user_id), parent_id, page_token, page_size)
+        page = cls._get_cached(key)
+        if page is not None:
+            return page
+
+        future = cls._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                cls._load(key, credentials, user_id, parent_id, page_token, page_size)
+            )
+            cls._in_flight[key] = future
+            future.add_done_callback(lambda _: cls._in_flight.pop(key, None))
+
+        # Shielded so a disconnecting client does not cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    @classmethod
+    def is_cached(cls, user_id: str, parent_id: Optional[str], page_token: Optional[str], page_size: int) -> bool:
+        """
+        Check whether a page can be served without calling Drive
+        """
+        return cls._get_cached((str(user_id), parent_id, page_token, page_size)) is not None
+
+    @classmethod
+    def invalidate_user(cls, user_id: str) -> None:
+        """
+        Drop every cached page for a user
+        """
+        for key in [key for key in cls._cache if key[0] == str(user_id)]:
+            cls._cache.pop(key, None)
+
+    @classmethod
+    async def _prefetch(cls, credentials: Credentials, user_id: str, parent_id: Optional[str], page_token: Optional[str], page_size: int) -> None:
+        if cls._prefetch_semaphore is None:
+            cls._prefetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PREFETCHES)
+        try:
+            async with cls._prefetch_semaphore:
+                await cls._fetch(credentials, user_id, parent_id, page_token, page_size)
+        except Exception as e:
+            logging.warning(f"Folder prefetch failed for user {user_id}: {e}")
+
+    @classmethod
+    def _schedule_prefetch(cls, credentials: Credentials, user_id: str, parent_id: Optional[str], page: dict, page_size: int) -> None:
+        """
+        Warm the cache with the next page and the first page of each child folder
+        """
+        targets = []
+        if page.get("nextPageToken"):
+            targets.append((parent_id, page["nextPageToken"]))
+        for folder in page["files"][:MAX_PREFETCH_CHILDREN]:
+            targets.append((folder["id"], None))
+
+        for target_parent_id, target_page_token in targets:
+            if cls.is_cached(user_id, target_parent_id, target_page_token, page_size):
+                continue
+            task = asyncio.create_task(
+                cls._prefetch(credentials, user_id, target_parent_id, target_page_token, page_size)
+            )
+            cls._background_tasks.add(task)
+            task.add_done_callback(cls._background_tasks.discard)
+
+    @classmethod
+    async def list_folders(
+        cls,
+        user_id: str,
+        credentials: Credentials,
+        parent_id: Optional[str] = None,
+        page_token: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: bool = True,
+    ) -> dict:
+        """
+        List one page of folders, optionally under a parent folder ("root" for the top of My Drive)
+        """
+        page = await cls._fetch(credentials, user_id, parent_id, page_token, page_size)
+        if prefetch:
+            cls._schedule_prefetch(credentials, user_id, parent_id, page, page_size)
+        return page
@@ -0,0 +1,99 @@
+"""
+Export Service - Streams a job's results as CSV or NDJSON.
+
+Key points:
+- Rows come from SupabaseService.iter_resumes_under_job, which pages with keyset
+  pagination, so only one page is held in memory at a time
+- Encoders are generators that yield chunks as pages arrive, so the first byte
+  goes out after the first page no matter how large the job is
+- Optional gzip is applied incrementally with a streaming compressor
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator
+
+EXPORT_COLUMNS = [
+    "id",
+    "file_name",
+    "status",
+    "score",
+    "school_year",
+    "gpa",
+    "num_internships",
+    "gpa_contribution",
+    "experience_contribution",
+    "impact_quality_contribution",
+    "view_url",
+]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Flush the CSV buffer once it holds roughly this many bytes
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportService:
+
+    @staticmethod
+    def to_csv(rows: Iterable[dict]) -> Iterator[bytes]:
+        """
+        Encode rows as CSV with a header line
+        """
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def to_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+        """
+        Encode rows as newline-delimited JSON
+        """
+        chunk = []
+        size = 0
+        for row in rows:
+            line = json.dumps({column: row.get(column) for column in EXPORT_COLUMNS}, default=str) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield "".join(chunk).encode("utf-8")
+                chunk = []
+                size = 0
+        yield "".join(chunk).encode("utf-8")
+
+    @staticmethod
+    def gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Gzip a stream of chunks incrementally
+        """
+        compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def encode(rows: Iterable[dict], export_format: str, gzip: bool = False) -> Iterator[bytes]:
+        """
+        Encode rows in the requested format, optionally gzipped
+        """
+        if export_format == "csv":
+            chunks = ExportService.to_csv(rows)
+        elif export_format == "ndjson":
+            chunks = ExportService.to_ndjson(rows)
+        else:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        return ExportService.gzip(chunks) if gzip else chunks
@@ -0,0 +1,122 @@
+"""
+Google Client Service - Builds Google API clients (Drive, OAuth2) without paying
+the discovery cost on every request.
+
+Key points:
+- Discovery documents are the static ones bundled with google-api-python-client,
+  parsed once per process and shared by every client
+- Authorized HTTP sessions are pooled per user so connections to googleapis.com
+  are reused between requests
+- httplib2 is not thread safe, so a client is checked out for the duration of a
+  `with` block and handed back to the pool afterwards
+- This module only depends on the Google client libraries so the Modal worker
+  can ship the same file (see modal/main.py)
+- googleapiclient and httplib2 are imported on first use, keeping them out of
+  the backend's import time
+"""
+
+import json
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional
+
+from google.oauth2.credentials import Credentials
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+
+MAX_POOLED_USERS = 256
+MAX_CLIENTS_PER_USER = 4
+
+
+class GoogleClientService:
+
+    _documents: dict = {}
+    _pools: "OrderedDict[tuple, deque]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_document(cls, api: str, version: str) -> dict:
+        """
+        Get the parsed discovery document for an API, loading the bundled copy once
+        """
+        key = (api, version)
+        document = cls._documents.get(key)
+        if document is None:
+            from googleapiclient.discovery_cache import get_static_doc
+            content = get_static_doc(api, version)
+            if content is None:
+                raise ValueError(f"No bundled discovery document for {api} {version}")
+            document = json.loads(content)
+            cls._documents[key] = document
+        return document
+
+    @classmethod
+    def build(cls, api: str, version: str, credentials: Credentials) -> "Resource":
+        """
+        Build a client from the cached discovery document with its own authorized session
+        """
+        import google_auth_httplib2
+        from googleapiclient.discovery import build_from_document
+        from googleapiclient.http import build_http
+
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+        return build_from_document(cls.get_document(api, version), http=http)
+
+    @classmethod
+    @contextmanager
+    def client(cls, api: str, version: str, credentials: Credentials, pool_key: Optional[str] = None):
+        """
+        Check out a client for the duration of a `with` block.
+        Clients with a pool_key (usually the user id) are reused by later requests.
+        """
+        if pool_key is None:
+            yield cls.build(api, version, credentials)
+            return
+
+        # A new refresh token (or, for brokered access-token-only credentials, a new
+        # access token) gets a fresh pool so stale sessions are never reused
+        key = (api, version, str(pool_key), credentials.refresh_token or credentials.token)
+        service = None
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool:
+                service = pool.pop()
+                cls._pools.move_to_end(key)
+
+        if service is None:
+            service = cls.build(api, version, credentials)
+
+        try:
+            yield service
+        finally:
+            with cls._lock:
+                pool = cls._pools.setdefault(key, deque())
+                cls._pools.move_to_end(key)
+                if len(pool) < MAX_CLIENTS_PER_USER:
+                    pool.append(service)
+                while len(cls._pools) > MAX_POOLED_USERS:
+                    cls._pools.popitem(last=False)
+
+    @classmethod
+    def drive(cls, credentials: Credentials, pool_key: Optional[str] = None):
+        """
+        Check out a Drive v3 client
+        """
+        return cls.client("drive", "v3", credentials, pool_key)
+
+    @classmethod
+    def oauth2(cls, credentials: Credentials, pool_key: Optional[str] = None):
+        """
+        Check out an OAuth2 v2 client
+        """
+        return cls.client("oauth2", "v2", credentials, pool_key)
+
+    @classmethod
+    def preload(cls) -> None:
+        """
+        Parse the discovery documents ahead of the first request
+        """
+        cls.get_document("drive", "v3")
+        cls.get_document("oauth2", "v2")
@@ -0,0 +1,159 @@
+"""
+Job Events Service - Fans out live job progress to every open dashboard.
+
+Key points:
+- One in-process broadcaster per replica; the Inngest steps that change a resume
+  publish to it and every SSE subscriber of that job gets a copy
+- Progress (pending/scored/failed counts, throughput, ETA) is only tracked for jobs
+  that currently have subscribers, seeded from the database on first subscribe
+- Subscriber queues are bounded so a slow client drops old events instead of
+  holding memory; progress events are snapshots so dropping them is harmless
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+
+from services.supabase_service import SupabaseService
+
+SUBSCRIBER_QUEUE_SIZE = 100
+THROUGHPUT_WINDOW_SECONDS = 300
+KEEPALIVE_SECONDS = 15
+
+
+class JobProgress:
+    """
+    Per-resume statuses of a job plus a sliding window of completion times
+    """
+
+    def __init__(self, job_id: int, resumes: list[dict]):
+        self.job_id = job_id
+        self.statuses = {resume["id"]: resume["status"] for resume in resumes}
+        self.completions = deque()
+
+    def apply(self, resume_id: int, status: str) -> None:
+        previous = self.statuses.get(resume_id)
+        self.statuses[resume_id] = status
+        if previous != status and status in ("scored", "failed"):
+            self.completions.append(time.monotonic())
+
+    def snapshot(self) -> dict:
+        counts = {"pending": 0, "scored": 0, "failed": 0}
+        for status in self.statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+
+        now = time.monotonic()
+        while self.completions and self.completions[0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self.completions.popleft()
+
+        throughput = None
+        if len(self.completions) > 1:
+            elapsed = max(now - self.completions[0], 1.0)
+            throughput = len(self.completions) / elapsed
+
+        eta_seconds = None
+        if throughput and counts["pending"]:
+            eta_seconds = round(counts["pending"] / throughput)
+        elif not counts["pending"]:
+            eta_seconds = 0
+
+        return {
+            "job_id": self.job_id,
+            "total": len(self.statuses),
+            **counts,
+            "throughput_per_minute": round(throughput * 60, 2) if throughput else None,
+            "eta_seconds": eta_seconds,
+        }
+
+
+class JobEventsService:
+
+    supabase_service = SupabaseService()
+    _subscribers: dict[int, set] = {}
+    _progress: dict[int, JobProgress] = {}
+
+    @classmethod
+    async def subscribe(cls, job_id: int) -> asyncio.Queue:
+        """
+        Register a subscriber for a job, seeding its progress from the database if needed
+        """
+        job_id = int(job_id)
+        if job_id not in cls._progress:
+            # Paged, a single select stops at PostgREST's max-rows
+            resumes = await cls.supabase_service.list_resumes_under_job(job_id, columns="id,status")
+            # Another subscriber may have seeded it while we waited
+            cls._progress.setdefault(job_id, JobProgress(job_id, resumes))
+
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        cls._subscribers.setdefault(job_id, set()).add(queue)
+        queue.put_nowait(("progress", cls._progress[job_id].snapshot()))
+        return queue
+
+    @classmethod
+    def unsubscribe(cls, job_id: int, queue: asyncio.Queue) -> None:
+        """
+        Remove a subscriber, dropping the job's progress once nobody is listening
+        """
+        job_id = int(job_id)
+        subscribers = cls._subscribers.get(job_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            cls._subscribers.pop(job_id, None)
+            cls._progress.pop(job_id, None)
+
+    @classmethod
+    def _broadcast(cls, job_id: int, event: str, data: dict) -> None:
+        for queue in cls._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((event, data))
+
+    @classmethod
+    def publish_resume(cls, job_id: int, resume: dict) -> None:
+        """
+        Publish a resume's new status/score along with the job's updated progress
+        """
+        job_id = int(job_id)
+        progress = cls._progress.get(job_id)
+        if progress is None:
+            return
+
+        progress.apply(resume["id"], resume["status"])
+        cls._broadcast(job_id, "resume", {
+            "id": resume["id"],
+            "status": resume["status"],
+            "score": resume.get("score"),
+            "school_year": resume.get("school_year"),
+            "file_name": resume.get("file_name"),
+        })
+        cls._broadcast(job_id, "progress", progress.snapshot())
+
+    @classmethod
+    def publish_job(cls, job_id: int, status: str) -> None:
+        """
+        Publish a change of the job's own status
+        """
+        job_id = int(job_id)
+        if job_id not in cls._subscribers:
+            return
+        cls._broadcast(job_id, "job", {"job_id": job_id, "status": status})
+
+    @classmethod
+    async def stream(cls, job_id: int, is_disconnected):
+        """
+        Yield server-sent events for a job until the client disconnects
+        """
+        queue = await cls.subscribe(job_id)
+        try:
+            while not await is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            cls.unsubscribe(job_id, queue)
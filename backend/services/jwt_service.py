@@ -1,6 +1,7 @@
 import os
 import jwt
 from datetime import datetime, timedelta
+from services.profiling_service import ProfilingService
 
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -17,7 +18,8 @@ class JwtService:
     @staticmethod
     def verify_token(token: str):
         try:
-            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            with ProfilingService.track("jwt"):
+                return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
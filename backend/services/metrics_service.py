@@ -0,0 +1,160 @@
+"""
+Metrics Service - Prometheus metrics for the backend, served on /metrics.
+
+Key points:
+- Stage histograms cover every step of a job (Drive listing, row inserts, Modal
+  download/scoring, status updates) and each stage also opens a tracing span
+- External calls (Supabase, Drive, Modal, Inngest) are counted by outcome and timed
+- In-flight gauges show how many of each stage are running right now
+- Metrics are per process; scrape every replica
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from services.tracing_service import TracingService
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_LATENCY = Histogram(
+    "prorank_stage_duration_seconds",
+    "Time spent in each stage of a job",
+    ["stage", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_IN_FLIGHT = Gauge(
+    "prorank_stage_in_flight",
+    "Stages currently running",
+    ["stage"],
+)
+EXTERNAL_CALLS = Counter(
+    "prorank_external_calls_total",
+    "Calls to external services",
+    ["service", "operation", "outcome"],
+)
+EXTERNAL_LATENCY = Histogram(
+    "prorank_external_call_duration_seconds",
+    "Latency of calls to external services",
+    ["service", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+QUEUE_DELAY = Histogram(
+    "prorank_queue_delay_seconds",
+    "Time between sending an Inngest event and its function starting",
+    ["function"],
+    buckets=LATENCY_BUCKETS,
+)
+ADAPTIVE_LIMIT = Gauge(
+    "prorank_adaptive_concurrency_limit",
+    "Current limit of an adaptive concurrency limiter",
+    ["limiter"],
+)
+ADAPTIVE_IN_FLIGHT = Gauge(
+    "prorank_adaptive_concurrency_in_flight",
+    "Calls currently holding a slot of an adaptive concurrency limiter",
+    ["limiter"],
+)
+ADAPTIVE_THROTTLED = Counter(
+    "prorank_adaptive_concurrency_throttled_total",
+    "Times an adaptive limiter backed off or turned a caller away",
+    ["limiter", "reason"],
+)
+WRITE_BATCH_SIZE = Histogram(
+    "prorank_write_batch_size",
+    "Rows per coalesced write",
+    ["table"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+WORKER_PEAK_RSS = Histogram(
+    "prorank_worker_peak_rss_bytes",
+    "Peak resident memory reported by a Modal worker container after a request",
+    ["worker"],
+    buckets=tuple(mb * 1024 * 1024 for mb in (128, 256, 512, 768, 1024, 1536, 2048, 4096, 8192)),
+)
+PAYLOAD_BYTES = Histogram(
+    "prorank_inngest_payload_bytes",
+    "JSON size of Inngest event payloads and step outputs",
+    ["kind", "name"],
+    buckets=(128, 256, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+HTTP_LATENCY = Histogram(
+    "prorank_http_request_duration_seconds",
+    "Latency of HTTP requests by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsService:
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str, carrier: Optional[dict] = None, **attributes):
+        """
+        Time a stage of a job and trace it as a span
+        """
+        STAGE_IN_FLIGHT.labels(name).inc()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with TracingService.span(name, carrier, **attributes) as span:
+                yield span
+            outcome = "success"
+        finally:
+            STAGE_IN_FLIGHT.labels(name).dec()
+            STAGE_LATENCY.labels(name, outcome).observe(time.perf_counter() - start)
+
+    @staticmethod
+    @contextmanager
+    def external_call(service: str, operation: str):
+        """
+        Count and time a call to an external service
+        """
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with TracingService.span(f"{service}.{operation}"):
+                yield
+            outcome = "success"
+        finally:
+            EXTERNAL_LATENCY.labels(service, operation).observe(time.perf_counter() - start)
+            EXTERNAL_CALLS.labels(service, operation, outcome).inc()
+
+    @staticmethod
+    def observe_queue_delay(function: str, enqueued_at: Optional[float]) -> None:
+        """
+        Record how long an event waited before its function started
+        """
+        if enqueued_at:
+            QUEUE_DELAY.labels(function).observe(max(time.time() - enqueued_at, 0))
+
+    @staticmethod
+    def observe_worker_memory(worker: str, peak_rss_bytes: Optional[int]) -> None:
+        """
+        Record the peak RSS a worker container reported
+        """
+        if peak_rss_bytes:
+            WORKER_PEAK_RSS.labels(worker).observe(peak_rss_bytes)
+
+    @staticmethod
+    def observe_payload(kind: str, name: str, payload):
+        """
+        Record the serialized size of an event payload or step output and hand it back
+        """
+        PAYLOAD_BYTES.labels(kind, name).observe(len(json.dumps(payload, default=str)))
+        return payload
+
+    @staticmethod
+    def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+        HTTP_LATENCY.labels(method, route, str(status)).observe(seconds)
+
+    @staticmethod
+    def render() -> tuple[bytes, str]:
+        """
+        Render all metrics in the Prometheus text format
+        """
+        return generate_latest(), CONTENT_TYPE_LATEST
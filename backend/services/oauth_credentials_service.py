@@ -12,9 +12,7 @@ Key points:
 import os
 from datetime import datetime, timedelta
 from typing import Optional
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
 from services.supabase_service import SupabaseService
 
 CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
@@ -30,6 +28,8 @@ class OAuthCredentialsService:
         """
         Get the OAuth flow for the Google API in order to get the credentials
         """
+        # Only the OAuth routes need this, so it is imported on first login
+        from google_auth_oauthlib.flow import Flow
         return Flow.from_client_config(
             {
                 "web": {
@@ -50,7 +50,7 @@ class OAuthCredentialsService:
         )
 
     @staticmethod
-    def get_redirect_uri(flow: Flow):
+    def get_redirect_uri(flow):
         """
         Get the redirect URI for the OAuth flow
         """
@@ -73,13 +73,13 @@ class OAuthCredentialsService:
         supabase = OAuthCredentialsService.supabase_service.get_supabase()
 
         try:
-            user_result = supabase.table("User").select("*").eq("email", email).execute().data
+            user_result = await OAuthCredentialsService.supabase_service.execute(supabase.table("User").select("*").eq("email", email))
             if not user_result:
-                user_insert = supabase.table("User").insert({
+                user_insert = await OAuthCredentialsService.supabase_service.execute(supabase.table("User").insert({
                     "email": email,
                     "picture": picture,
                     "created_at": datetime.now().isoformat()
-                }).execute().data
+                }))
                 user = user_insert[0] 
             else:
                 user = user_result[0]
@@ -87,7 +87,7 @@ class OAuthCredentialsService:
             user_id = user['id']
     
             # Check if credentials already exist for this user
-            existing_credentials = supabase.table("OauthCredentials").select("*").eq("user_id", user_id).execute().data
+            existing_credentials = await OAuthCredentialsService.supabase_service.execute(supabase.table("OauthCredentials").select("*").eq("user_id", user_id))
 
             # Google often only returns a refresh_token on the first consent for a given user+client.
             # On subsequent auth flows, credentials.refresh_token may be None - do not overwrite a
@@ -105,14 +105,14 @@ class OAuthCredentialsService:
             
             if existing_credentials and len(existing_credentials) > 0:
                 # Update existing credentials
-                oauth_credentials = supabase.table("OauthCredentials").update(credential_data).eq("user_id", user_id).execute().data
+                oauth_credentials = await OAuthCredentialsService.supabase_service.execute(supabase.table("OauthCredentials").update(credential_data).eq("user_id", user_id))
             else:
                 # Insert new credentials
-                oauth_credentials = supabase.table("OauthCredentials").insert(credential_data).execute().data
+                oauth_credentials = await OAuthCredentialsService.supabase_service.execute(supabase.table("OauthCredentials").insert(credential_data))
             
             oauth_credentials = oauth_credentials[0]
             if user['credentials_id'] != oauth_credentials['id']:
-                supabase.table("User").update({"credentials_id": oauth_credentials['id']}).eq("id", user_id).execute()
+                await OAuthCredentialsService.supabase_service.execute(supabase.table("User").update({"credentials_id": oauth_credentials['id']}).eq("id", user_id))
 
             return oauth_credentials
 
@@ -135,16 +135,27 @@ class OAuthCredentialsService:
         Get credentials dictionary from database
         """
         supabase = OAuthCredentialsService.supabase_service.get_supabase()
-        user = supabase.table("User").select("*").eq("id", user_id).execute().data
+        user = await OAuthCredentialsService.supabase_service.execute(supabase.table("User").select("*").eq("id", user_id))
         if not user or len(user) == 0:
             raise ValueError(f"No user found for user_id: {user_id}")
 
-        credential_data = supabase.table("OauthCredentials").select("*").eq("user_id", user_id).execute().data
+        credential_data = await OAuthCredentialsService.supabase_service.execute(supabase.table("OauthCredentials").select("*").eq("user_id", user_id))
         if not credential_data or len(credential_data) == 0:
             raise ValueError(f"No credentials found for user_id: {user_id}")
 
         return credential_data[0]
 
+    @staticmethod
+    async def update_access_token(user_id: int, access_token: str, expiry: Optional[datetime]):
+        """
+        Store a refreshed access token, keeping the refresh token as is
+        """
+        supabase = OAuthCredentialsService.supabase_service.get_supabase()
+        await OAuthCredentialsService.supabase_service.execute(supabase.table("OauthCredentials").update({
+            "access_token": access_token,
+            "expiry": expiry.isoformat() if expiry else None,
+        }).eq("user_id", user_id))
+
     @staticmethod
     def from_authorized_user_info(credentials_dict: dict) -> Credentials:
         """
@@ -0,0 +1,167 @@
+"""
+Profiling Service - Opt-in per-request profiles: a cProfile of the request plus wall time per dependency.
+
+Key points:
+- Off unless PROFILE_SAMPLE_RATE > 0 or PROFILE_ADMIN_TOKEN is set; when off the middleware
+  is a single attribute check and track() is a context variable lookup
+- A request is profiled when sampled, or when it sends X-Profile with the admin token
+- Wall time in Supabase (every PostgREST request, via httpx event hooks), Google APIs
+  and JWT verification is accumulated per request through a context variable, so
+  calls made in worker threads (asyncio.to_thread) are attributed to their request
+- cProfile only sees the event loop thread and can run one profile at a time; while one
+  is running other profiled requests still get dependency timings
+- Profiles are written to PROFILE_DIR (.prof for snakeviz/pstats plus a .json summary);
+  admins can send X-Profile-Output: inline to get the summary as the response body
+- A Server-Timing header with the dependency timings is added to every profiled response
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+TOP_FUNCTIONS = 30
+
+
+class RequestProfile:
+    """
+    Wall time and call counts per dependency for one request
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: dict = {}
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float) -> None:
+        with self._lock:
+            count, total = self.timings.get(category, (0, 0.0))
+            self.timings[category] = (count + 1, total + seconds)
+
+    def summary(self) -> dict:
+        return {
+            category: {"calls": count, "ms": round(total * 1000, 2)}
+            for category, (count, total) in sorted(self.timings.items())
+        }
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+_cpu_profiler_lock = threading.Lock()
+
+
+class ProfilingService:
+
+    enabled = SAMPLE_RATE > 0 or bool(ADMIN_TOKEN)
+
+    @staticmethod
+    @contextmanager
+    def track(category: str):
+        """
+        Add the wall time of a block to the current request's profile, if it is being profiled
+        """
+        profile = _current.get()
+        if profile is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.add(category, time.perf_counter() - start)
+
+    @staticmethod
+    def instrument_httpx(client, category: str) -> None:
+        """
+        Time every request an httpx client makes, up to the response headers
+        """
+        def on_request(request):
+            if _current.get() is not None:
+                request.extensions["profile_started"] = time.perf_counter()
+
+        def on_response(response):
+            profile = _current.get()
+            started = response.request.extensions.get("profile_started")
+            if profile is not None and started is not None:
+                profile.add(category, time.perf_counter() - started)
+
+        client.event_hooks["request"].append(on_request)
+        client.event_hooks["response"].append(on_response)
+
+    @staticmethod
+    def select(headers) -> Optional[str]:
+        """
+        Decide whether to profile a request: "inline" or "file", or None to skip it
+        """
+        token = headers.get("x-profile")
+        if ADMIN_TOKEN and token == ADMIN_TOKEN:
+            return "inline" if headers.get("x-profile-output") == "inline" else "file"
+        if SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE:
+            return "file"
+        return None
+
+    @staticmethod
+    def start() -> tuple[RequestProfile, Optional[cProfile.Profile], object]:
+        """
+        Start profiling the current request
+        """
+        profile = RequestProfile()
+        token = _current.set(profile)
+        profiler = None
+        if _cpu_profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler (e.g. a debugger) is already attached
+                _cpu_profiler_lock.release()
+                profiler = None
+        return profile, profiler, token
+
+    @staticmethod
+    def stop(profile: RequestProfile, profiler: Optional[cProfile.Profile], token, method: str, route: str, status: int) -> dict:
+        """
+        Stop profiling and build the summary; the CPU profile is written to PROFILE_DIR
+        """
+        wall_ms = round((time.perf_counter() - profile.started) * 1000, 2)
+        _current.reset(token)
+
+        result = {
+            "method": method,
+            "route": route,
+            "status": status,
+            "wall_ms": wall_ms,
+            "dependencies": profile.summary(),
+        }
+        if profiler is not None:
+            profiler.disable()
+            _cpu_profiler_lock.release()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            result["top_functions"] = output.getvalue()
+
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            name = f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{route.strip('/').replace('/', '_') or 'root'}-{os.getpid()}-{random.randrange(1 << 16):04x}"
+            profiler.dump_stats(os.path.join(PROFILE_DIR, f"{name}.prof"))
+            with open(os.path.join(PROFILE_DIR, f"{name}.json"), "w") as summary_file:
+                json.dump(result, summary_file, indent=2)
+            result["profile_file"] = os.path.join(PROFILE_DIR, f"{name}.prof")
+        return result
+
+    @staticmethod
+    def server_timing(result: dict) -> str:
+        """
+        Format dependency timings as a Server-Timing header
+        """
+        entries = [f"{category};dur={timing['ms']}" for category, timing in result["dependencies"].items()]
+        entries.append(f"total;dur={result['wall_ms']}")
+        return ", ".join(entries)
@@ -0,0 +1,214 @@
+"""
+Provisional Score Service - Instant CPU-only scores from a hashed bag-of-words model distilled from LLM scores.
+
+Key points:
+- Words and word bigrams are hashed into 2**FEATURE_BITS signed buckets with crc32,
+  weighted 1 + log(count) and L2-normalised; no vocabulary to ship or keep in sync
+- One linear model predicts the score and the three contribution columns; it is
+  trained offline with Adagrad (scripts/train_provisional_scorer.py) on resumes that
+  already have an LLM score
+- Artifacts are versioned .npz files carrying their own feature settings and an
+  evaluation report; the backend loads PROVISIONAL_MODEL_PATH once and skips
+  provisional scoring when no model is deployed
+- Provisional scores are written to resumes.provisional_score right after the text is
+  extracted; the LLM score in resumes.score takes precedence once it arrives
+- Priority-ordered jobs need a pre-score for every file even without a deployed model;
+  they fall back to a keyword heuristic that mirrors the rubric (GPA, internships,
+  quantified impact)
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+PROVISIONAL_MODEL_PATH = os.getenv("PROVISIONAL_MODEL_PATH", "artifacts/provisional_scorer/latest.npz")
+FEATURE_BITS = 18
+TARGET_COLUMNS = ("score", "gpa_contribution", "experience_contribution", "impact_quality_contribution")
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+HEURISTIC_VERSION = "heuristic-v1"
+_GPA = re.compile(r"\b(?:gpa|grade point average)\b[^0-9]{0,20}([0-4]\.\d{1,2})|\b([0-4]\.\d{1,2})\s*/\s*4\.0{1,2}\b")
+_INTERNSHIP = re.compile(r"\bintern(?:ship)?s?\b")
+_IMPACT = re.compile(r"\d[\d,.]*\s*(?:%|percent|x\b|k\b|users|customers)|\$\s?\d|\b(?:led|launched|increased|reduced|improved|founded|published)\b")
+
+
+def featurize(text: str, feature_bits: int = FEATURE_BITS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Turn a text into the sparse (indices, values) of its hashed bag of words and bigrams
+    """
+    words = _WORD.findall(text.lower())
+    tokens = Counter(words)
+    tokens.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+
+    mask = (1 << feature_bits) - 1
+    buckets = {}
+    for token, count in tokens.items():
+        hashed = zlib.crc32(token.encode())
+        index = hashed & mask
+        sign = 1.0 if hashed & 0x80000000 else -1.0
+        buckets[index] = buckets.get(index, 0.0) + sign * (1.0 + math.log(count))
+
+    indices = np.fromiter(buckets.keys(), dtype=np.int64, count=len(buckets))
+    values = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+    norm = float(np.linalg.norm(values))
+    if norm > 0:
+        values /= norm
+    return indices, values
+
+
+def heuristic_score(text: str) -> int:
+    """
+    Score a resume from keywords alone: up to 20 points for GPA, 24 for internships and 16 for quantified impact
+    """
+    lower = text.lower()
+    gpas = [float(first or second) for first, second in _GPA.findall(lower)]
+    gpa = max((value for value in gpas if value <= 4.0), default=None)
+    gpa_points = 10 if gpa is None else min(max((gpa - 2.5) / 1.5, 0), 1) * 20
+    internship_points = 8 * min(len(_INTERNSHIP.findall(lower)), 3)
+    impact_points = 2 * min(len(_IMPACT.findall(lower)), 8)
+    return int(round(40 + gpa_points + internship_points + impact_points))
+
+
+class ProvisionalModel:
+    """
+    Weights of a trained provisional scorer plus the metadata it was saved with
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, metadata: dict):
+        self.weights = weights
+        self.bias = bias
+        self.metadata = metadata
+        self.version = metadata["version"]
+        self.feature_bits = metadata["feature_bits"]
+
+    def predict_features(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return values @ self.weights[indices] + self.bias
+
+    def predict(self, text: str) -> dict:
+        """
+        Predict the score columns of one resume text
+        """
+        prediction = self.predict_features(*featurize(text, self.feature_bits))
+        result = {column: float(value) for column, value in zip(TARGET_COLUMNS, prediction)}
+        result["score"] = int(round(min(max(result["score"], 0), 100)))
+        return result
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, metadata=json.dumps(self.metadata))
+
+    @classmethod
+    def load(cls, path: str) -> "ProvisionalModel":
+        with np.load(path) as artifact:
+            return cls(artifact["weights"], artifact["bias"], json.loads(str(artifact["metadata"])))
+
+
+class ProvisionalScoreService:
+
+    _model: Optional[ProvisionalModel] = None
+    _loaded = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_model(cls) -> Optional[ProvisionalModel]:
+        """
+        Get the deployed model, loading it once; None when no artifact is deployed
+        """
+        if not cls._loaded:
+            with cls._lock:
+                if not cls._loaded:
+                    if os.path.exists(PROVISIONAL_MODEL_PATH):
+                        cls._model = ProvisionalModel.load(PROVISIONAL_MODEL_PATH)
+                        logging.info(f"Loaded provisional scorer {cls._model.version}")
+                    else:
+                        logging.info(f"No provisional scorer at {PROVISIONAL_MODEL_PATH}, provisional scores are off")
+                    cls._loaded = True
+        return cls._model
+
+    @classmethod
+    def score(cls, text: str, heuristic_fallback: bool = False) -> Optional[dict]:
+        """
+        Get the provisional score columns to write for a resume, if a model is deployed or the heuristic is allowed
+        """
+        if not text:
+            return None
+        model = cls.get_model()
+        if model is not None:
+            return {"provisional_score": model.predict(text)["score"], "provisional_model": model.version}
+        if heuristic_fallback:
+            return {"provisional_score": heuristic_score(text), "provisional_model": HEURISTIC_VERSION}
+        return None
+
+    @staticmethod
+    def train(
+        texts: list[str],
+        targets: np.ndarray,
+        epochs: int = 8,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        feature_bits: int = FEATURE_BITS,
+        seed: int = 0,
+    ) -> ProvisionalModel:
+        """
+        Fit the linear model with Adagrad on sparse hashed features
+        """
+        rng = np.random.default_rng(seed)
+        features = [featurize(text, feature_bits) for text in texts]
+        targets = np.asarray(targets, dtype=np.float32)
+
+        bias = targets.mean(axis=0)
+        weights = np.zeros((1 << feature_bits, targets.shape[1]), dtype=np.float32)
+        squared_gradients = np.full(1 << feature_bits, 1e-8, dtype=np.float32)
+
+        for _ in range(epochs):
+            for row in rng.permutation(len(features)):
+                indices, values = features[row]
+                error = values @ weights[indices] + bias - targets[row]
+                gradient = np.outer(values, error) + l2 * weights[indices]
+                squared_gradients[indices] += (gradient ** 2).mean(axis=1)
+                weights[indices] -= (learning_rate / np.sqrt(squared_gradients[indices]))[:, None] * gradient
+
+        version = f"bow-{time.strftime('%Y%m%d%H%M%S')}-{zlib.crc32(weights.tobytes()):08x}"
+        metadata = {
+            "version": version,
+            "feature_bits": feature_bits,
+            "targets": list(TARGET_COLUMNS),
+            "epochs": epochs,
+            "learning_rate": learning_rate,
+            "l2": l2,
+            "trained_on": len(texts),
+            "trained_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        return ProvisionalModel(weights, bias, metadata)
+
+    @staticmethod
+    def evaluate(model: ProvisionalModel, texts: list[str], targets: np.ndarray) -> dict:
+        """
+        Compare predictions with LLM scores: Pearson and Spearman correlation and MAE per column
+        """
+        targets = np.asarray(targets, dtype=np.float32)
+        predictions = np.array([model.predict_features(*featurize(text, model.feature_bits)) for text in texts])
+        predictions[:, 0] = np.clip(np.round(predictions[:, 0]), 0, 100)
+
+        def spearman(first: np.ndarray, second: np.ndarray) -> float:
+            return float(np.corrcoef(first.argsort().argsort(), second.argsort().argsort())[0, 1])
+
+        report = {"evaluated_on": len(texts)}
+        for index, column in enumerate(TARGET_COLUMNS):
+            predicted, actual = predictions[:, index], targets[:, index]
+            report[column] = {
+                "pearson": round(float(np.corrcoef(predicted, actual)[0, 1]), 4),
+                "spearman": round(spearman(predicted, actual), 4),
+                "mae": round(float(np.abs(predicted - actual).mean()), 3),
+                "baseline_mae": round(float(np.abs(actual.mean() - actual).mean()), 3),
+            }
+        return report
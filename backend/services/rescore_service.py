@@ -0,0 +1,77 @@
+"""
+Rescore Service - Re-scores existing jobs from their extracted text, without touching Drive.
+
+Key points:
+- Only resumes that already have a text_url blob are queued; the rest are reported as skipped
+- The Modal worker scores them in throttled batches and writes one resume_scores row
+  per (resume, score_version), so resumes.score is never overwritten
+- score_version is derived from the model, SYSTEM_PROMPT and tool schema, so a prompt
+  change automatically starts a new version
+- Progress is counted from resume_scores rows, so it survives backend restarts
+"""
+
+from typing import Optional
+
+from services.supabase_service import SupabaseService
+
+supabase_service = SupabaseService()
+
+
+class RescoreService:
+
+    @staticmethod
+    def collect(job_ids: list[int]) -> tuple[list[int], int]:
+        """
+        Get the ids of resumes that can be re-scored from cached text, and how many were skipped
+        """
+        resume_ids, skipped = [], 0
+        for job_id in job_ids:
+            for resume in supabase_service.iter_resumes_under_job(job_id, columns="id, text_url"):
+                if resume["text_url"]:
+                    resume_ids.append(resume["id"])
+                else:
+                    skipped += 1
+        return resume_ids, skipped
+
+    @staticmethod
+    def latest_version(job_ids: list[int]) -> Optional[str]:
+        """
+        Get the most recent score version written for any of the jobs
+        """
+        rows = (
+            supabase_service.get_supabase().table("resume_scores")
+            .select("score_version")
+            .in_("job_id", job_ids)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute().data
+        )
+        return rows[0]["score_version"] if rows else None
+
+    @staticmethod
+    def _count(table: str, job_ids: list[int], build) -> int:
+        query = supabase_service.get_supabase().table(table).select("id", count="exact").in_("job_id", job_ids)
+        return build(query).limit(1).execute().count or 0
+
+    @classmethod
+    def progress(cls, job_ids: list[int], score_version: Optional[str] = None) -> dict:
+        """
+        Get how far a re-score run has come for the given jobs
+        """
+        score_version = score_version or cls.latest_version(job_ids)
+        total = cls._count("resumes", job_ids, lambda query: query.not_.is_("text_url", "null"))
+        if score_version is None:
+            return {"score_version": None, "total": total, "scored": 0, "failed": 0, "pending": total, "done": False}
+
+        by_version = lambda query: query.eq("score_version", score_version)
+        scored = cls._count("resume_scores", job_ids, lambda query: by_version(query).not_.is_("score", "null"))
+        failed = cls._count("resume_scores", job_ids, lambda query: by_version(query).not_.is_("error", "null"))
+        pending = max(total - scored - failed, 0)
+        return {
+            "score_version": score_version,
+            "total": total,
+            "scored": scored,
+            "failed": failed,
+            "pending": pending,
+            "done": pending == 0,
+        }
@@ -0,0 +1,92 @@
+"""
+Resume Write Service - Write-behind buffer that coalesces per-resume updates into batched writes.
+
+Key points:
+- Callers hand over a partial row and await it; updates to the same resume made before
+  the next flush are merged into one
+- A batch is flushed when it reaches max_batch resumes or max_delay seconds after its
+  first update, in one bulk_update_resumes call (a single UPDATE ... FROM jsonb)
+- write() only returns once its batch is committed, so an Inngest step that writes
+  through the buffer is retried (from memoized step outputs) if the flush fails;
+  nothing acknowledged is ever held only in memory
+- Flushes are per process; each replica coalesces the resumes it is working on
+"""
+
+import asyncio
+from typing import Optional
+
+from services.metrics_service import WRITE_BATCH_SIZE, MetricsService
+from services.supabase_service import SupabaseService
+
+supabase_service = SupabaseService()
+
+
+class ResumeWriteBuffer:
+
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.25):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: dict = {}
+        self._futures: dict = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks, hold running flushes here
+        self._flushes: set = set()
+
+    async def write(self, resume_id: int, fields: dict) -> Optional[dict]:
+        """
+        Queue a partial update of a resume and wait until it is committed, returning the row
+        """
+        loop = asyncio.get_running_loop()
+        self._pending.setdefault(resume_id, {}).update(fields)
+        future = self._futures.get(resume_id)
+        if future is None:
+            future = self._futures[resume_id] = loop.create_future()
+
+        if len(self._pending) >= self.max_batch:
+            self._schedule(loop, 0)
+        elif self._timer is None:
+            self._schedule(loop, self.max_delay)
+        return await asyncio.shield(future)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        task = asyncio.ensure_future(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        """
+        Commit every pending update in one bulk write
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        pending, futures = self._pending, self._futures
+        self._pending, self._futures = {}, {}
+        updates = [{"id": resume_id, **fields} for resume_id, fields in pending.items()]
+        WRITE_BATCH_SIZE.labels("resumes").observe(len(updates))
+
+        try:
+            with MetricsService.external_call("supabase", "bulk_update_resumes"):
+                rows = await supabase_service.run(self._bulk_update, updates)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        rows_by_id = {row["id"]: row for row in rows}
+        for resume_id, future in futures.items():
+            if not future.done():
+                future.set_result(rows_by_id.get(resume_id))
+
+    @staticmethod
+    def _bulk_update(updates: list[dict]) -> list[dict]:
+        return supabase_service.get_supabase().rpc("bulk_update_resumes", {"updates": updates}).execute().data or []
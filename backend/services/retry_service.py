@@ -0,0 +1,145 @@
+"""
+Retry Service - Re-runs only the failed or stuck resumes of a job and reports what changed.
+
+Key points:
+- A resume is retried when it is failed, or still pending STUCK_AFTER after it was created
+  once its job has finished; while the job runs, pending resumes may just be queued
+- Nothing else in the job is touched; completed resumes keep their scores, and resumes
+  with extracted text skip Drive because the download worker reuses the text blob
+- Each retry is recorded in job_retries with a snapshot of the retried resumes, so the
+  diff against their current state can be reported at any time
+- Repeated retries of the same job back off exponentially before re-enqueuing
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from services.supabase_service import SupabaseService
+
+STUCK_AFTER = timedelta(minutes=30)
+RETRY_BACKOFF_BASE_SECONDS = 30
+RETRY_BACKOFF_MAX_SECONDS = 15 * 60
+
+# Columns snapshotted before a retry and compared after it
+RETRY_COLUMNS = "id, google_id, file_name, status, score, text_url, created_at"
+
+supabase_service = SupabaseService()
+
+
+class RetryService:
+
+    @staticmethod
+    def is_stuck(resume: dict, stuck_after: timedelta, now: datetime) -> bool:
+        created_at = resume.get("created_at")
+        if resume["status"] != "pending" or not created_at:
+            return False
+        created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return now - created_at >= stuck_after
+
+    @classmethod
+    def find_retryable(cls, job: dict, stuck_after: timedelta = STUCK_AFTER) -> list[dict]:
+        """
+        Get the failed resumes of a job, and the stuck pending ones if the job is no longer running
+        """
+        now = datetime.now(timezone.utc)
+        running = job["status"] == "pending"
+        return [
+            resume
+            for resume in supabase_service.iter_resumes_under_job(job["id"], columns=RETRY_COLUMNS)
+            if resume["status"] == "failed" or (not running and cls.is_stuck(resume, stuck_after, now))
+        ]
+
+    @staticmethod
+    def backoff_seconds(job_id: int) -> int:
+        """
+        Get how long to wait before re-enqueuing, doubling with every earlier retry of the job
+        """
+        previous = (
+            supabase_service.get_supabase().table("job_retries")
+            .select("id", count="exact")
+            .eq("job_id", job_id)
+            .limit(1)
+            .execute().count
+        ) or 0
+        if previous == 0:
+            return 0
+        return min(RETRY_BACKOFF_BASE_SECONDS * 2 ** (previous - 1), RETRY_BACKOFF_MAX_SECONDS)
+
+    @staticmethod
+    def create(job_id: int, resumes: list[dict], backoff_seconds: int) -> dict:
+        """
+        Record a retry with a snapshot of the resumes it covers
+        """
+        return supabase_service.get_supabase().table("job_retries").insert({
+            "job_id": job_id,
+            "resume_ids": [resume["id"] for resume in resumes],
+            "before": resumes,
+            "backoff_seconds": backoff_seconds,
+            "status": "pending",
+        }).execute().data[0]
+
+    @staticmethod
+    def get(job_id: int, retry_id: int) -> Optional[dict]:
+        """
+        Get a retry of a job
+        """
+        rows = (
+            supabase_service.get_supabase().table("job_retries")
+            .select("*")
+            .eq("id", retry_id)
+            .eq("job_id", job_id)
+            .execute().data
+        )
+        return rows[0] if rows else None
+
+    @staticmethod
+    def set_status(retry_id: int, status: str) -> None:
+        supabase_service.get_supabase().table("job_retries").update({"status": status}).eq("id", retry_id).execute()
+
+    @staticmethod
+    def diff(retry: dict) -> dict:
+        """
+        Compare the snapshot taken before a retry with the current state of its resumes
+        """
+        before = {resume["id"]: resume for resume in retry["before"]}
+        after = {
+            resume["id"]: resume
+            for resume in supabase_service.get_supabase().table("resumes")
+            .select(RETRY_COLUMNS)
+            .in_("id", retry["resume_ids"])
+            .execute().data
+        } if retry["resume_ids"] else {}
+
+        changes = []
+        summary = {"recovered": 0, "still_failed": 0, "skipped": 0, "in_progress": 0, "missing": 0}
+        for resume_id, old in before.items():
+            new = after.get(resume_id)
+            if new is None:
+                summary["missing"] += 1
+                continue
+            if new["status"] == "scored":
+                summary["recovered"] += 1
+            elif new["status"] == "failed":
+                summary["still_failed"] += 1
+            elif new["status"] == "skipped":
+                summary["skipped"] += 1
+            else:
+                summary["in_progress"] += 1
+            changed = {
+                column: {"before": old.get(column), "after": new.get(column)}
+                for column in ("status", "score", "text_url")
+                if old.get(column) != new.get(column)
+            }
+            if changed:
+                changes.append({"id": resume_id, "file_name": new.get("file_name"), "changes": changed})
+
+        return {
+            "retry_id": retry["id"],
+            "job_id": retry["job_id"],
+            "status": retry["status"],
+            "retried": len(before),
+            **summary,
+            "changes": changes,
+        }
@@ -0,0 +1,193 @@
+"""
+Score Stats Service - Score distributions and percentile ranks of a job, computed with NumPy.
+
+Key points:
+- A job's scores and contribution columns are loaded once into compact float32/int8
+  arrays sorted by resume id, and cached per job
+- Scores arriving through update-resume-status are written into the cached arrays
+  in place; CACHE_TTL_SECONDS bounds staleness from other replicas
+- Writes (on the event loop) and reads (in pool threads) share a per-job lock; reads
+  only hold it to copy the arrays, so a request never sees a half-applied update
+- Histograms, percentiles, per-school-year breakdowns and every resume's percentile rank
+  come from one pass over the arrays, so a job with tens of thousands of resumes is
+  answered without shipping its rows to the client
+"""
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from services.supabase_service import SupabaseService
+
+CACHE_TTL_SECONDS = 60
+MAX_CACHED_JOBS = 256
+PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+SCHOOL_YEARS = ("Freshman", "Sophomore", "Junior", "Senior")
+CONTRIBUTION_COLUMNS = ("gpa_contribution", "experience_contribution", "impact_quality_contribution")
+STATS_COLUMNS = ",".join(("id", "score", "school_year") + CONTRIBUTION_COLUMNS)
+
+supabase_service = SupabaseService()
+
+
+class JobScores:
+    """
+    Column arrays of one job's resumes, sorted by resume id; unscored resumes hold NaN
+    """
+
+    def __init__(self, rows: list[dict]):
+        rows = sorted(rows, key=lambda row: row["id"])
+        self.ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows))
+        self.score = self._column(rows, "score")
+        self.contributions = {column: self._column(rows, column) for column in CONTRIBUTION_COLUMNS}
+        # School year as a small code: index into SCHOOL_YEARS, or len(SCHOOL_YEARS) when unknown
+        codes = {year: code for code, year in enumerate(SCHOOL_YEARS)}
+        self.school_year = np.fromiter(
+            (codes.get(row.get("school_year"), len(SCHOOL_YEARS)) for row in rows),
+            dtype=np.int8,
+            count=len(rows),
+        )
+        self.loaded_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _column(rows: list[dict], column: str) -> np.ndarray:
+        return np.fromiter(
+            (np.nan if row.get(column) is None else row[column] for row in rows),
+            dtype=np.float32,
+            count=len(rows),
+        )
+
+    def update(self, resume: dict) -> bool:
+        """
+        Write one resume's new values into the arrays, if the resume is already in them
+        """
+        index = np.searchsorted(self.ids, resume["id"])
+        if index >= len(self.ids) or self.ids[index] != resume["id"]:
+            return False
+        with self._lock:
+            if "score" in resume:
+                self.score[index] = np.nan if resume["score"] is None else resume["score"]
+            for column, values in self.contributions.items():
+                if column in resume:
+                    values[index] = np.nan if resume[column] is None else resume[column]
+            if "school_year" in resume:
+                self.school_year[index] = SCHOOL_YEARS.index(resume["school_year"]) if resume["school_year"] in SCHOOL_YEARS else len(SCHOOL_YEARS)
+        return True
+
+    def snapshot(self) -> tuple[np.ndarray, dict, np.ndarray]:
+        """
+        Copy the score, contribution and school year arrays as of one consistent point
+        """
+        with self._lock:
+            return (
+                self.score.copy(),
+                {column: values.copy() for column, values in self.contributions.items()},
+                self.school_year.copy(),
+            )
+
+
+def _summary(values: np.ndarray) -> dict:
+    if values.size == 0:
+        return {"count": 0, "mean": None, "median": None, "min": None, "max": None}
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean()), 2),
+        "median": round(float(np.median(values)), 2),
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+class ScoreStatsService:
+
+    _cache: dict = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_scores(cls, job_id: int) -> JobScores:
+        """
+        Get the cached score arrays of a job, loading them when missing or stale
+        """
+        scores = cls._cache.get(job_id)
+        if scores is not None and time.monotonic() - scores.loaded_at < CACHE_TTL_SECONDS:
+            return scores
+
+        scores = JobScores(list(supabase_service.iter_resumes_under_job(job_id, columns=STATS_COLUMNS)))
+        with cls._lock:
+            cls._cache.pop(job_id, None)
+            cls._cache[job_id] = scores
+            while len(cls._cache) > MAX_CACHED_JOBS:
+                cls._cache.pop(next(iter(cls._cache)))
+        return scores
+
+    @classmethod
+    def update(cls, job_id: int, resume: dict) -> None:
+        """
+        Apply a freshly written resume to the cached arrays of its job
+        """
+        scores = cls._cache.get(job_id)
+        if scores is not None and not scores.update(resume):
+            # A resume we haven't seen yet, reload on next read
+            cls._cache.pop(job_id, None)
+
+    @classmethod
+    def distribution(cls, job_id: int, bins: int = 10, include_ranks: bool = False, resume_id: Optional[int] = None) -> dict:
+        """
+        Get the score histogram, percentiles, school year breakdown and percentile ranks of a job
+        """
+        scores = cls.get_scores(job_id)
+        score, contributions, school_year = scores.snapshot()
+        scored = ~np.isnan(score)
+        values = score[scored]
+
+        counts, edges = np.histogram(values, bins=bins, range=(0, 100))
+        result = {
+            "job_id": job_id,
+            "num_resumes": int(scores.ids.size),
+            "num_scored": int(values.size),
+            "summary": _summary(values),
+            "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+            "percentiles": dict(zip(
+                (f"p{p}" for p in PERCENTILES),
+                np.percentile(values, PERCENTILES).round(2).tolist() if values.size else [None] * len(PERCENTILES),
+            )),
+            "contributions": {
+                column: _summary(contribution[~np.isnan(contribution)])
+                for column, contribution in contributions.items()
+            },
+        }
+
+        # Per school year: counts and sums with bincount, medians per group
+        years = school_year[scored]
+        group_counts = np.bincount(years, minlength=len(SCHOOL_YEARS) + 1)
+        group_sums = np.bincount(years, weights=values, minlength=len(SCHOOL_YEARS) + 1)
+        result["school_years"] = {
+            name: {
+                "count": int(group_counts[code]),
+                "mean": round(float(group_sums[code] / group_counts[code]), 2) if group_counts[code] else None,
+                "median": float(np.median(values[years == code])) if group_counts[code] else None,
+            }
+            for code, name in enumerate(SCHOOL_YEARS + ("Unknown",))
+        }
+
+        if include_ranks or resume_id is not None:
+            # Percentile rank: share of scored resumes at or below each score
+            ranks = np.full(scores.ids.size, np.nan, dtype=np.float32)
+            if values.size:
+                ranks[scored] = np.searchsorted(np.sort(values), values, side="right") * (100.0 / values.size)
+            if include_ranks:
+                result["ranks"] = {
+                    "ids": scores.ids[scored].tolist(),
+                    "percentile_ranks": ranks[scored].round(2).tolist(),
+                }
+            if resume_id is not None:
+                index = np.searchsorted(scores.ids, resume_id)
+                found = index < scores.ids.size and scores.ids[index] == resume_id and scored[index]
+                result["resume"] = {
+                    "id": resume_id,
+                    "score": float(score[index]) if found else None,
+                    "percentile_rank": round(float(ranks[index]), 2) if found else None,
+                }
+        return result
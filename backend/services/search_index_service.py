@@ -0,0 +1,162 @@
+"""
+Search Index Service - Local full-text index over extracted resume text.
+
+Key points:
+- SQLite FTS5 with the porter stemmer; one row per resume keyed by the resume id,
+  so re-indexing a resume replaces its previous text
+- The owning user is stored as an indexed token, so a user's scope is just another
+  term in the MATCH expression and FTS intersects posting lists instead of scanning
+  every hit across all users
+- Results are ranked with bm25 and paginated with limit/offset
+- The index lives at SEARCH_INDEX_PATH, point it at a persistent volume in production
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Optional
+
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "search_index.db")
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_text USING fts5(
+    text,
+    owner,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS resume_docs (
+    resume_id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    file_name TEXT
+);
+"""
+
+MAX_QUERY_TERMS = 16
+
+
+class SearchIndexService:
+
+    _connection: Optional[sqlite3.Connection] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_connection(cls) -> sqlite3.Connection:
+        """
+        Get the shared SQLite connection, creating the index on first use
+        """
+        if cls._connection is None:
+            with cls._lock:
+                if cls._connection is None:
+                    connection = sqlite3.connect(SEARCH_INDEX_PATH, check_same_thread=False)
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    connection.execute("PRAGMA synchronous=NORMAL")
+                    connection.executescript(SCHEMA)
+                    cls._connection = connection
+        return cls._connection
+
+    @staticmethod
+    def owner_token(user_id) -> str:
+        return f"owner{user_id}"
+
+    @staticmethod
+    def build_match(query: str, user_id) -> Optional[str]:
+        """
+        Turn free text into an FTS5 expression: every word must match, scoped to the user
+        """
+        terms = re.findall(r"\w+", query.lower())[:MAX_QUERY_TERMS]
+        if not terms:
+            return None
+        text_terms = " AND ".join(f'"{term}"' for term in terms)
+        return f'owner : "{SearchIndexService.owner_token(user_id)}" AND text : ({text_terms})'
+
+    @classmethod
+    def index_resume(cls, resume_id: int, job_id: int, user_id, text: str, file_name: Optional[str] = None) -> None:
+        """
+        Add or replace a resume's text in the index
+        """
+        connection = cls.get_connection()
+        with cls._lock, connection:
+            connection.execute("DELETE FROM resume_text WHERE rowid = ?", (resume_id,))
+            connection.execute(
+                "INSERT INTO resume_text (rowid, text, owner) VALUES (?, ?, ?)",
+                (resume_id, text, cls.owner_token(user_id)),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO resume_docs (resume_id, job_id, user_id, file_name) VALUES (?, ?, ?, ?)",
+                (resume_id, job_id, str(user_id), file_name),
+            )
+
+    @classmethod
+    def remove_resume(cls, resume_id: int) -> None:
+        """
+        Remove a resume from the index
+        """
+        connection = cls.get_connection()
+        with cls._lock, connection:
+            connection.execute("DELETE FROM resume_text WHERE rowid = ?", (resume_id,))
+            connection.execute("DELETE FROM resume_docs WHERE resume_id = ?", (resume_id,))
+
+    @classmethod
+    def search(cls, user_id, query: str, page: int = 1, page_size: int = 20, job_id: Optional[int] = None) -> dict:
+        """
+        Search a user's resumes, best matches first
+        """
+        match = cls.build_match(query, user_id)
+        if match is None:
+            return {"results": [], "page": page, "page_size": page_size, "has_more": False}
+
+        sql = """
+            SELECT docs.resume_id, docs.job_id, docs.file_name,
+                   bm25(resume_text) AS rank,
+                   snippet(resume_text, 0, '<mark>', '</mark>', '...', 16) AS snippet
+            FROM resume_text
+            JOIN resume_docs AS docs ON docs.resume_id = resume_text.rowid
+            WHERE resume_text MATCH ?
+        """
+        params = [match]
+        if job_id is not None:
+            sql += " AND docs.job_id = ?"
+            params.append(job_id)
+        # Fetch one extra row to know whether there is another page
+        sql += " ORDER BY rank LIMIT ? OFFSET ?"
+        params += [page_size + 1, (page - 1) * page_size]
+
+        connection = cls.get_connection()
+        with cls._lock:
+            rows = connection.execute(sql, params).fetchall()
+
+        results = [
+            {
+                "resume_id": resume_id,
+                "job_id": result_job_id,
+                "file_name": file_name,
+                "rank": -rank,
+                "snippet": snippet,
+            }
+            for resume_id, result_job_id, file_name, rank, snippet in rows[:page_size]
+        ]
+        return {
+            "results": results,
+            "page": page,
+            "page_size": page_size,
+            "has_more": len(rows) > page_size,
+        }
+
+    @classmethod
+    def get_texts(cls, resume_ids: list[int]) -> dict[int, str]:
+        """
+        Get the indexed text of resumes by id; resumes that aren't indexed are left out
+        """
+        connection = cls.get_connection()
+        texts = {}
+        for start in range(0, len(resume_ids), 500):
+            chunk = resume_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with cls._lock:
+                rows = connection.execute(
+                    f"SELECT rowid, text FROM resume_text WHERE rowid IN ({placeholders})", chunk
+                ).fetchall()
+            texts.update(rows)
+        return texts
@@ -1,20 +1,70 @@
-from supabase import create_client, Client
+import asyncio
+import contextvars
+import functools
 import os
-from dotenv import load_dotenv
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 
-load_dotenv()
+# The supabase client is synchronous; async code runs its calls on this many threads
+SUPABASE_MAX_WORKERS = int(os.getenv("SUPABASE_MAX_WORKERS", "32"))
 
 class SupabaseService:
 
-    def __init__(self):
-        self.supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
+    # One client per process, shared by every SupabaseService instance.
+    # It is created by connect() in the app lifespan, or on first use otherwise.
+    _client = None
+    _lock = threading.Lock()
+
+    # A dedicated pool, so slow queries can't starve the default executor
+    # (Drive calls, Modal requests) and vice versa
+    _executor = ThreadPoolExecutor(max_workers=SUPABASE_MAX_WORKERS, thread_name_prefix="supabase")
+
+    @classmethod
+    def connect(cls):
+        """
+        Create the shared supabase client if it does not exist yet
+        """
+        if cls._client is None:
+            with cls._lock:
+                if cls._client is None:
+                    from supabase import create_client
+                    from services.profiling_service import ProfilingService
+                    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
+                    # Profiled requests see the time spent in every PostgREST call
+                    ProfilingService.instrument_httpx(client.postgrest.session, "supabase")
+                    cls._client = client
+        return cls._client
+
+    @property
+    def supabase(self):
+        return self._client or self.connect()
 
     def get_supabase(self):
         """
         Get the supabase client
         """
         return self.supabase
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking call on the Supabase thread pool without blocking the event loop
+        """
+        # Carry context variables over, so profiling and tracing see the call
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def execute(self, query):
+        """
+        Execute a built query on the Supabase thread pool and return its rows
+        """
+        return (await self.run(query.execute)).data
+
+    async def list_resumes_under_job(self, job_id: int, filters: Optional[Dict[str, bool]] = None, columns: str = "*") -> list:
+        """
+        Get every resume of a job, paging through them on the Supabase thread pool
+        """
+        return await self.run(lambda: list(self.iter_resumes_under_job(job_id, filters, columns)))
     
     def get_user(self, user_id: int):
         """
@@ -51,14 +101,14 @@ class SupabaseService:
     def is_year(self, key):
         return key in ["Freshman", "Sophomore", "Junior", "Senior"]
 
-    def build_filter_query(self, job_id: int, filters: Optional[Dict[str, bool]] = None):
+    def build_filter_query(self, job_id: int, filters: Optional[Dict[str, bool]] = None, columns: str = "*"):
         """
         Build a filter query to fetch all resumes under a job
         """
 
-        query = self.supabase.table("resumes").select("*").eq("job_id", job_id) # Base query
+        query = self.supabase.table("resumes").select(columns).eq("job_id", job_id) # Base query
         # If no filters, return base query
-        if not any(filters.values()):
+        if not filters or not any(filters.values()):
             return query
         
         # Filter by passed
@@ -124,6 +174,21 @@ class SupabaseService:
             "job_date": job.get("created_at"),
         }
 
+    def iter_resumes_under_job(self, job_id: int, filters: Optional[Dict[str, bool]] = None, columns: str = "*", page_size: int = 1000):
+        """
+        Iterate over the resumes of a job page by page using keyset pagination on id
+        """
+        last_id = None
+        while True:
+            query = self.build_filter_query(job_id, filters, columns)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(page_size).execute().data
+            yield from page
+            if len(page) < page_size:
+                return
+            last_id = page[-1]["id"]
+
     def get_resumes_under_user(self, user_id: int):
         """
         Get all resumes that belong to jobs owned by a user
@@ -0,0 +1,126 @@
+"""
+Token Broker Service - Hands out short-lived Google access tokens so refresh tokens stay in the backend.
+
+Key points:
+- Access tokens are cached per user until EXPIRY_MARGIN before they expire; expired
+  entries are dropped, so the cache holds only recently active users
+- Refreshes are single-flight per user: concurrent callers wait for one refresh
+  instead of each hitting Google's token endpoint; a user's lock is dropped once
+  no caller holds it
+- Refreshed tokens are written back to OauthCredentials, so other replicas pick
+  them up from the database instead of refreshing again
+- Workers only ever receive the access token; the refresh token never leaves
+  the backend or enters Inngest event payloads
+"""
+
+import asyncio
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from google.oauth2.credentials import Credentials
+
+from services.oauth_credentials_service import OAuthCredentialsService
+from services.profiling_service import ProfilingService
+
+EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+def parse_expiry(value) -> Optional[datetime]:
+    """
+    Parse a stored expiry into the naive UTC datetime google-auth uses
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TokenBrokerService:
+
+    _tokens: dict = {}
+    _locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def _is_fresh(expiry: Optional[datetime]) -> bool:
+        return expiry is not None and expiry - EXPIRY_MARGIN > datetime.utcnow()
+
+    @classmethod
+    def _cached(cls, user_id) -> Optional[dict]:
+        token = cls._tokens.get(str(user_id))
+        if token and cls._is_fresh(token["expiry"]):
+            return token
+        cls._tokens.pop(str(user_id), None)
+        return None
+
+    @classmethod
+    async def get_access_token(cls, user_id) -> dict:
+        """
+        Get a valid access token for a user, refreshing it at most once at a time
+        """
+        token = cls._cached(user_id)
+        if token:
+            return token
+
+        lock = cls._locks.get(str(user_id))
+        if lock is None:
+            lock = cls._locks[str(user_id)] = asyncio.Lock()
+        async with lock:
+            # Another caller may have refreshed while we waited
+            token = cls._cached(user_id)
+            if token:
+                return token
+
+            credentials_dict = await OAuthCredentialsService.get_credentials_dict(user_id)
+            expiry = parse_expiry(credentials_dict.get("expiry"))
+
+            # Another replica may already have stored a fresh token
+            if not cls._is_fresh(expiry):
+                credentials = OAuthCredentialsService.from_authorized_user_info(credentials_dict)
+                await asyncio.to_thread(cls._refresh, credentials)
+                expiry = credentials.expiry
+                await OAuthCredentialsService.update_access_token(user_id, credentials.token, expiry)
+                credentials_dict["access_token"] = credentials.token
+
+            token = {"access_token": credentials_dict["access_token"], "expiry": expiry}
+            # Drop other users' expired tokens so the cache only holds users seen within a token lifetime
+            for stale in [key for key, cached in cls._tokens.items() if not cls._is_fresh(cached["expiry"])]:
+                cls._tokens.pop(stale, None)
+            cls._tokens[str(user_id)] = token
+            return token
+
+    @staticmethod
+    def _refresh(credentials: Credentials) -> None:
+        from google.auth.transport.requests import Request
+        with ProfilingService.track("google"):
+            credentials.refresh(Request())
+
+    @classmethod
+    async def get_credentials(cls, user_id) -> Credentials:
+        """
+        Get non-refreshable credentials for a user, backed by a brokered access token
+        """
+        token = await cls.get_access_token(user_id)
+        return Credentials(token=token["access_token"], expiry=token["expiry"])
+
+    @classmethod
+    async def get_worker_token(cls, user_id) -> dict:
+        """
+        Get the token payload handed to workers: the access token and nothing that can mint more
+        """
+        token = await cls.get_access_token(user_id)
+        return {
+            "user_id": user_id,
+            "access_token": token["access_token"],
+            "expiry": token["expiry"].isoformat() if token["expiry"] else None,
+        }
+
+    @classmethod
+    def invalidate(cls, user_id) -> None:
+        """
+        Forget a user's cached token, e.g. after a worker saw it rejected
+        """
+        cls._tokens.pop(str(user_id), None)
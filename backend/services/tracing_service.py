@@ -0,0 +1,76 @@
+"""
+Tracing Service - OpenTelemetry spans that follow a job from /start-job to the Modal worker.
+
+Key points:
+- Spans are only exported when OTEL_EXPORTER_OTLP_ENDPOINT is set (e.g. a local
+  collector on http://localhost:4318); otherwise tracing is a no-op
+- The trace context travels as a W3C `traceparent` carrier inside Inngest event data
+  and as HTTP headers on the calls to Modal, so every step of a job shares one trace
+- This module only depends on opentelemetry so the Modal worker can ship the same
+  file (see modal/main.py)
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.trace import Status, StatusCode
+
+
+class TracingService:
+
+    _configured = False
+
+    @staticmethod
+    def configure(service_name: str) -> None:
+        """
+        Install an exporting tracer provider if a collector endpoint is configured
+        """
+        if TracingService._configured:
+            return
+        TracingService._configured = True
+
+        if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            return
+
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        trace.set_tracer_provider(provider)
+
+    @staticmethod
+    def inject() -> dict:
+        """
+        Serialize the current trace context into a carrier dict
+        """
+        carrier = {}
+        propagate.inject(carrier)
+        return carrier
+
+    @staticmethod
+    @contextmanager
+    def span(name: str, carrier: Optional[dict] = None, **attributes):
+        """
+        Open a span, continuing the trace from a carrier when one is given
+        """
+        token = None
+        if carrier:
+            token = otel_context.attach(propagate.extract(carrier))
+        try:
+            tracer = trace.get_tracer("prorank")
+            attributes = {key: value for key, value in attributes.items() if value is not None}
+            with tracer.start_as_current_span(name, attributes=attributes, record_exception=True) as span:
+                try:
+                    yield span
+                except Exception as e:
+                    span.set_status(Status(StatusCode.ERROR, str(e)))
+                    raise
+        finally:
+            if token is not None:
+                otel_context.detach(token)
@@ -0,0 +1,92 @@
+"""
+Usage Service - Rolls up per-resume LLM usage into per-job totals.
+
+Key points:
+- The Modal worker stores token counts, latency, retries and the model name on
+  every scored resume (llm_* columns)
+- Cost is an estimate from MODEL_PRICING (USD per million tokens); unknown models
+  fall back to DEFAULT_PRICING
+"""
+
+from typing import Iterable
+
+USAGE_COLUMNS = "id,status,llm_model,llm_prompt_tokens,llm_completion_tokens,llm_total_tokens,llm_latency_ms,llm_retries"
+
+MODEL_PRICING = {
+    "gemini-2.0-flash": {"input": 0.10, "output": 0.40},
+    "gemini-2.0-flash-exp": {"input": 0.10, "output": 0.40},
+    "gemini-2.0-flash-lite": {"input": 0.075, "output": 0.30},
+    "gemini-2.5-flash": {"input": 0.30, "output": 2.50},
+}
+DEFAULT_PRICING = MODEL_PRICING["gemini-2.0-flash"]
+
+
+def percentile(sorted_values: list, fraction: float):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class UsageService:
+
+    @staticmethod
+    def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """
+        Estimate the USD cost of one call
+        """
+        pricing = MODEL_PRICING.get(model, DEFAULT_PRICING)
+        return (prompt_tokens * pricing["input"] + completion_tokens * pricing["output"]) / 1_000_000
+
+    @staticmethod
+    def summarize(resumes: Iterable[dict]) -> dict:
+        """
+        Summarize token usage, cost and latency over a job's resumes
+        """
+        prompt_tokens = 0
+        completion_tokens = 0
+        total_tokens = 0
+        retries = 0
+        cost = 0.0
+        latencies = []
+        models = {}
+        num_resumes = 0
+
+        for resume in resumes:
+            num_resumes += 1
+            if resume.get("llm_total_tokens") is None and resume.get("llm_latency_ms") is None:
+                continue
+
+            resume_prompt_tokens = resume.get("llm_prompt_tokens") or 0
+            resume_completion_tokens = resume.get("llm_completion_tokens") or 0
+            prompt_tokens += resume_prompt_tokens
+            completion_tokens += resume_completion_tokens
+            total_tokens += resume.get("llm_total_tokens") or (resume_prompt_tokens + resume_completion_tokens)
+            retries += resume.get("llm_retries") or 0
+            cost += UsageService.estimate_cost(resume.get("llm_model"), resume_prompt_tokens, resume_completion_tokens)
+            if resume.get("llm_latency_ms") is not None:
+                latencies.append(resume["llm_latency_ms"])
+            model = resume.get("llm_model") or "unknown"
+            models[model] = models.get(model, 0) + 1
+
+        latencies.sort()
+        num_scored = sum(models.values())
+        return {
+            "num_resumes": num_resumes,
+            "num_scored": num_scored,
+            "models": models,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "avg_tokens_per_resume": round(total_tokens / num_scored) if num_scored else 0,
+            "retries": retries,
+            "estimated_cost_usd": round(cost, 6),
+            "latency_ms": {
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "max": latencies[-1] if latencies else None,
+            },
+        }
@@ -0,0 +1,48 @@
+"""
+A slow Supabase query must not hold up other requests on the same replica.
+
+Short version of benchmarks/bench_slow_query.py: /me p99 next to slowed
+get-resume requests has to stay within half a slow query of its idle p99.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.bench_slow_query import RESUME, USER, configure, measure, p99
+from benchmarks.postgrest_standin import PostgrestStandIn
+
+SLOW_SECONDS = 0.5
+CLIENTS = 10
+SLOW_CLIENTS = 4
+SECONDS = 2
+
+
+@pytest.fixture(scope="module")
+def standin():
+    with PostgrestStandIn({"User": [USER], "resumes": [RESUME]}, delays={"resumes": SLOW_SECONDS}) as standin:
+        configure(standin.url)
+        yield standin
+
+
+def within_bound(timings: dict) -> bool:
+    return p99(timings["with slow queries"]) < p99(timings["idle"]) + SLOW_SECONDS * 1000 / 2
+
+
+def test_slow_query_does_not_block_other_requests(standin):
+    timings = asyncio.run(measure(CLIENTS, SLOW_CLIENTS, SECONDS))
+    assert timings["slowed"], "no slowed request completed"
+    assert within_bound(timings), (
+        f"/me p99 went from {p99(timings['idle']):.1f} ms idle "
+        f"to {p99(timings['with slow queries']):.1f} ms next to slow queries"
+    )
+
+
+def test_bound_catches_queries_on_the_event_loop(standin, monkeypatch):
+    from services.supabase_service import SupabaseService
+
+    async def run_inline(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+    monkeypatch.setattr(SupabaseService, "run", run_inline)
+
+    assert not within_bound(asyncio.run(measure(CLIENTS, SLOW_CLIENTS, SECONDS)))
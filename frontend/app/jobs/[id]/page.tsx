@@ -34,15 +34,19 @@ import {
 import { useAuthStore } from "@/app/store/useAuthStore";
 import { useFilterStore } from "@/app/store/useFilterStore";
 import { FilterDropdown } from "@/components/filter-dropdown";
+import { fromColumns } from "@/lib/utils";
 
 interface Resume {
   id: number;
   created_at: string;
   job_id: number;
   score: number | null;
+  provisional_score: number | null;
+  provisional_model: string | null;
   gpa: number | null;
   num_internships: number | null;
-  status: "scored" | "pending" | "failed";
+  status: "scored" | "pending" | "failed" | "cancelled" | "skipped";
+  skip_reason: string | null;
   preview_url: string | null;
   candidate_name: string | null;
   google_id: string;
@@ -106,7 +110,7 @@ export default function JobDetailPage() {
   const fetchResumes = async (filters: Filter | null = null) => {
     try {
 
-      let queryString = `${process.env.NEXT_PUBLIC_BACKEND_URL}/api/query/get-resumes?job_id=${params.id}`;
+      let queryString = `${process.env.NEXT_PUBLIC_BACKEND_URL}/api/query/get-resumes?job_id=${params.id}&format=columnar`;
       
       if (filters) {
         setIsFiltering(true);
@@ -125,7 +129,7 @@ export default function JobDetailPage() {
         return;
       }
       const data = await response.json();
-      setResumes(data.resumes);
+      setResumes(fromColumns<Resume>(data.resumes));
       setStats(data.stats);
       setJobName(data.job_name);
       setJobDate(
@@ -189,10 +193,22 @@ export default function JobDetailPage() {
     );
   };
 
-  const getStatusBadge = (status: "scored" | "pending" | "failed") => {
+  const getStatusBadge = (status: Resume["status"], skipReason?: string | null) => {
     if (status === "scored") return <Badge variant="default">Scored</Badge>;
     if (status === "pending") return <Badge variant="outline">Pending</Badge>;
     if (status === "failed") return <Badge variant="destructive">Failed</Badge>;
+    if (status === "cancelled") return <Badge variant="secondary">Cancelled</Badge>;
+    if (status === "skipped")
+      return (
+        <div className="flex flex-col items-start gap-1">
+          <Badge variant="secondary" title={skipReason ?? undefined}>
+            Skipped
+          </Badge>
+          {skipReason && (
+            <span className="text-xs text-muted-foreground">{skipReason}</span>
+          )}
+        </div>
+      );
   };
 
   return (
@@ -375,10 +391,22 @@ export default function JobDetailPage() {
                           </TableCell>
                           <TableCell>
                             <div className="flex items-center gap-2">
-                              <span className="text-lg font-semibold">
-                                {resume.score}
-                              </span>
-                              {getScoreIndicator(resume.score ?? 0)}
+                              {resume.score === null &&
+                              resume.provisional_score !== null ? (
+                                <span
+                                  className="text-lg font-semibold text-muted-foreground"
+                                  title={`Provisional score (${resume.provisional_model}), replaced once scoring finishes`}
+                                >
+                                  ~{resume.provisional_score}
+                                </span>
+                              ) : (
+                                <span className="text-lg font-semibold">
+                                  {resume.score}
+                                </span>
+                              )}
+                              {getScoreIndicator(
+                                resume.score ?? resume.provisional_score ?? 0
+                              )}
                             </div>
                           </TableCell>
                           <TableCell>
@@ -390,7 +418,9 @@ export default function JobDetailPage() {
                           <TableCell>
                             {resume.school_year ?? "Unknown"}
                           </TableCell>
-                          <TableCell>{getStatusBadge(resume.status)}</TableCell>
+                          <TableCell>
+                            {getStatusBadge(resume.status, resume.skip_reason)}
+                          </TableCell>
                         </TableRow>
                       ))
                     ) : (
@@ -35,7 +35,8 @@ interface Resume {
   score: number | null;
   gpa: number | null;
   num_internships: number | null;
-  status: "scored" | "pending" | "failed";
+  status: "scored" | "pending" | "failed" | "cancelled" | "skipped";
+  skip_reason: string | null;
   candidate_name: string | null;
   file_name: string;
   google_id: string;
@@ -210,7 +211,9 @@ export default function ResumeDetailPage() {
                     <div className="flex-1">
                       <Progress value={resume?.score} className="h-3" />
                       <p className="mt-2 text-sm text-muted-foreground">
-                        {getSuggestions(resume?.score ?? 0)}
+                        {resume?.status === "skipped"
+                          ? `Not scored: ${resume.skip_reason ?? "skipped"}`
+                          : getSuggestions(resume?.score ?? 0)}
                       </p>
                     </div>
                   </div>
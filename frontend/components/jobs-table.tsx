@@ -22,7 +22,7 @@ interface Job {
   name: string;
   folder_name: string;
   resume_count: number;
-  status: "queued" | "processing" | "completed" | "failed";
+  status: "queued" | "processing" | "completed" | "failed" | "cancelled";
   created_at: string;
 }
 
@@ -72,6 +72,7 @@ export function JobsTable() {
       pending: "default",
       completed: "outline",
       failed: "destructive",
+      cancelled: "secondary",
     } as const;
 
     return (
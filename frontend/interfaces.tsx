@@ -5,7 +5,8 @@ interface Resume {
     score: number | null;
     gpa: number | null;
     num_internships: number | null;
-    status: "scored" | "pending" | "failed";
+    status: "scored" | "pending" | "failed" | "cancelled" | "skipped";
+    skip_reason: string | null;
     preview_url: string | null;
     candidate_name: string | null;
     google_id: string;
@@ -4,3 +4,22 @@ import { twMerge } from "tailwind-merge";
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
 }
+
+export interface Columnar {
+  columns: string[];
+  values: unknown[][];
+}
+
+// Zip a columnar response (format=columnar) back into row objects
+export function fromColumns<T>({ columns, values }: Columnar): T[] {
+  const length = values[0]?.length ?? 0;
+  const rows = new Array<T>(length);
+  for (let i = 0; i < length; i++) {
+    const row: Record<string, unknown> = {};
+    columns.forEach((column, c) => {
+      row[column] = values[c][i];
+    });
+    rows[i] = row as T;
+  }
+  return rows;
+}
@@ -1,21 +1,33 @@
 """
 Microservice that downloads resumes from Google Drive and scores them using the ProRank API
+
+Cold starts: both endpoints run in classes with memory snapshots enabled. Heavy modules
+are imported and discovery documents parsed before the snapshot is taken, and network
+clients (Supabase, GCS) are built once per container right after restore. Warm pool
+sizes are read at deploy time from DOWNLOAD_MIN_CONTAINERS / SCORE_MIN_CONTAINERS.
 """
 
 import modal
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 import os
-from fastapi import HTTPException
-import io
+from fastapi import HTTPException, Request
+import time
 import fitz
 from google.cloud import storage
 import json
+import hashlib
+import resource
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client, Client
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload
 from prompts import score_resume_tool, SYSTEM_PROMPT
 
 APP_NAME = "ProRank"
+MODEL_NAME = "gemini-2.0-flash-exp"
 app = modal.App(APP_NAME) # Initialize modal app
 
 # Define the docker image
@@ -23,90 +35,287 @@ image = (
     modal.Image.debian_slim()                                  # Start with a Linux image
     .pip_install_from_requirements("requirements.txt")         # Install local python dependencies
     .add_local_python_source("prompts")                        # Inject local python source into the docker image
+    .add_local_file(                                           # Share the backend's Google client factory
+        "../backend/services/google_client_service.py",
+        "/root/google_client_service.py",
+    )
+    .add_local_file(                                           # Share the backend's tracing helpers
+        "../backend/services/tracing_service.py",
+        "/root/tracing_service.py",
+    )
 )
 
+with image.imports():
+    from google_client_service import GoogleClientService
+    from tracing_service import TracingService
+
+# Warm pool sizing per endpoint, read when the app is deployed
+DOWNLOAD_MIN_CONTAINERS = int(os.getenv("DOWNLOAD_MIN_CONTAINERS", "0"))
+SCORE_MIN_CONTAINERS = int(os.getenv("SCORE_MIN_CONTAINERS", "0"))
+SCALEDOWN_WINDOW = int(os.getenv("WORKER_SCALEDOWN_WINDOW", "120"))
+
+# Guards against huge scanned "resumes": files over either cap are skipped before extraction
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(20 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "20"))
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Offline re-scoring: containers, Gemini calls per container and resumes per batch
+RESCORE_MAX_CONTAINERS = int(os.getenv("RESCORE_MAX_CONTAINERS", "4"))
+RESCORE_CONCURRENCY = int(os.getenv("RESCORE_CONCURRENCY", "4"))
+RESCORE_BATCH_SIZE = int(os.getenv("RESCORE_BATCH_SIZE", "100"))
+RESCORE_MAX_ATTEMPTS = 5
+
+# Identifies the prompt, tool schema and model a score was produced with
+SCORE_VERSION = os.getenv("SCORE_VERSION") or hashlib.sha256(
+    f"{MODEL_NAME}\n{SYSTEM_PROMPT}\n{json.dumps(score_resume_tool, sort_keys=True)}".encode()
+).hexdigest()[:12]
+
+# Set when a container (or snapshot restore) is ready to serve
+CONTAINER_READY_AT = None
+requests_served = 0
+
+# Clients shared by every request a container serves
+clients = {}
+
+
+def container_attributes() -> dict:
+    """Span attributes that tell cold starts apart from warm requests."""
+    global requests_served
+    requests_served += 1
+    return {
+        "cold_start": requests_served == 1,
+        "container_age_seconds": round(time.time() - (CONTAINER_READY_AT or time.time()), 3),
+    }
+
+
+def prewarm() -> None:
+    """Work done once at snapshot time: imports and discovery documents."""
+    GoogleClientService.preload()
+    fitz.open().close()  # PyMuPDF loads parts of itself on first document
+    genai.types.GenerationConfig(temperature=0)
+
+
+def connect_clients() -> None:
+    """Build the network clients once per container, after the snapshot is restored."""
+    global CONTAINER_READY_AT
+    # The span exporter starts a thread and a connection, neither survives a snapshot
+    TracingService.configure("prorank-worker")
+    get_supabase()
+    get_bucket()
+    CONTAINER_READY_AT = time.time()
+
+
+def get_supabase():
+    if "supabase" not in clients:
+        clients["supabase"] = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    return clients["supabase"]
+
+
+def get_storage_client():
+    if "storage" not in clients:
+        creds = json.loads(os.environ["GOOGLE_APPLICATION_CREDENTIALS_JSON"])
+        clients["storage"] = storage.Client.from_service_account_info(creds)
+    return clients["storage"]
+
+
+def get_bucket():
+    if "bucket" not in clients:
+        clients["bucket"] = get_storage_client().bucket(os.environ["GCS_BUCKET_NAME"])
+    return clients["bucket"]
+
+
+def get_model():
+    if "model" not in clients:
+        genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+        clients["model"] = genai.GenerativeModel(
+            model_name=MODEL_NAME,
+            tools=[score_resume_tool]
+        )
+    return clients["model"]
+
+
+def warmup_response(attributes: dict) -> dict:
+    """Answer for warmup pings, used by the cold start benchmark."""
+    return {"success": True, "message": "Warm", **attributes}
+
 gcp_secrets = modal.Secret.from_name("prorank-secrets")
 gcs_secrets = modal.Secret.from_name("gcp-sa-key")
 
-@app.function(image=image, secrets=[gcp_secrets, gcs_secrets])
-@modal.fastapi_endpoint(
-    method="POST",
-    docs=True
+@app.cls(
+    image=image,
+    secrets=[gcp_secrets, gcs_secrets],
+    enable_memory_snapshot=True,
+    min_containers=DOWNLOAD_MIN_CONTAINERS,
+    scaledown_window=SCALEDOWN_WINDOW,
 )
-async def download_resume(data: dict):
+class ResumeDownloader:
+
+    @modal.enter(snap=True)
+    def load(self):
+        prewarm()
+
+    @modal.enter(snap=False)
+    def connect(self):
+        connect_clients()
+
+    @modal.fastapi_endpoint(
+        method="POST",
+        docs=True,
+        label="prorank-download-resume"
+    )
+    async def download_resume(self, data: dict, request: Request):
+        attributes = container_attributes()
+        if data.get("warmup"):
+            return warmup_response(attributes)
+        with TracingService.span(
+            "worker.download_resume",
+            dict(request.headers),
+            resume_job_id=data.get("resume_job_id"),
+            **attributes,
+        ) as span:
+            result = await extract_resume_text(data)
+            span.set_attribute("peak_rss_bytes", peak_rss_bytes())
+            return result
+
+
+async def extract_resume_text(data: dict):
     resume_job_id = data.get("resume_job_id")
 
     # Get the resume from the database
-    supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
-    resume = supabase.table("resumes").select("*").eq("id", resume_job_id).execute().data[0]
+    supabase = get_supabase()
+    with TracingService.span("supabase.select_resume"):
+        resume = supabase.table("resumes").select("*").eq("id", resume_job_id).execute().data[0]
 
     # Check if the text already exists in the database
     if resume["text_url"]:
-        return {"success": True, "message": "Text already extracted"}
+        result = {"success": True, "message": "Text already extracted", "text_url": resume["text_url"]}
+        if data.get("include_text"):
+            attach_text(result, resume, download_resume_text(resume["text_url"]))
+        return result
 
-    # Build the storage client and bucket
-    creds = json.loads(os.environ["GOOGLE_APPLICATION_CREDENTIALS_JSON"])
-    storage_client = storage.Client.from_service_account_info(creds)
-    bucket = storage_client.bucket(os.environ["GCS_BUCKET_NAME"])
+    # Get the storage client and bucket
+    storage_client = get_storage_client()
+    bucket = get_bucket()
 
     # Check if the text already exists in GCS
     blob = bucket.blob(f"extracted_text/{resume['google_id']}.txt")
-    if blob.exists():
-        # Update the resume in the database with a link to the text
-        supabase.table("resumes").update({
-            "text_url": f"https://storage.googleapis.com/prorank-extracted-text/extracted_text/{resume['google_id']}.txt"
-        }).eq("id", resume_job_id).execute()
-        return {"success": True, "message": "Text already in blob storage"}
+    with TracingService.span("gcs.exists"):
+        blob_exists = blob.exists()
+    if blob_exists:
+        # Link the resume to the text
+        result = {"success": True, "message": "Text already in blob storage"}
+        save_text_url(data, result, f"https://storage.googleapis.com/prorank-extracted-text/extracted_text/{resume['google_id']}.txt")
+        if data.get("include_text"):
+            attach_text(result, resume, blob.download_as_text(encoding="utf-8"))
+        return result
 
 
     
-    # Build the credentials object to call the Google Drive API
-    credentials = Credentials(    
-        token=data["credentials_dict"]["access_token"],
-        refresh_token=data["credentials_dict"]["refresh_token"],
-        token_uri=data["credentials_dict"]["token_uri"],
-        client_id=os.environ["GOOGLE_CLIENT_ID"],
-        client_secret=os.environ["GOOGLE_CLIENT_SECRET"],
-        scopes=[
-            "openid", 
-            "https://www.googleapis.com/auth/userinfo.email", 
-            "https://www.googleapis.com/auth/userinfo.profile",
-            "https://www.googleapis.com/auth/drive.readonly"
-            ]
-    )
+    # The backend only sends a short-lived access token; the refresh token never leaves it
+    token = data.get("token")
+    if token is None:
+        # Requests queued before the token broker still carry the credentials row
+        token = {"user_id": data["credentials_dict"].get("user_id"), "access_token": data["credentials_dict"]["access_token"]}
+    credentials = Credentials(token=token["access_token"])
 
-    drive_service = build("drive", "v3", credentials=credentials)
     file_id = resume["google_id"]
-    
-    # Download the file content
-    request = drive_service.files().get_media(fileId=file_id)
-    file_content = io.BytesIO(request.execute())
-    
-    # Extract text from PDF using PyMuPDF
-    pdf_document = fitz.open(stream=file_content, filetype="pdf")
-    text_content = ""
-    for page_num in range(len(pdf_document)):
-        print(f"Extracting text from page {page_num}")
-        page = pdf_document[page_num]
-        text_content += page.get_text()
-    pdf_document.close()
 
+    # Stream the file to disk in chunks so only one chunk is ever held in memory
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+        try:
+            with TracingService.span("drive.get_media") as span, GoogleClientService.drive(credentials, token.get("user_id")) as drive_service:
+                size = int(drive_service.files().get(fileId=file_id, fields="size").execute().get("size") or 0)
+                span.set_attribute("declared_bytes", size)
+                if size > MAX_PDF_BYTES:
+                    return skip_resume(data, resume, f"File is {size} bytes, over the {MAX_PDF_BYTES} byte limit")
+                downloaded = stream_to_file(drive_service.files().get_media(fileId=file_id), pdf_file)
+                span.set_attribute("bytes", downloaded)
+        except HttpError as e:
+            if e.resp.status == 401:
+                # Tell the backend to drop its cached token and retry with a new one
+                raise HTTPException(status_code=401, detail="Drive access token rejected")
+            raise
+        if downloaded > MAX_PDF_BYTES:
+            return skip_resume(data, resume, f"File is over the {MAX_PDF_BYTES} byte limit")
+
+        # Extract text from PDF using PyMuPDF, which reads pages from the file on demand
+        with TracingService.span("pdf.extract") as span:
+            pdf_document = fitz.open(pdf_file.name, filetype="pdf")
+            try:
+                pages = pdf_document.page_count
+                span.set_attribute("pages", pages)
+                if pages > MAX_PDF_PAGES:
+                    return skip_resume(data, resume, f"PDF has {pages} pages, over the {MAX_PDF_PAGES} page limit")
+                text_content = "".join(page.get_text() for page in pdf_document)
+            finally:
+                pdf_document.close()
 
     # Upload the text to GCS
     try:
-        upload_blob_from_memory(storage_client, bucket, text_content, f"extracted_text/{file_id}.txt")
+        with TracingService.span("gcs.upload"):
+            upload_blob_from_memory(storage_client, bucket, text_content, f"extracted_text/{file_id}.txt")
         print("Text uploaded to GCS successfully")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload text to GCS: {str(e)}")
 
-    # Update the resume in the database with a link to the text
-    supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
-    supabase.table("resumes").update({
-        "text_url": f"https://storage.googleapis.com/prorank-extracted-text/extracted_text/{file_id}.txt"
-    }).eq("id", resume_job_id).execute()
-
-
-    return {"success": True, "message": "Text extracted successfully"}
+    # Link the resume to the text
+    result = {"success": True, "message": "Text extracted successfully", "peak_rss_bytes": peak_rss_bytes()}
+    save_text_url(data, result, f"https://storage.googleapis.com/prorank-extracted-text/extracted_text/{file_id}.txt")
+    if data.get("include_text"):
+        attach_text(result, resume, text_content)
+    return result
+
+
+def stream_to_file(request, file) -> int:
+    """Downloads a Drive media request chunk by chunk, stopping once it passes MAX_PDF_BYTES."""
+    downloader = MediaIoBaseDownload(file, request, chunksize=DOWNLOAD_CHUNK_BYTES)
+    done = False
+    while not done:
+        _, done = downloader.next_chunk()
+        if file.tell() > MAX_PDF_BYTES:
+            break
+    file.flush()
+    return file.tell()
+
+
+def skip_resume(data: dict, resume: dict, reason: str) -> dict:
+    """Marks a resume as skipped instead of extracting it, or hands the status back when the backend batches the write."""
+    print(f"Skipping resume {resume['id']}: {reason}")
+    if not data.get("defer_write"):
+        with TracingService.span("supabase.update_status"):
+            get_supabase().table("resumes").update({
+                "status": "skipped",
+                "skip_reason": reason,
+            }).eq("id", resume["id"]).execute()
+    return {
+        "success": True,
+        "message": reason,
+        "skipped": True,
+        "status": "skipped",
+        "skip_reason": reason,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident memory of this container's process so far (ru_maxrss is in KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def save_text_url(data: dict, result: dict, text_url: str) -> None:
+    """Stores the text link on the resume, or hands it back when the backend batches the write."""
+    result["text_url"] = text_url
+    if data.get("defer_write"):
+        return
+    with TracingService.span("supabase.update_text_url"):
+        get_supabase().table("resumes").update({"text_url": text_url}).eq("id", data.get("resume_job_id")).execute()
+
+
+def attach_text(result: dict, resume: dict, text: str) -> dict:
+    """Adds the extracted text to the response so the backend can index it."""
+    result["text"] = text
+    result["file_name"] = resume.get("file_name")
+    return result
 
 
 def upload_blob_from_memory(storage_client, bucket, contents, destination_blob_name):
@@ -125,9 +334,7 @@ def download_resume_text(text_url: str) -> str:
     bucket_name = os.environ["GCS_BUCKET_NAME"]
     blob_name = text_url.split(f"{bucket_name}/", 1)[1] if f"{bucket_name}/" in text_url else text_url
     
-    creds = json.loads(os.environ["GOOGLE_APPLICATION_CREDENTIALS_JSON"])
-    storage_client = storage.Client.from_service_account_info(creds)
-    bucket = storage_client.bucket(bucket_name)
+    bucket = get_storage_client().bucket(bucket_name)
     blob = bucket.blob(blob_name)
     return blob.download_as_text(encoding="utf-8")
 
@@ -141,42 +348,112 @@ def download_resume_text(text_url: str) -> str:
 
 
 
-@app.function(image=image, secrets=[gcp_secrets, gcs_secrets])
-@modal.fastapi_endpoint(
-    method="POST",
-    docs=True
+@app.cls(
+    image=image,
+    secrets=[gcp_secrets, gcs_secrets],
+    enable_memory_snapshot=True,
+    min_containers=SCORE_MIN_CONTAINERS,
+    scaledown_window=SCALEDOWN_WINDOW,
 )
-async def score_resume(data: dict) -> dict:
+class ResumeScorer:
+
+    @modal.enter(snap=True)
+    def load(self):
+        prewarm()
+
+    @modal.enter(snap=False)
+    def connect(self):
+        connect_clients()
+        get_model()
+
+    @modal.fastapi_endpoint(
+        method="POST",
+        docs=True,
+        label="prorank-score-resume"
+    )
+    async def score_resume(self, data: dict, request: Request) -> dict:
+        attributes = container_attributes()
+        if data.get("warmup"):
+            return warmup_response(attributes)
+        with TracingService.span(
+            "worker.score_resume",
+            dict(request.headers),
+            resume_job_id=data.get("resume_job_id"),
+            **attributes,
+        ):
+            return await score_resume_text(data)
+
+
+async def score_resume_text(data: dict) -> dict:
     
     resume_job_id = data.get("resume_job_id")
     if not resume_job_id:
         raise HTTPException(status_code=400, detail="Resume job ID not found")
 
-    # Create clients
-    supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
-    
-    # Configure Gemini
-    genai.configure(api_key=os.environ["GEMINI_API_KEY"])
-    model = genai.GenerativeModel(
-        model_name="gemini-2.0-flash-exp",
-        tools=[score_resume_tool]
-    )
+    # Get the shared clients
+    supabase = get_supabase()
+    model = get_model()
 
-    # Get the resume from the database
-    resume = supabase.table("resumes").select("*").eq("id", resume_job_id).execute().data[0]
-    resume_text = download_resume_text(resume["text_url"])
+    # The backend passes the text link along; only look it up when it didn't
+    text_url = data.get("text_url")
+    if not text_url:
+        with TracingService.span("supabase.select_resume"):
+            text_url = supabase.table("resumes").select("text_url").eq("id", resume_job_id).execute().data[0]["text_url"]
+    with TracingService.span("gcs.download"):
+        resume_text = download_resume_text(text_url)
+
+    # Last point to stop before the Gemini call if the job was cancelled meanwhile
+    if job_cancelled(supabase, data.get("job_id")):
+        return {"success": False, "cancelled": True, "message": "Job cancelled"}
+
+    scores, usage = generate_resume_score(model, resume_text, data.get("attempt", 0))
+
+    # The backend commits the score together with the status in one batched write
+    if data.get("defer_write"):
+        return {"success": True, "message": "Resume scored successfully", "update": {**scores, **usage}}
+
+    # Update the resume in the database with the score
+    with TracingService.span("supabase.update_score"):
+        supabase.table("resumes").update({**scores, **usage}).eq("id", resume_job_id).execute()
+
+    return {"success": True, "message": "Resume scored successfully"}
+
+
+def job_cancelled(supabase, job_id) -> bool:
+    """Checks whether the backend cancelled the job while this request was in flight."""
+    if not job_id:
+        return False
+    with TracingService.span("supabase.select_job_status"):
+        rows = supabase.table("jobs").select("status").eq("id", job_id).execute().data
+    return bool(rows) and rows[0]["status"] == "cancelled"
+
+
+def generate_resume_score(model, resume_text: str, attempt: int = 0) -> tuple[dict, dict]:
+    """Scores one resume text with Gemini, returning the score columns and the LLM usage."""
 
     # Create the prompt with system instruction and resume text
     prompt = f"{SYSTEM_PROMPT}\n\nResume Text:\n{resume_text}"
 
     # Generate response with tool calling
-    response = model.generate_content(
-        prompt,
-        generation_config=genai.types.GenerationConfig(
-            temperature=0,
-        ),
-        tool_config={'function_calling_config': 'ANY'}
-    )
+    with TracingService.span("gemini.generate_content", model=MODEL_NAME) as span:
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0,
+                ),
+                tool_config={'function_calling_config': 'ANY'}
+            )
+        except (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests, google_exceptions.ServiceUnavailable) as e:
+            # Surface quota errors as 429/503 so the backend's concurrency limiter can back off
+            raise HTTPException(
+                status_code=503 if isinstance(e, google_exceptions.ServiceUnavailable) else 429,
+                detail=f"Gemini is rate limited: {e}",
+                headers={"Retry-After": str(retry_after_seconds(e))},
+            )
+        usage = llm_usage(response, time.perf_counter() - started, attempt)
+        span.set_attributes({key: value for key, value in usage.items() if value is not None})
 
     # Extract function call from response
     if not response.candidates or not response.candidates[0].content.parts:
@@ -206,15 +483,114 @@ async def score_resume(data: dict) -> dict:
     score = int(arguments["score"]) if arguments["score"] > 0 else int(calculated_score)
     score = max(0, min(100, score))  # Clamp to [0, 100]
 
-    # Update the resume in the database with the score
-    supabase.table("resumes").update({
+    scores = {
         "gpa": gpa,
         "school_year": arguments["school_year"],
         "num_internships": num_internships,
         "score": score,
         "gpa_contribution": gpa_contribution,
         "experience_contribution": experience_contribution,
-        "impact_quality_contribution": impact_quality_contribution
-    }).eq("id", resume_job_id).execute()
+        "impact_quality_contribution": impact_quality_contribution,
+    }
+    return scores, usage
+
+
+def retry_after_seconds(error, default: int = 10) -> int:
+    """Retry delay suggested by a Gemini quota error, if it carries one."""
+    for detail in getattr(error, "details", None) or []:
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is not None and getattr(retry_delay, "seconds", 0):
+            return int(retry_delay.seconds)
+    return default
+
+
+def llm_usage(response, latency_seconds: float, retries: int) -> dict:
+    """Token counts, latency and retries of a Gemini call, stored next to the score."""
+    metadata = getattr(response, "usage_metadata", None)
+    return {
+        "llm_model": MODEL_NAME,
+        "llm_prompt_tokens": getattr(metadata, "prompt_token_count", None),
+        "llm_completion_tokens": getattr(metadata, "candidates_token_count", None),
+        "llm_total_tokens": getattr(metadata, "total_token_count", None),
+        "llm_latency_ms": round(latency_seconds * 1000),
+        "llm_retries": retries,
+    }
+
+
+# Every resume_scores row carries the same columns so a batch upserts in one request
+RESCORE_RESULT_COLUMNS = (
+    "gpa", "school_year", "num_internships", "score", "gpa_contribution",
+    "experience_contribution", "impact_quality_contribution", "llm_model",
+    "llm_prompt_tokens", "llm_completion_tokens", "llm_total_tokens",
+    "llm_latency_ms", "llm_retries",
+)
 
-    return {"success": True, "message": "Resume scored successfully"}
\ No newline at end of file
+
+@app.function(
+    image=image,
+    secrets=[gcp_secrets, gcs_secrets],
+    max_containers=RESCORE_MAX_CONTAINERS,
+    timeout=3600,
+)
+def rescore_resumes(resume_ids: list[int], score_version: str) -> dict:
+    """Re-scores a batch of resumes from their extracted text, writing versioned scores."""
+    TracingService.configure("prorank-worker")
+    supabase = get_supabase()
+    model = get_model()
+
+    with TracingService.span("supabase.select_resumes", resumes=len(resume_ids)):
+        resumes = supabase.table("resumes").select("id, job_id, text_url").in_("id", resume_ids).execute().data
+
+    # Bounded threads per container; max_containers bounds the whole run
+    with ThreadPoolExecutor(max_workers=RESCORE_CONCURRENCY) as pool:
+        rows = list(pool.map(lambda resume: rescore_resume(model, resume, score_version), resumes))
+
+    with TracingService.span("supabase.upsert_resume_scores", resumes=len(rows)):
+        supabase.table("resume_scores").upsert(rows, on_conflict="resume_id,score_version").execute()
+
+    failed = sum(1 for row in rows if row["error"])
+    return {"scored": len(rows) - failed, "failed": failed}
+
+
+def rescore_resume(model, resume: dict, score_version: str) -> dict:
+    """Scores one resume for a re-score run, waiting out rate limits instead of failing."""
+    row = {
+        "resume_id": resume["id"],
+        "job_id": resume["job_id"],
+        "score_version": score_version,
+        **dict.fromkeys(RESCORE_RESULT_COLUMNS),
+        "error": None,
+    }
+    for attempt in range(RESCORE_MAX_ATTEMPTS):
+        try:
+            with TracingService.span("gcs.download"):
+                resume_text = download_resume_text(resume["text_url"])
+            scores, usage = generate_resume_score(model, resume_text, attempt)
+            return {**row, **scores, **usage}
+        except HTTPException as e:
+            if e.status_code not in (429, 503) or attempt == RESCORE_MAX_ATTEMPTS - 1:
+                return {**row, "error": str(e.detail)}
+            time.sleep(int((e.headers or {}).get("Retry-After", 10)))
+        except Exception as e:
+            return {**row, "error": str(e)}
+
+
+@app.function(image=image, secrets=[gcp_secrets, gcs_secrets])
+@modal.fastapi_endpoint(
+    method="POST",
+    docs=True,
+    label="prorank-rescore-resumes"
+)
+def start_rescore(data: dict) -> dict:
+    """Queues resumes for offline re-scoring in batches and returns the score version they get."""
+    resume_ids = data.get("resume_ids") or []
+    calls = []
+    for start in range(0, len(resume_ids), RESCORE_BATCH_SIZE):
+        calls.append(rescore_resumes.spawn(resume_ids[start:start + RESCORE_BATCH_SIZE], SCORE_VERSION).object_id)
+    return {
+        "success": True,
+        "score_version": SCORE_VERSION,
+        "queued": len(resume_ids),
+        "batches": len(calls),
+        "call_ids": calls,
+    }
@@ -0,0 +1,8 @@
+-- Per-resume LLM usage recorded by the Modal score_resume worker
+alter table resumes
+    add column if not exists llm_model text,
+    add column if not exists llm_prompt_tokens integer,
+    add column if not exists llm_completion_tokens integer,
+    add column if not exists llm_total_tokens integer,
+    add column if not exists llm_latency_ms integer,
+    add column if not exists llm_retries integer;
@@ -0,0 +1,25 @@
+-- Versioned scores written by offline re-scoring runs, kept next to resumes.score
+create table if not exists resume_scores (
+    id bigint generated by default as identity primary key,
+    resume_id bigint not null references resumes (id) on delete cascade,
+    job_id bigint not null references jobs (id) on delete cascade,
+    score_version text not null,
+    gpa real,
+    school_year text,
+    num_internships integer,
+    score integer,
+    gpa_contribution integer,
+    experience_contribution integer,
+    impact_quality_contribution integer,
+    llm_model text,
+    llm_prompt_tokens integer,
+    llm_completion_tokens integer,
+    llm_total_tokens integer,
+    llm_latency_ms integer,
+    llm_retries integer,
+    error text,
+    created_at timestamptz not null default now(),
+    unique (resume_id, score_version)
+);
+
+create index if not exists resume_scores_job_version_idx on resume_scores (job_id, score_version);
@@ -0,0 +1,21 @@
+-- Near-duplicate links written by download_resume
+alter table resumes
+    add column if not exists duplicate_of bigint references resumes (id) on delete set null,
+    add column if not exists duplicate_similarity real;
+
+-- MinHash signatures, kept out of resumes so select * stays small
+create table if not exists resume_minhash (
+    resume_id bigint primary key references resumes (id) on delete cascade,
+    user_id bigint not null,
+    signature bigint[] not null
+);
+
+-- LSH band keys of each signature, looked up per user to find duplicate candidates
+create table if not exists resume_lsh_bands (
+    resume_id bigint not null references resumes (id) on delete cascade,
+    user_id bigint not null,
+    band text not null,
+    primary key (resume_id, band)
+);
+
+create index if not exists resume_lsh_bands_user_band_idx on resume_lsh_bands (user_id, band);
@@ -0,0 +1,50 @@
+-- Applies many partial resume updates in one statement, used by the backend's write-behind buffer.
+-- Each element of updates is {"id": ..., <column>: <value>, ...}; columns left out keep their value.
+create or replace function bulk_update_resumes(updates jsonb)
+returns setof resumes
+language sql
+as $$
+    update resumes r
+    set (
+        status,
+        text_url,
+        gpa,
+        school_year,
+        num_internships,
+        score,
+        gpa_contribution,
+        experience_contribution,
+        impact_quality_contribution,
+        llm_model,
+        llm_prompt_tokens,
+        llm_completion_tokens,
+        llm_total_tokens,
+        llm_latency_ms,
+        llm_retries,
+        duplicate_of,
+        duplicate_similarity
+    ) = (
+        select
+            p.status,
+            p.text_url,
+            p.gpa,
+            p.school_year,
+            p.num_internships,
+            p.score,
+            p.gpa_contribution,
+            p.experience_contribution,
+            p.impact_quality_contribution,
+            p.llm_model,
+            p.llm_prompt_tokens,
+            p.llm_completion_tokens,
+            p.llm_total_tokens,
+            p.llm_latency_ms,
+            p.llm_retries,
+            p.duplicate_of,
+            p.duplicate_similarity
+        from jsonb_populate_record(r, u.value) p
+    )
+    from jsonb_array_elements(updates) u
+    where r.id = (u.value->>'id')::bigint
+    returning r.*;
+$$;
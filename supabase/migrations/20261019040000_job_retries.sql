@@ -0,0 +1,12 @@
+-- Retries of the failed and stuck resumes of a job, with a snapshot to diff against
+create table if not exists job_retries (
+    id bigint generated by default as identity primary key,
+    job_id bigint not null references jobs (id) on delete cascade,
+    resume_ids bigint[] not null,
+    before jsonb not null,
+    backoff_seconds integer not null default 0,
+    status text not null default 'pending',
+    created_at timestamptz not null default now()
+);
+
+create index if not exists job_retries_job_idx on job_retries (job_id);
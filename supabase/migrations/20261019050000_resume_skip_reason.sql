@@ -0,0 +1,55 @@
+-- Why a resume was skipped instead of extracted (e.g. over the size or page limit)
+alter table resumes
+    add column if not exists skip_reason text;
+
+-- Let the write-behind buffer set skip_reason
+create or replace function bulk_update_resumes(updates jsonb)
+returns setof resumes
+language sql
+as $$
+    update resumes r
+    set (
+        status,
+        text_url,
+        gpa,
+        school_year,
+        num_internships,
+        score,
+        gpa_contribution,
+        experience_contribution,
+        impact_quality_contribution,
+        llm_model,
+        llm_prompt_tokens,
+        llm_completion_tokens,
+        llm_total_tokens,
+        llm_latency_ms,
+        llm_retries,
+        duplicate_of,
+        duplicate_similarity,
+        skip_reason
+    ) = (
+        select
+            p.status,
+            p.text_url,
+            p.gpa,
+            p.school_year,
+            p.num_internships,
+            p.score,
+            p.gpa_contribution,
+            p.experience_contribution,
+            p.impact_quality_contribution,
+            p.llm_model,
+            p.llm_prompt_tokens,
+            p.llm_completion_tokens,
+            p.llm_total_tokens,
+            p.llm_latency_ms,
+            p.llm_retries,
+            p.duplicate_of,
+            p.duplicate_similarity,
+            p.skip_reason
+        from jsonb_populate_record(r, u.value) p
+    )
+    from jsonb_array_elements(updates) u
+    where r.id = (u.value->>'id')::bigint
+    returning r.*;
+$$;
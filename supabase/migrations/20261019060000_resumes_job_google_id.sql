@@ -0,0 +1,3 @@
+-- A Drive file appears once per job, so listing a folder again (a retried
+-- list-files step) can upsert the job manifest without duplicating rows
+create unique index if not exists resumes_job_google_id_idx on resumes (job_id, google_id);
@@ -0,0 +1,3 @@
+-- When the job was cancelled; its unfinished resumes move to status 'cancelled'
+alter table jobs
+    add column if not exists cancelled_at timestamptz;
@@ -0,0 +1,3 @@
+-- Remember the job's dedup policy so retries score near-duplicates the same way
+alter table jobs
+    add column if not exists score_duplicates boolean not null default false;